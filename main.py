@@ -6,22 +6,41 @@ Bu dosya, tüm sistem bileşenlerini koordine eder ve uygulamanın giriş noktas
 # Standard Library
 import logging
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Third Party
+import numpy as np
 import pandas as pd
 import yaml
 from dotenv import load_dotenv
 from tqdm import tqdm
 
 # Local
+from src.config import AppConfig, ConfigError
+from src.config import load_config as load_app_config
 from src.cv_processor import CVProcessor
 from src.data_collector import collect_job_data
-from src.embedding_service import EmbeddingService
-from src.filter import score_jobs
+from src.embedding_queue import DEFAULT_COMMIT_SIZE, EmbeddingQueue, queue_path
+from src.embedding_service import DEFAULT_EMBEDDING_MODEL, EmbeddingService
+from src.filter import cascade_mask, explain_score, score_jobs
 from src.intelligent_scoring import IntelligentScoringSystem
-from src.vector_store import VectorStore
+from src.job_schema import build_where, stable_job_id
+from src.lexical_index import DEFAULT_RRF_K, create_lexical_index, reciprocal_rank_fusion
+from src.projection import PCAProjection, projection_path
+from src.reindex import (
+    DEFAULT_REINDEX_BATCH_SIZE,
+    DEFAULT_REINDEX_DELAY,
+    Reindexer,
+    read_active_collection,
+    reduce_with_pca,
+    start_reindex,
+    write_active_collection,
+)
+from src.scheduler import COLLECTION_SHARE, Budget, prioritize_jobs, prioritize_personas
+from src.score_cache import create_score_cache
+from src.store_lock import CLAIMS_FILE, DEFAULT_CLAIM_TTL, DEFAULT_LOCK_TIMEOUT, EmbeddingClaims
+from src.vector_store import JobStore, create_vector_store, similarity_from_distance
 
 # Environment variables yükle
 load_dotenv()
@@ -80,56 +99,61 @@ def setup_logging():
 logger = setup_logging()
 
 
-def load_config():
+def load_config() -> AppConfig:
     """
-    config.yaml dosyasını yükler ve parse eder.
+    config.yaml dosyasını yükler, doğrular ve süreç boyunca paylaşılan nesneyi döner.
 
     Returns:
-        dict: Yüklenmiş konfigürasyon verisi
+        AppConfig: Yüklenmiş ve doğrulanmış konfigürasyon
 
     Raises:
         FileNotFoundError: Config dosyası bulunamazsa
         yaml.YAMLError: YAML parse hatası olursa
+        ConfigError: Config yapısı geçersizse
     """
     config_path = Path("config.yaml")
     try:
-        with open(config_path, encoding="utf-8") as file:
-            config = yaml.safe_load(file)
-        logger.info("✅ config.yaml başarıyla yüklendi")
-        return config
+        app_config = load_app_config(config_path)
+        logger.info(f"✅ config.yaml başarıyla yüklendi (parmak izi: {app_config.fingerprint[:12]})")
+        return app_config
     except FileNotFoundError:
         logger.error(f"❌ config.yaml dosyası bulunamadı: {config_path}")
         raise
     except yaml.YAMLError as e:
         logger.error(f"❌ config.yaml dosyası parse edilemedi: {e}")
         raise
+    except ConfigError as e:
+        logger.error(f"❌ config.yaml doğrulanamadı: {e}")
+        raise
 
 
 # Konfigürasyonu yükle
 config = load_config()
-scoring_system = IntelligentScoringSystem(config)
+scoring_system = IntelligentScoringSystem(config, cache=create_score_cache(config))
+lexical_index = create_lexical_index(config)
 
 # Embedding ayarları
-embedding_settings = config.get("embedding_settings", {})
+embedding_settings = config.embedding_settings
 
 # Job settings from config
-job_settings = config["job_search_settings"]
-MIN_SIMILARITY_THRESHOLD = job_settings["min_similarity_threshold"]
-TARGET_SITES = job_settings["target_sites"]
-DEFAULT_HOURS_OLD = job_settings["default_hours_old"]
-DEFAULT_RESULTS_PER_PERSONA_SITE = job_settings["default_results_per_site"]
+MIN_SIMILARITY_THRESHOLD = config.job_search.min_similarity_threshold
+TARGET_SITES = list(config.job_search.target_sites)
+DEFAULT_HOURS_OLD = config.job_search.default_hours_old
+DEFAULT_RESULTS_PER_PERSONA_SITE = config.job_search.default_results_per_site
 
 # Persona konfigürasyonları
 persona_search_config = config["persona_search_configs"]
 
 
-def collect_data_for_all_personas(selected_personas=None, results_per_site=None):
+def collect_data_for_all_personas(selected_personas=None, results_per_site=None, budget=None):
     """
     Tüm persona'lar için iş ilanlarını toplar ve CSV yolunu döner.
 
     Args:
         selected_personas: Seçili persona listesi (None ise tümü)
         results_per_site: Site başına sonuç sayısı (None ise config'den)
+        budget: Süre bütçesi verilirse persona'lar öncelik sırasıyla taranır ve
+            bütçenin toplama payı dolunca kalanlar atlanır
 
     Returns:
         str: Toplanan verilerin CSV dosya yolu
@@ -142,8 +166,15 @@ def collect_data_for_all_personas(selected_personas=None, results_per_site=None)
     personas = persona_search_config.items()
     if selected_personas:
         personas = [(p, cfg) for p, cfg in persona_search_config.items() if p in selected_personas]
+    if budget is not None and budget.limited:
+        personas = prioritize_personas(personas, scoring_system)
 
-    for persona_name, persona_cfg in tqdm(personas, desc="Persona Aramaları"):
+    for done, (persona_name, persona_cfg) in enumerate(tqdm(personas, desc="Persona Aramaları")):
+        if budget is not None and not budget.time_left(COLLECTION_SHARE):
+            logger.warning(
+                f"⏱️ Süre bütçesi: {len(personas) - done} persona atlandı, toplanan ilanlarla devam ediliyor"
+            )
+            break
         logger.info(f"\n--- Persona '{persona_name}' için JobSpy Gelişmiş Arama ---")
         logger.info(f"🎯 Optimize edilmiş terim: '{persona_cfg['term']}'")
         logger.info(f"⏰ Tarih filtresi: Son {persona_cfg['hours_old']} saat")
@@ -193,7 +224,7 @@ def collect_data_for_all_personas(selected_personas=None, results_per_site=None)
     logger.info(f"✨✨✨ TOPLAM: {len(final_df)} adet BENZERSİZ ilan (JobSpy optimize edilmiş)! ✨✨✨")
 
     # Optimize edilmiş CSV kaydetme (pathlib ile)
-    output_dir = Path(config["paths"]["data_dir"])
+    output_dir = Path(config.paths.data_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     final_csv_path = output_dir / f"jobspy_optimize_ilanlar_{timestamp}.csv"
@@ -203,8 +234,23 @@ def collect_data_for_all_personas(selected_personas=None, results_per_site=None)
     return str(final_csv_path)
 
 
-def analyze_and_find_best_jobs(selected_personas=None, results_per_site=None, similarity_threshold=None):
-    """Run full pipeline and print best jobs."""
+def analyze_and_find_best_jobs(
+    selected_personas=None,
+    results_per_site=None,
+    similarity_threshold=None,
+    cv_paths=None,
+    search_filters=None,
+    budget=None,
+    compact=False,
+):
+    """Run full pipeline and print best jobs.
+
+    Birden fazla CV verilirse veri toplama ve vector store aşamaları bir kez
+    çalışır; tüm CV'ler tek bir toplu sorgu ile eşleştirilir. ``search_filters``
+    (ChromaDB ``where`` sözlüğü) aramaya doğrudan indeks içinde uygulanır.
+    ``budget`` (``Budget``) süre/embedding sınırı koyar; iş öncelik sırasıyla
+    yapılır ve sınırda tamamlanan ilanlarla sonuç üretilir.
+    """
     logger.info("\n🚀 Tam Otomatik AI Kariyer Analizi Başlatılıyor...")
     logger.info("=" * 60)
 
@@ -212,25 +258,28 @@ def analyze_and_find_best_jobs(selected_personas=None, results_per_site=None, si
 
     # 1. Veri toplama
     logger.info("\n🔄 1/6: JobSpy Gelişmiş Özellikler ile veri toplama...")
-    csv_path = collect_data_for_all_personas(selected_personas, results_per_site)
+    csv_path = collect_data_for_all_personas(selected_personas, results_per_site, budget)
     if not csv_path:
         logger.error("❌ Veri toplama başarısız - analiz durduruluyor!")
         return
 
-    # 2. CV'yi işle
-    cv_processor = _setup_cv_processor()
-    if not cv_processor:
+    # 2. CV'leri işle (sorgular etkin koleksiyonu üreten model ve boyutla gömülür)
+    active = _resolve_active_collection()
+    active_settings = _active_embedding_settings(active)
+    projection = _load_projection(active)
+    if active["reduction"] == "pca" and projection is None:
+        logger.error(f"❌ '{active['collection']}' için PCA projeksiyonu bulunamadı!")
         return
-
-    if not cv_processor.create_cv_embedding():
-        logger.error("❌ CV embedding oluşturma başarısız!")
+    cv_processors = _setup_cvs(cv_paths or [config.paths.cv_file], active_settings)
+    if not cv_processors:
         return
-
-    cv_embedding = cv_processor.cv_embedding
-    logger.info("✅ CV embedding oluşturuldu")
+    cv_embeddings = [_project(processor.cv_embedding, projection) for processor in cv_processors.values()]
+    if active["dimension"] is None:
+        active["dimension"] = len(cv_embeddings[0])
+        write_active_collection(config.paths.chromadb_dir, **active)
 
     # 3. Vector store'u başlat
-    vector_store = _setup_vector_store()
+    vector_store = _setup_vector_store(active["collection"])
     if not vector_store:
         return
 
@@ -240,19 +289,90 @@ def analyze_and_find_best_jobs(selected_personas=None, results_per_site=None, si
     if jobs_df is None:
         return
 
-    job_embeddings = _process_job_embeddings(jobs_df, vector_store)
-    success = vector_store.add_jobs(jobs_df, job_embeddings)
-    if not success:
-        logger.error("❌ Vector store yükleme başarısız!")
-        return
+    # Anahtar kelime skoru metadata olarak saklanır; filtreler indeks içinde çalışır
+    jobs_df["keyword_score"] = [scoring_system.score_record(job).total for job in jobs_df.to_dict("records")]
 
-    # 5. Benzer işleri bul ve filtrele
-    if cv_embedding is None:
-        logger.error("❌ CV embedding oluşturulamadı, arama yapılamıyor")
-        return
+    job_records = jobs_df.to_dict("records")
+    if scoring_system.cv_skills:
+        scoring_system.skill_index.add_jobs(job_records)
 
-    similar_jobs = _search_and_score_jobs(cv_embedding, vector_store, threshold)
-    _display_results(similar_jobs, threshold)
+    # Embedding'ler kalıcı kuyruk üzerinden parça parça yazılır; kesilen çalıştırma kaldığı yerden sürer.
+    # Aynı anda çalışan başka bir süreç aynı ilanları gömmez; yazma kilit altındadır.
+    claims = _embedding_claims()
+    queue = EmbeddingQueue(queue_path(config.paths.chromadb_dir, active["collection"]))
+    try:
+        _process_job_embeddings(
+            jobs_df,
+            vector_store,
+            queue,
+            active_settings,
+            projection,
+            claims,
+            _cascade_candidates(job_records),
+            budget,
+        )
+    except Exception as e:
+        logger.error(f"❌ Vector store yükleme başarısız: {e}", exc_info=True)
+        return
+    finally:
+        claims.release()
+    _index_stored_jobs(job_records, vector_store)
+
+    # Model ya da hedef boyut değiştiyse yeni koleksiyona taşı; arama eski koleksiyonla sürer
+    _start_reindex_if_needed(vector_store, active)
+
+    # 5. Benzer işleri bul ve filtrele (tüm CV'ler tek sorguda)
+    results_per_cv = _search_and_score_jobs_batch(
+        cv_embeddings,
+        vector_store,
+        threshold,
+        filter_metadata=search_filters,
+        cv_texts=[processor.cv_text for processor in cv_processors.values()],
+    )
+    for cv_name, similar_jobs in zip(cv_processors, results_per_cv, strict=True):
+        if len(cv_processors) > 1:
+            logger.info(f"\n📄 CV: {cv_name}")
+        _display_results(similar_jobs, threshold)
+
+    _prune_expired_jobs(vector_store)
+    if compact:
+        vector_store.compact()
+    vector_store.save_search_cache()
+
+    if scoring_system.cache is not None:
+        scoring_system.cache.save()
+
+
+def _prune_expired_jobs(vector_store: JobStore) -> int:
+    """``ttl_days`` süresini aşan ilanları sil (sıkıştırma ``--compact`` ile ayrıca yapılır)"""
+    ttl_days = config.vector_store_settings.get("ttl_days")
+    if not ttl_days:
+        return 0
+    deleted = vector_store.prune(older_than=datetime.now() - timedelta(days=ttl_days))
+    if deleted:
+        logger.info(f"🧹 {ttl_days} günden eski {deleted} ilan koleksiyondan çıkarıldı")
+        if lexical_index is not None and lexical_index.remove(vector_store.last_pruned_ids):
+            lexical_index.save()
+    return deleted
+
+
+def _index_stored_jobs(job_records: list[dict], vector_store: JobStore) -> int:
+    """Yalnızca vector store'a yazılmış ilanları sözcük indeksine ekle
+
+    Cascade ya da deposu tarafından reddedilen ilanlar indekslenmez; aksi halde
+    ``lexical_top_k`` slotları ``get_jobs`` tarafından düşürülen ID'lerle dolar.
+    """
+    if lexical_index is None:
+        return 0
+    job_ids = [stable_job_id(job) for job in job_records]
+    stored = vector_store.existing_ids(job_ids)
+    added = lexical_index.add_jobs(
+        [job for job, job_id in zip(job_records, job_ids, strict=True) if job_id in stored],
+        [job_id for job_id in job_ids if job_id in stored],
+    )
+    if added:
+        lexical_index.save()
+    return added
 
 
 def _load_and_validate_csv(csv_path: str) -> pd.DataFrame | None:
@@ -273,10 +393,10 @@ def _load_and_validate_csv(csv_path: str) -> pd.DataFrame | None:
         return None
 
 
-def _setup_cv_processor() -> CVProcessor | None:
+def _setup_cv_processor(cv_path: str | None = None, settings: dict | None = None) -> CVProcessor | None:
     """CV processor'ı kurulum yap"""
     logger.info("\n📄 2/6: CV analizi...")
-    cv_processor = CVProcessor(embedding_settings=embedding_settings)
+    cv_processor = CVProcessor(cv_path=cv_path, embedding_settings=settings or _embedding_service_settings())
 
     if not cv_processor.load_cv():
         logger.error("❌ CV yükleme başarısız!")
@@ -290,67 +410,352 @@ def _setup_cv_processor() -> CVProcessor | None:
     return cv_processor
 
 
-def _setup_vector_store() -> VectorStore | None:
+def _setup_cvs(cv_paths: list[str], settings: dict | None = None) -> dict[str, CVProcessor]:
+    """Her CV'yi yükleyip embedding oluştur; başarısız CV'ler atlanır"""
+    cv_processors = {}
+    for cv_path in cv_paths:
+        cv_processor = _setup_cv_processor(cv_path, settings)
+        if cv_processor and cv_processor.cv_embedding:
+            cv_processors[str(cv_path)] = cv_processor
+    if not cv_processors:
+        logger.error("❌ Hiçbir CV için embedding oluşturulamadı, arama yapılamıyor")
+    return cv_processors
+
+
+def _resolve_active_collection() -> dict:
+    """Etkin koleksiyonu ve onu üreten modeli döndür
+
+    İşaretçi dosyası yoksa mevcut (sürümsüz) koleksiyonun, model seçilebilir
+    hale gelmeden önceki sabit modelle üretildiği kabul edilir.
+    """
+    active = read_active_collection(config.paths.chromadb_dir)
+    if active is None:
+        active = {
+            "collection": config.vector_store_settings["collection_name"],
+            "model": DEFAULT_EMBEDDING_MODEL,
+            "dimension": None,
+        }
+    active.setdefault("reduction", None)
+    logger.info(f"🗂️ Etkin koleksiyon: {active['collection']} (model: {active['model']})")
+    return active
+
+
+def _embedding_service_settings(model: str | None = None, output_dimensionality: int | None = None) -> dict:
+    """EmbeddingService argümanları (boyut düşürme ayarları hariç)"""
+    settings = {
+        key: value
+        for key, value in embedding_settings.items()
+        if key not in ("target_dimension", "dimension_reduction", "cascade")
+    }
+    if model:
+        settings["model"] = model
+    if output_dimensionality:
+        settings["output_dimensionality"] = output_dimensionality
+    return settings
+
+
+def _active_embedding_settings(active: dict) -> dict:
+    """Etkin koleksiyonla aynı uzayda vektör üreten EmbeddingService argümanları"""
+    output_dimensionality = active["dimension"] if active.get("reduction") == "api" else None
+    return _embedding_service_settings(active["model"], output_dimensionality)
+
+
+def _load_projection(active: dict) -> PCAProjection | None:
+    """Etkin koleksiyon PCA ile düşürülmüşse projeksiyonunu yükle"""
+    if active.get("reduction") != "pca":
+        return None
+    return PCAProjection.load(projection_path(config.paths.chromadb_dir, active["collection"]))
+
+
+def _project(embedding: list[float] | None, projection: PCAProjection | None) -> list[float] | None:
+    """Vektörü (varsa) etkin koleksiyonun projeksiyonundan geçir"""
+    if embedding is None or projection is None:
+        return embedding
+    return projection.transform(embedding).tolist()
+
+
+def _store_settings() -> dict:
+    """create_vector_store için backend ve upsert ayarları"""
+    store_settings = config.vector_store_settings
+    return {
+        "backend": store_settings.get("backend", "chroma"),
+        "upsert_batch_size": store_settings.get("upsert_batch_size", 100),
+        "upsert_workers": store_settings.get("upsert_workers", 1),
+        "search_cache_size": store_settings.get("search_cache_size", 0),
+        "quantization": store_settings.get("quantization", "none"),
+        "rerank_factor": store_settings.get("rerank_factor", 4),
+        "hnsw": store_settings.get("hnsw"),
+        "shard_period": (store_settings.get("sharding") or {}).get("period"),
+        "shard_search_workers": (store_settings.get("sharding") or {}).get("search_workers", 4),
+        "lock_timeout": store_settings.get("lock_timeout_seconds", DEFAULT_LOCK_TIMEOUT),
+    }
+
+
+def _setup_vector_store(collection_name: str | None = None) -> JobStore | None:
     """Vector store'u kurulum yap"""
     logger.info("\n🗃️ 3/6: Vector store hazırlığı...")
-    vector_store = VectorStore(
-        persist_directory=config["paths"]["chromadb_dir"],
-        collection_name=config["vector_store_settings"]["collection_name"],
+    vector_store = create_vector_store(
+        persist_directory=config.paths.chromadb_dir,
+        collection_name=collection_name or config.vector_store_settings["collection_name"],
+        **_store_settings(),
     )
 
-    if not vector_store.create_collection():
+    if vector_store is None or not vector_store.create_collection():
         logger.error("❌ Vector store koleksiyon oluşturma başarısız!")
         return None
 
     return vector_store
 
 
-def _process_job_embeddings(jobs_df: pd.DataFrame, vector_store: VectorStore) -> list[list[float] | None]:
-    """İş ilanları için embeddings oluştur"""
-    embedding_service = EmbeddingService(**embedding_settings)
-    logger.info("🔄 5/6: İş ilanları için AI embeddings oluşturuluyor...")
+def _start_reindex_if_needed(vector_store: JobStore, active: dict) -> Reindexer | None:
+    """Config'teki model/hedef boyut etkin koleksiyonunkinden farklıysa koleksiyonu taşı
 
-    job_embeddings: list[list[float] | None] = []
-    for _, job in tqdm(jobs_df.iterrows(), total=len(jobs_df), desc="İlan Embeddings"):
-        job_dict = job.to_dict()
+    Aynı modelin tam boyutlu vektörleri PCA ile yerel olarak düşürülür; diğer
+    tüm değişiklikler ilanları arka planda API ile yeniden gömer.
+    """
+    configured_model = embedding_settings.get("model", DEFAULT_EMBEDDING_MODEL)
+    target_dimension = embedding_settings.get("target_dimension")
+    reduction = embedding_settings.get("dimension_reduction", "api") if target_dimension else None
+    # "api" istenip model desteklemediği için PCA'ya düşülmüşse o da kabul edilir
+    accepted = {reduction, "pca"} if reduction == "api" else {reduction}
+    same_dimension = reduction is None or target_dimension == active["dimension"]
+    if configured_model == active["model"] and active["reduction"] in accepted and same_dimension:
+        return None
+    reindex_cfg = config.vector_store_settings.get("reindex", {}) or {}
+    embedding_service = EmbeddingService(
+        **_embedding_service_settings(configured_model, target_dimension if reduction == "api" else None)
+    )
+    if reduction == "api":
+        probe = embedding_service.create_embedding("embedding dimension probe")
+        if probe and len(probe) != target_dimension:
+            logger.warning(f"⚠️ {configured_model} kısaltılmış çıktı desteklemiyor; boyut PCA ile düşürülecek")
+            reduction = "pca"
+            embedding_service.output_dimensionality = None
+    if reduction == "pca" and configured_model == active["model"] and active["reduction"] is None:
+        reduce_with_pca(
+            vector_store,
+            persist_directory=config.paths.chromadb_dir,
+            base_name=config.vector_store_settings["collection_name"],
+            model=configured_model,
+            dimension=target_dimension,
+            batch_size=reindex_cfg.get("batch_size", DEFAULT_REINDEX_BATCH_SIZE),
+            **_store_settings(),
+        )
+        return None
+    logger.warning(
+        f"⚠️ Embedding ayarları değişti: {active['model']} ({active['dimension']}) -> "
+        f"{configured_model} ({target_dimension or 'tam boyut'})"
+    )
+    reindexer = start_reindex(
+        vector_store,
+        persist_directory=config.paths.chromadb_dir,
+        base_name=config.vector_store_settings["collection_name"],
+        model=configured_model,
+        embed=embedding_service.create_embedding,
+        batch_size=reindex_cfg.get("batch_size", DEFAULT_REINDEX_BATCH_SIZE),
+        delay=reindex_cfg.get("delay_seconds", DEFAULT_REINDEX_DELAY),
+        reduction="api" if reduction == "api" else None,
+        claims=_embedding_claims(),
+        **_store_settings(),
+    )
+    if reindexer is not None:
+        logger.info("🔁 Yeniden indeksleme arka planda sürüyor; kesilirse sonraki çalıştırmada devam eder")
+    return reindexer
+
+
+def _process_job_embeddings(
+    jobs_df: pd.DataFrame,
+    vector_store: JobStore,
+    queue: EmbeddingQueue,
+    settings: dict | None = None,
+    projection: PCAProjection | None = None,
+    claims: EmbeddingClaims | None = None,
+    candidates: list[bool] | None = None,
+    budget: Budget | None = None,
+) -> int:
+    """Yeni ilanları kalıcı kuyruğa al, gömüp parça parça store'a işle; eklenen sayıyı döner
+
+    Kuyrukta önceki (yarıda kalmış) çalıştırmalardan kalan ilanlar önce işlenir;
+    gömülüp store'a yazılamamış embedding'ler API'ye gitmeden yazılır. Vektörler
+    etkin koleksiyon PCA'lıysa izdüşürülür. ``claims`` verilirse başka bir sürecin
+    o anda gömdüğü ilanlar, ``candidates`` verilirse ön elemede düşen ilanlar
+    atlanır. ``budget`` sınırlıysa yeni ilanlar skor ve tarihe göre sıralanır,
+    bütçe dolunca durulur.
+    """
+    embedding_service = EmbeddingService(**(settings or _embedding_service_settings()))
+    logger.info("🔄 5/6: İş ilanları için AI embeddings oluşturuluyor...")
 
-        if vector_store.job_exists(job_dict):
-            job_embeddings.append(None)
+    jobs = [job.to_dict() for _, job in jobs_df.iterrows()]
+    pending = [
+        i for i, job in enumerate(jobs) if pd.notna(job.get("description")) and not vector_store.job_exists(job)
+    ]
+    if candidates is not None:
+        skipped = sum(1 for i in pending if not candidates[i])
+        pending = [i for i in pending if candidates[i]]
+        logger.info(
+            f"💸 Ön eleme: {skipped} ilan için embedding API çağrısı yapılmadı ({len(pending)} ilan gömülecek)"
+        )
+    if budget is not None and budget.limited:
+        pending = prioritize_jobs(pending, jobs)
+    queue.enqueue(jobs[i] for i in pending)
+
+    # Önceki çalıştırmada gömülüp store'a yazılamamış ilanlar
+    stored = queue.flush(vector_store)
+    if stored:
+        logger.info(f"♻️ Yarıda kalan çalıştırmadan {stored} hazır embedding store'a yazıldı")
+
+    work = queue.pending()
+    if budget is not None and budget.embeddings_left() is not None:
+        work = work[: budget.embeddings_left()]
+    if claims is not None and work:
+        owned = claims.claim(job_id for job_id, _ in work)
+        work = [item for item in work if item[0] in owned]
+
+    commit_size = config.vector_store_settings.get("queue_commit_size", DEFAULT_COMMIT_SIZE)
+    embedded = 0
+    for done, (job_id, document) in enumerate(tqdm(work, desc="İlan Embeddings")):
+        if budget is not None:
+            if not budget.can_embed():
+                logger.warning(f"⏱️ Bütçe doldu: {len(work) - done} ilan kuyrukta sonraki çalıştırmayı bekliyor")
+                break
+            budget.spend()
+        try:
+            embedding = embedding_service.create_embedding(document)
+        except Exception as e:
+            logger.warning(f"⚠️ Embedding oluşturma hatası: {e}")
+            embedding = None
+        if embedding is None:
+            queue.mark_failed(job_id)
             continue
+        queue.mark_embedded(job_id, _project(embedding, projection))
+        embedded += 1
+        if embedded % commit_size == 0:
+            stored += queue.flush(vector_store)
 
-        if pd.notna(job.get("description", "")):
-            try:
-                embedding = embedding_service.create_embedding(str(job["description"]))
-                job_embeddings.append(embedding)
-            except Exception as e:
-                logger.warning(f"⚠️ Embedding oluşturma hatası: {e}")
-                job_embeddings.append(None)
-        else:
-            job_embeddings.append(None)
+    return stored + queue.flush(vector_store)
 
-    return job_embeddings
 
+def _cascade_candidates(job_records: list[dict]) -> list[bool] | None:
+    """Ön eleme açıksa gömülecek ilanların maskesi (kapalıysa None)"""
+    cascade_cfg = embedding_settings.get("cascade") or {}
+    if not cascade_cfg.get("enabled"):
+        return None
+    return cascade_mask(
+        job_records, scoring_system, cascade_cfg.get("mode", "score"), cascade_cfg.get("pre_threshold")
+    )
 
-def _search_and_score_jobs(cv_embedding: list[float], vector_store: VectorStore, threshold: float) -> list[dict]:
-    """Benzer işleri bul ve puanla"""
-    logger.info("\n🔄 6/6: Akıllı eşleştirme ve filtreleme...")
 
-    top_k = config["vector_store_settings"]["top_k_results"]
-    search_results = vector_store.search_jobs(cv_embedding, n_results=top_k)
+def _embedding_claims() -> EmbeddingClaims:
+    """Persist dizinindeki süreçler arası embedding sahiplik kayıtları"""
+    return EmbeddingClaims(
+        Path(config.paths.chromadb_dir) / CLAIMS_FILE,
+        ttl=config.vector_store_settings.get("claim_ttl_seconds", DEFAULT_CLAIM_TTL),
+    )
 
-    similar_jobs = [
-        dict(metadata, similarity_score=(1 - dist) * 100)
-        for metadata, dist in zip(
-            search_results.get("metadatas", []), search_results.get("distances", []), strict=False
-        )
+
+def _jobs_from_search_results(search_results: dict[str, list]) -> list[dict]:
+    """Arama sonuçlarını iş ilanı sözlüklerine çevir"""
+    # Açıklama metadata'da değil, yalnızca doküman olarak saklanıyor
+    metadatas = search_results.get("metadatas", [])
+    documents = search_results.get("matches") or [""] * len(metadatas)
+    return [
+        dict(metadata, description=document, similarity_score=similarity_from_distance(dist))
+        for metadata, document, dist in zip(metadatas, documents, search_results.get("distances", []), strict=False)
     ]
 
-    if not similar_jobs:
-        return []
 
-    logger.info("🔍 Sonuçlar akıllı puanlama ile değerlendiriliyor...")
-    scored_jobs = score_jobs(similar_jobs, scoring_system, debug=False)
-    return [job for job in scored_jobs if job["similarity_score"] >= threshold]
+def _fuse_with_lexical(
+    search_results: dict[str, list],
+    cv_embedding: list[float],
+    cv_text: str,
+    vector_store: JobStore,
+    filter_metadata: dict | None = None,
+    min_similarity: float | None = None,
+) -> dict[str, list]:
+    """Vektör sonuçlarını BM25 sonuçlarıyla RRF üzerinden birleştir
+
+    Yalnızca sözcüksel aramada çıkan ilanlar vector store'dan getirilir ve
+    benzerlikleri kayıtlı vektörlerinden hesaplanır; ek embedding çağrısı yapılmaz.
+    Benzerliği ``min_similarity`` (%) altında kalan sözcüksel ilanlar elenir.
+    """
+    hybrid_cfg = config.vector_store_settings.get("hybrid_search", {})
+    lexical_hits = lexical_index.search(cv_text, n_results=hybrid_cfg.get("lexical_top_k", 50))
+    vector_ids = search_results.get("ids", [])
+    fused = reciprocal_rank_fusion(
+        [vector_ids, [job_id for job_id, _ in lexical_hits]], k=hybrid_cfg.get("rrf_k", DEFAULT_RRF_K)
+    )
+
+    position = {job_id: i for i, job_id in enumerate(vector_ids)}
+    extra = vector_store.get_jobs(
+        [job_id for job_id, _ in fused if job_id not in position],
+        filter_metadata=filter_metadata,
+        include_embeddings=True,
+    )
+    query = np.asarray(cv_embedding, dtype=np.float32)
+    query /= np.linalg.norm(query) or 1.0
+    candidates = {
+        job_id: (search_results["matches"][i], search_results["distances"][i], search_results["metadatas"][i])
+        for job_id, i in position.items()
+    }
+    for job_id, document, metadata, embedding in zip(
+        extra["ids"], extra["matches"], extra["metadatas"], extra["embeddings"], strict=True
+    ):
+        vector = np.asarray(embedding, dtype=np.float32)
+        similarity = float(query @ vector) / (float(np.linalg.norm(vector)) or 1.0)
+        if min_similarity is not None and similarity_from_distance(1.0 - similarity) < min_similarity:
+            continue
+        candidates[job_id] = (document, 1.0 - similarity, metadata)
+    added = len(candidates) - len(position)
+    if added:
+        logger.info(f"🔤 Sözcüksel arama {added} ek ilan getirdi")
+
+    ordered = [job_id for job_id, _ in fused if job_id in candidates]
+    return {
+        "ids": ordered,
+        "matches": [candidates[job_id][0] for job_id in ordered],
+        "distances": [candidates[job_id][1] for job_id in ordered],
+        "metadatas": [candidates[job_id][2] for job_id in ordered],
+    }
+
+
+def _search_and_score_jobs_batch(
+    cv_embeddings: list[list[float]],
+    vector_store: JobStore,
+    threshold: float,
+    filter_metadata: dict | None = None,
+    cv_texts: list[str] | None = None,
+) -> list[list[dict]]:
+    """Birden fazla CV için benzer işleri tek toplu sorguda bul ve puanla
+
+    Sözcüksel indeks etkinse ve CV metinleri verilmişse sonuçlar BM25
+    sıralamasıyla birleştirilir (hibrit arama); bu durumda son sıralama RRF
+    sırasıdır ve puanlama yalnızca eşik altındaki ilanları eler.
+    """
+    logger.info("\n🔄 6/6: Akıllı eşleştirme ve filtreleme...")
+    if filter_metadata:
+        logger.info(f"🧭 İndeks içi filtre: {filter_metadata}")
+
+    # Sabit top_k yerine eşik üzerindeki tüm ilanlar getirilir; top_k ilk sayfa boyutudur
+    top_k = config.vector_store_settings["top_k_results"]
+    batch_results = vector_store.search_jobs_batch(
+        cv_embeddings, n_results=top_k, filter_metadata=filter_metadata, min_similarity=threshold
+    )
+
+    hybrid = lexical_index is not None and bool(cv_texts)
+    if hybrid:
+        batch_results = [
+            _fuse_with_lexical(search_results, cv_embedding, cv_text, vector_store, filter_metadata, threshold)
+            for search_results, cv_embedding, cv_text in zip(batch_results, cv_embeddings, cv_texts, strict=True)
+        ]
+
+    scored_per_cv = []
+    for search_results in batch_results:
+        similar_jobs = _jobs_from_search_results(search_results)
+        if similar_jobs:
+            logger.info("🔍 Sonuçlar akıllı puanlama ile değerlendiriliyor...")
+            similar_jobs = score_jobs(similar_jobs, scoring_system, debug=False, keep_order=hybrid)
+        scored_per_cv.append(similar_jobs)
+    return scored_per_cv
 
 
 def _display_results(similar_jobs: list[dict], threshold: float) -> None:
@@ -371,6 +776,8 @@ def _display_results(similar_jobs: list[dict], threshold: float) -> None:
             # match_score veya similarity_score'u güvenli şekilde al
             score = job.get("match_score", job.get("similarity_score", 0))
             logger.info(f"   📊 Uygunluk: %{score:.1f}")
+            if "score_details" in job:
+                logger.info(f"   🧮 Anahtar kelime skoru: {job['score']} {explain_score(job)}")
             logger.info(f"   💼 Site: {job.get('source_site', job.get('site', 'Site belirtilmemiş'))}")
             logger.info(f"   👤 Persona: {job.get('persona_source', job.get('persona', 'Persona belirtilmemiş'))}")
             logger.info(f"   🔗 {job.get('url', job.get('job_url', 'URL bulunamadı'))}")
@@ -404,7 +811,16 @@ def print_manual_validation_guide():
     logger.info("=" * 80)
 
 
-def main(selected_personas=None, results_per_site=None, similarity_threshold=None):
+def main(
+    selected_personas=None,
+    results_per_site=None,
+    similarity_threshold=None,
+    cv_paths=None,
+    search_filters=None,
+    time_budget=None,
+    max_embeddings=None,
+    compact=False,
+):
     """Tek komutla tam otomatik AI kariyer analizi."""
     logger.info("🚀 Akıllı Kariyer Asistanı - Böl ve Fethet Stratejisi")
     logger.info("=" * 60)
@@ -418,27 +834,32 @@ def main(selected_personas=None, results_per_site=None, similarity_threshold=Non
         return
 
     # pathlib kullanarak CV dosyası kontrol
-    cv_path = Path(config["paths"]["cv_file"])
-    try:
-        if not cv_path.exists():
-            logger.error(f"❌ HATA: CV dosyası bulunamadı: {cv_path}")
-            logger.info("📝 Lütfen CV'nizi data/cv.txt dosyasına ekleyin.")
-            return
-
-        # CV dosyasının okunabilir olduğunu kontrol et
-        if cv_path.stat().st_size == 0:
-            logger.error(f"❌ HATA: CV dosyası boş: {cv_path}")
+    for cv_path in map(Path, cv_paths or [config.paths.cv_file]):
+        try:
+            if not cv_path.exists():
+                logger.error(f"❌ HATA: CV dosyası bulunamadı: {cv_path}")
+                logger.info("📝 Lütfen CV'nizi data/cv.txt dosyasına ekleyin.")
+                return
+
+            # CV dosyasının okunabilir olduğunu kontrol et
+            if cv_path.stat().st_size == 0:
+                logger.error(f"❌ HATA: CV dosyası boş: {cv_path}")
+                return
+
+        except OSError as e:
+            logger.error(f"❌ HATA: CV dosyası erişim hatası: {e}")
             return
 
-    except OSError as e:
-        logger.error(f"❌ HATA: CV dosyası erişim hatası: {e}")
-        return
-
     logger.info("✅ Sistem kontrolleri başarılı")
     logger.info("🎯 12 farklı JobSpy optimize edilmiş persona ile veri toplama başlatılıyor...\n")
 
     # Tam otomatik analiz çalıştır
-    analyze_and_find_best_jobs(selected_personas, results_per_site, similarity_threshold)
+    budget = Budget(time_budget, max_embeddings)
+    if budget.limited:
+        logger.info(f"⏱️ Bütçe: süre={time_budget or '∞'} sn, embedding={max_embeddings or '∞'}")
+    analyze_and_find_best_jobs(
+        selected_personas, results_per_site, similarity_threshold, cv_paths, search_filters, budget, compact
+    )
 
 
 # Test fonksiyonları için
@@ -451,4 +872,14 @@ if __name__ == "__main__":
         selected_personas=args.persona,
         results_per_site=args.results,
         similarity_threshold=args.threshold,
+        cv_paths=args.cv,
+        search_filters=build_where(
+            sites=args.site,
+            personas=args.persona,
+            max_age_days=args.max_age_days,
+            min_keyword_score=args.min_keyword_score,
+        ),
+        time_budget=args.time_budget,
+        max_embeddings=args.max_embeddings,
+        compact=args.compact,
     )
@@ -0,0 +1,252 @@
+"""
+Vektör Arama Kıyaslamaları
+Depolama/arama ayarlarının recall@k, bellek ve gecikme üzerindeki etkisini ölçer.
+
+Kullanım:
+    python -m src.benchmark quantization --snapshot snapshots/2024-06 --k 10
+    python -m src.benchmark quantization --synthetic 20000 --dimension 768
+    python -m src.benchmark dimension --snapshot snapshots/2024-06 --targets 512 256 128
+    python -m src.benchmark hnsw --synthetic 20000 --m 16 32 --search-ef 10 50 100
+"""
+
+# Standard Library
+import argparse
+import itertools
+import logging
+import time
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+# Third Party
+import numpy as np
+
+from .flat_index import DEFAULT_RERANK_FACTOR, FlatVectorStore
+from .projection import PCAProjection
+from .quantization import INDEX_QUANTIZATION_MODES, dequantize, nbytes
+from .snapshot import read_snapshot
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+def load_corpus(
+    snapshot: str | None = None, synthetic: int = 20000, dimension: int = 768, seed: int = 0
+) -> np.ndarray:
+    """Snapshot'taki vektörleri ya da kümelenmiş sentetik bir korpusu döndür"""
+    if snapshot:
+        _, matrix, scales, _ = read_snapshot(snapshot)
+        if matrix is None:
+            raise ValueError(f"Snapshot boş: {snapshot}")
+        return dequantize(matrix, scales)
+    rng = np.random.default_rng(seed)
+    # İlan embedding'leri gibi birkaç yüz konu kümesi etrafında toplanan, varyansı
+    # birkaç baskın yönde yoğunlaşan (azalan spektrumlu) vektörler
+    spectrum = (1.0 / np.sqrt(np.arange(1, dimension + 1))).astype(np.float32)
+    basis = np.linalg.qr(rng.normal(size=(dimension, dimension)))[0].astype(np.float32)
+    centers = rng.normal(size=(max(1, synthetic // 100), dimension)).astype(np.float32) * spectrum
+    labels = rng.integers(0, len(centers), size=synthetic)
+    noise = 0.35 * rng.normal(size=(synthetic, dimension)).astype(np.float32) * spectrum
+    return (centers[labels] + noise) @ basis
+
+
+def make_queries(corpus: np.ndarray, n_queries: int = 50, noise: float = 0.5, seed: int = 1) -> np.ndarray:
+    """Korpustan seçilen satırların gürültülü kopyaları (CV'ye benzeyen ama birebir aynı olmayan sorgular)"""
+    rng = np.random.default_rng(seed)
+    picked = corpus[rng.integers(0, len(corpus), size=n_queries)]
+    scale = np.linalg.norm(picked, axis=1, keepdims=True) / np.sqrt(corpus.shape[1])
+    return (picked + noise * scale * rng.normal(size=picked.shape)).astype(np.float32)
+
+
+def recall_at_k(expected: Sequence[Sequence[str]], found: Sequence[Sequence[str]]) -> float:
+    """Beklenen top-k kümelerinin bulunan sonuçlarda yakalanan ortalama oranı"""
+    ratios = [len(set(e) & set(f)) / len(e) for e, f in zip(expected, found, strict=True) if len(e)]
+    return float(np.mean(ratios)) if ratios else 1.0
+
+
+def corpus_records(corpus: np.ndarray) -> dict[str, tuple[np.ndarray, str, dict[str, Any]]]:
+    """Korpus satırlarını ``add_records`` girdisine çevir (satır i -> ``job_i``)"""
+    return {f"job_{i}": (vector, "", {"row": i}) for i, vector in enumerate(corpus)}
+
+
+def build_flat_store(corpus: np.ndarray, **settings: Any) -> FlatVectorStore:
+    """Korpusu bellek içi düz indekse yükle"""
+    store = FlatVectorStore(**settings)
+    store.add_records(corpus_records(corpus))
+    return store
+
+
+def timed_search(store: Any, queries: np.ndarray, k: int, repeats: int = 3) -> tuple[list[list[str]], float]:
+    """Sorguları tek tek çalıştır; ID listeleri ve sorgu başına en iyi ortalama gecikme (ms)"""
+    best = float("inf")
+    ids: list[list[str]] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        ids = [store.search_jobs(query, n_results=k)["ids"] for query in queries]
+        best = min(best, (time.perf_counter() - start) * 1000 / len(queries))
+    return ids, best
+
+
+def query_latencies(store: Any, queries: np.ndarray, k: int) -> tuple[list[list[str]], np.ndarray]:
+    """Sorguları tek tek çalıştır; ID listeleri ve sorgu başına gecikmeler (ms)"""
+    ids, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        ids.append(store.search_jobs(query.tolist(), n_results=k)["ids"])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return ids, np.array(latencies)
+
+
+def benchmark_quantization(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    modes: Sequence[str] = INDEX_QUANTIZATION_MODES,
+    rerank_factor: int = DEFAULT_RERANK_FACTOR,
+) -> list[dict[str, Any]]:
+    """Her nicemleme modu için recall@k, taranan bellek ve gecikmeyi ölç"""
+    baseline_ids: list[list[str]] | None = None
+    rows = []
+    for mode in modes:
+        store = build_flat_store(corpus, quantization=mode, rerank_factor=rerank_factor)
+        ids, latency = timed_search(store, queries, k)
+        if baseline_ids is None:
+            baseline_ids = ids
+        scanned = store._matrix[: len(store)] if mode == "none" else store._quantized_matrix()
+        rows.append(
+            {
+                "mode": mode,
+                f"recall@{k}": recall_at_k(baseline_ids, ids),
+                "scan_mb": nbytes(*scanned if isinstance(scanned, tuple) else (scanned,)) / 2**20,
+                "ms_per_query": latency,
+            }
+        )
+    return rows
+
+
+def benchmark_dimensions(
+    corpus: np.ndarray, queries: np.ndarray, targets: Sequence[int], k: int = 10
+) -> list[dict[str, Any]]:
+    """Tam boyuta karşı PCA ile düşürülmüş boyutlarda recall@k, indeks boyutu ve gecikmeyi ölç"""
+    full = build_flat_store(corpus)
+    baseline_ids, latency = timed_search(full, queries, k)
+    rows = [
+        {
+            "dimension": corpus.shape[1],
+            "explained_variance": 1.0,
+            f"recall@{k}": 1.0,
+            "index_mb": nbytes(full._matrix[: len(full)]) / 2**20,
+            "ms_per_query": latency,
+        }
+    ]
+    for dimension in targets:
+        projection = PCAProjection.fit([corpus], dimension)
+        store = build_flat_store(projection.transform(corpus))
+        ids, latency = timed_search(store, projection.transform(queries), k)
+        rows.append(
+            {
+                "dimension": dimension,
+                "explained_variance": projection.explained_variance_ratio,
+                f"recall@{k}": recall_at_k(baseline_ids, ids),
+                "index_mb": nbytes(store._matrix[: len(store)]) / 2**20,
+                "ms_per_query": latency,
+            }
+        )
+    return rows
+
+
+def benchmark_hnsw(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    m_values: Sequence[int] = (16,),
+    construction_ef_values: Sequence[int] = (100,),
+    search_ef_values: Sequence[int] = (10, 50, 100),
+) -> list[dict[str, Any]]:
+    """Her HNSW ayarı için kurulum süresi, kesin aramaya göre recall@k ve p50/p99 gecikmeyi ölç
+
+    ChromaDB search_ef'i indeks belleğe yüklenirken okuduğundan her ayar
+    kombinasyonu için ayrı bir geçici koleksiyon kurulur.
+    """
+    exact_ids, _ = timed_search(build_flat_store(corpus), queries, k, repeats=1)
+    rows = []
+    for m, construction_ef, search_ef in itertools.product(m_values, construction_ef_values, search_ef_values):
+        store = VectorStore(
+            collection_name=f"benchmark_{uuid.uuid4().hex[:8]}",
+            hnsw={"M": m, "construction_ef": construction_ef, "search_ef": search_ef},
+        )
+        try:
+            start = time.perf_counter()
+            store.add_records(corpus_records(corpus))
+            build_seconds = time.perf_counter() - start
+            store.search_jobs(queries[0].tolist(), n_results=k)  # ısınma
+            ids, latencies = query_latencies(store, queries, k)
+        finally:
+            store.client.delete_collection(store.collection_name)
+        rows.append(
+            {
+                "M": m,
+                "construction_ef": construction_ef,
+                "search_ef": search_ef,
+                f"recall@{k}": recall_at_k(exact_ids, ids),
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "p99_ms": float(np.percentile(latencies, 99)),
+                "build_s": build_seconds,
+            }
+        )
+    return rows
+
+
+def format_table(rows: list[dict[str, Any]]) -> str:
+    """Sonuç satırlarını hizalı düz metin tabloya çevir"""
+    if not rows:
+        return ""
+    headers = list(rows[0])
+    cells = [[f"{row[h]:.4f}" if isinstance(row[h], float) else str(row[h]) for h in headers] for row in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths, strict=True))]
+    lines += ["  ".join(c.ljust(w) for c, w in zip(row, widths, strict=True)) for row in cells]
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--snapshot", help="Korpus olarak kullanılacak snapshot dizini")
+    common.add_argument("--synthetic", type=int, default=20000, help="Sentetik korpus boyutu")
+    common.add_argument("--dimension", type=int, default=768, help="Sentetik vektör boyutu")
+    common.add_argument("--queries", type=int, default=50, help="Sorgu sayısı")
+    common.add_argument("--k", type=int, default=10, help="recall@k için k")
+
+    parser = argparse.ArgumentParser(description="Vektör arama kıyaslamaları")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    quantization = subparsers.add_parser("quantization", parents=[common], help="float32 / int8 taramayı karşılaştır")
+    quantization.add_argument("--rerank-factor", type=int, default=DEFAULT_RERANK_FACTOR)
+    dimension = subparsers.add_parser("dimension", parents=[common], help="PCA ile düşürülmüş boyutları karşılaştır")
+    dimension.add_argument("--targets", type=int, nargs="+", default=[512, 256, 128], help="Hedef boyutlar")
+    hnsw = subparsers.add_parser("hnsw", parents=[common], help="ChromaDB HNSW ayarlarını karşılaştır")
+    hnsw.add_argument("--m", type=int, nargs="+", default=[16], help="hnsw:M değerleri")
+    hnsw.add_argument("--construction-ef", type=int, nargs="+", default=[100], help="hnsw:construction_ef değerleri")
+    hnsw.add_argument("--search-ef", type=int, nargs="+", default=[10, 50, 100], help="hnsw:search_ef değerleri")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> list[dict[str, Any]]:
+    args = build_parser().parse_args(argv)
+    corpus = load_corpus(args.snapshot, args.synthetic, args.dimension)
+    queries = make_queries(corpus, args.queries)
+    logger.info(f"📏 Korpus: {corpus.shape[0]} vektör x {corpus.shape[1]} boyut, {len(queries)} sorgu")
+    if args.command == "dimension":
+        rows = benchmark_dimensions(corpus, queries, args.targets, k=args.k)
+    elif args.command == "hnsw":
+        rows = benchmark_hnsw(corpus, queries, args.k, args.m, args.construction_ef, args.search_ef)
+    else:
+        rows = benchmark_quantization(corpus, queries, k=args.k, rerank_factor=args.rerank_factor)
+    logger.info("\n" + format_table(rows))
+    return rows
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("src").setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+    main()
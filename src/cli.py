@@ -7,21 +7,26 @@ and similarity thresholds."""
 import argparse
 from pathlib import Path
 
-# Third Party
-import yaml
+from .config import load_config
 
 
 def load_persona_choices(config_path: Path = Path("config.yaml")) -> list[str]:
     """Return available persona names from the configuration."""
     try:
-        with open(config_path, encoding="utf-8") as f:
-            cfg = yaml.safe_load(f)
-        return list(cfg.get("persona_search_configs", {}).keys())
+        return list(load_config(config_path).personas)
     except Exception:
         return []
 
 
-def build_parser(personas: list[str]) -> argparse.ArgumentParser:
+def load_site_choices(config_path: Path = Path("config.yaml")) -> list[str]:
+    """Return configured target sites."""
+    try:
+        return list(load_config(config_path).job_search.target_sites)
+    except Exception:
+        return []
+
+
+def build_parser(personas: list[str], sites: list[str] | None = None) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Akilli Kariyer Asistani komut satiri arayuzu")
     parser.add_argument(
         "-p",
@@ -42,10 +47,49 @@ def build_parser(personas: list[str]) -> argparse.ArgumentParser:
         type=int,
         help="Benzerlik esigi (yuzde)",
     )
+    parser.add_argument(
+        "--cv",
+        action="append",
+        help=("Eslestirilecek CV dosyasi. Birden fazla kullanilirsa tum CV'ler tek calistirmada siralanir."),
+    )
+    parser.add_argument(
+        "--site",
+        action="append",
+        choices=sites or None,
+        help="Sonuclari belirtilen site(ler)deki ilanlarla sinirlar (indeks icinde filtrelenir).",
+    )
+    parser.add_argument(
+        "--max-age-days",
+        type=float,
+        help="Sadece son N gunde yayinlanan ilanlari getirir (indeks icinde filtrelenir).",
+    )
+    parser.add_argument(
+        "--min-keyword-score",
+        type=int,
+        help="Anahtar kelime skoru bu degerin altindaki ilanlari indeks icinde eler.",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        help=(
+            "Calistirma icin sure butcesi (saniye). Persona ve ilanlar onceliklerine gore islenir; "
+            "butce dolunca tamamlananlarla siralama yapilir."
+        ),
+    )
+    parser.add_argument(
+        "--max-embeddings",
+        type=int,
+        help="Bu calistirmada yapilacak en fazla ilan embedding API cagrisi.",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Calistirma sonunda koleksiyonu yeniden kurarak silinen ilanlarin yerini geri kazanir (bakim).",
+    )
     return parser
 
 
 def parse_args() -> argparse.Namespace:
     personas = load_persona_choices()
-    parser = build_parser(personas)
+    parser = build_parser(personas, load_site_choices())
     return parser.parse_args()
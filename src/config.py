@@ -0,0 +1,162 @@
+"""Typed application configuration.
+
+config.yaml is parsed and validated once per process; every module that
+needs settings goes through :func:`load_config` and receives the same
+:class:`AppConfig` instance. ``AppConfig`` keeps dict-style access
+(``config["paths"]["cv_file"]``) so section dicts can still be handed to
+components that expect plain mappings.
+"""
+
+from __future__ import annotations
+
+# Standard Library
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+# Third Party
+import yaml
+
+from .fingerprint import config_hash
+
+DEFAULT_CONFIG_PATH = Path("config.yaml")
+
+
+class ConfigError(ValueError):
+    """Raised when config.yaml is structurally invalid."""
+
+
+@dataclass(frozen=True)
+class JobSearchSettings:
+    target_sites: tuple[str, ...]
+    default_hours_old: int
+    default_results_per_site: int
+    min_similarity_threshold: float
+
+
+@dataclass(frozen=True)
+class PersonaConfig:
+    name: str
+    term: str
+    hours_old: int
+    results: int
+
+
+@dataclass(frozen=True)
+class PathSettings:
+    data_dir: str = "data"
+    cv_file: str = "data/cv.txt"
+    chromadb_dir: str = "data/chromadb"
+    logs_dir: str = "logs"
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    raw: dict[str, Any]
+    path: Path
+    fingerprint: str
+    job_search: JobSearchSettings
+    personas: dict[str, PersonaConfig]
+    paths: PathSettings
+    embedding_settings: dict[str, Any] = field(default_factory=dict)
+    vector_store_settings: dict[str, Any] = field(default_factory=dict)
+    scoring: dict[str, Any] = field(default_factory=dict)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.raw[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.raw
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.raw.get(key, default)
+
+
+def _section(raw: dict, name: str, required: bool = True) -> dict:
+    value = raw.get(name)
+    if value is None:
+        if required:
+            raise ConfigError(f"Eksik config bölümü: '{name}'")
+        return {}
+    if not isinstance(value, dict):
+        raise ConfigError(f"Config bölümü '{name}' bir sözlük olmalı")
+    return value
+
+
+def _number(section: dict, key: str, section_name: str, default: Any = None) -> Any:
+    value = section.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        raise ConfigError(f"'{section_name}.{key}' sayısal olmalı (değer: {value!r})")
+    return value
+
+
+def parse_config(raw: dict[str, Any], path: Path = DEFAULT_CONFIG_PATH) -> AppConfig:
+    """Validate a raw config mapping and build an AppConfig."""
+    if not isinstance(raw, dict):
+        raise ConfigError("config.yaml kök öğesi bir sözlük olmalı")
+
+    search = _section(raw, "job_search_settings")
+    sites = search.get("target_sites")
+    if not isinstance(sites, list) or not all(isinstance(s, str) for s in sites):
+        raise ConfigError("'job_search_settings.target_sites' bir string listesi olmalı")
+    job_search = JobSearchSettings(
+        target_sites=tuple(sites),
+        default_hours_old=int(_number(search, "default_hours_old", "job_search_settings")),
+        default_results_per_site=int(_number(search, "default_results_per_site", "job_search_settings")),
+        min_similarity_threshold=_number(search, "min_similarity_threshold", "job_search_settings"),
+    )
+
+    personas = {}
+    for name, persona_cfg in _section(raw, "persona_search_configs").items():
+        if not isinstance(persona_cfg, dict) or not isinstance(persona_cfg.get("term"), str):
+            raise ConfigError(f"Persona '{name}' için 'term' tanımlı olmalı")
+        section_name = f"persona_search_configs.{name}"
+        personas[name] = PersonaConfig(
+            name=name,
+            term=persona_cfg["term"],
+            hours_old=int(_number(persona_cfg, "hours_old", section_name, job_search.default_hours_old)),
+            results=int(_number(persona_cfg, "results", section_name, job_search.default_results_per_site)),
+        )
+
+    paths_cfg = _section(raw, "paths")
+    paths = PathSettings(**{k: str(v) for k, v in paths_cfg.items() if k in PathSettings.__dataclass_fields__})
+
+    scoring = _section(raw, "scoring_system", required=False)
+    if "threshold" in scoring:
+        _number(scoring, "threshold", "scoring_system")
+
+    return AppConfig(
+        raw=raw,
+        path=path,
+        fingerprint=config_hash(raw),
+        job_search=job_search,
+        personas=personas,
+        paths=paths,
+        embedding_settings=_section(raw, "embedding_settings", required=False),
+        vector_store_settings=_section(raw, "vector_store_settings", required=False),
+        scoring=scoring,
+    )
+
+
+@lru_cache(maxsize=4)
+def _load_config_cached(resolved_path: Path) -> AppConfig:
+    with open(resolved_path, encoding="utf-8") as f:
+        raw = yaml.safe_load(f)
+    return parse_config(raw, resolved_path)
+
+
+def load_config(config_path: str | Path = DEFAULT_CONFIG_PATH) -> AppConfig:
+    """Load config.yaml once per process and return the shared AppConfig.
+
+    Raises:
+        FileNotFoundError: Config dosyası bulunamazsa
+        yaml.YAMLError: YAML parse hatası olursa
+        ConfigError: Yapı doğrulaması başarısız olursa
+    """
+    return _load_config_cached(Path(config_path).resolve())
+
+
+def clear_config_cache() -> None:
+    """Forget loaded configs (tests or an explicit reload)."""
+    _load_config_cached.cache_clear()
@@ -15,6 +15,8 @@ from pathlib import Path
 import pandas as pd
 from jobspy import scrape_jobs
 
+from .text_normalizer import normalize_descriptions
+
 logger = logging.getLogger(__name__)
 
 # --- VARSAYILAN AYARLAR ---
@@ -29,6 +31,7 @@ def collect_job_data(
     max_results_per_site=DEFAULT_MAX_RESULTS_PER_SITE,
     site_names=TARGET_SITES,
     hours_old=72,  # JobSpy native tarih filtresi (varsayılan: 3 gün)
+    normalize=True,
 ):
     """
     JobSpy'ın gelişmiş özelliklerini kullanarak optimize edilmiş iş ilanı toplama.
@@ -39,6 +42,7 @@ def collect_job_data(
         max_results_per_site (int): Her site için maksimum sonuç sayısı
         site_names (list): Hedeflenen siteler listesi
         hours_old (int): Son X saat içindeki ilanlar (JobSpy native filtre)
+        normalize (bool): Açıklamalardaki markup, fazla boşluk ve kalıp paragrafları temizle
 
     Returns:
         pandas.DataFrame: Birleştirilmiş iş ilanları veya None (hata durumunda)
@@ -92,7 +96,14 @@ def collect_job_data(
 
     # Tüm sitelerden gelen DataFrame'leri birleştir
     combined_df = pd.concat(all_jobs_list, ignore_index=True)  # Zaman damgası ekle
-    combined_df["collected_at"] = datetime.now()  # Gelişmiş deduplication (farklı sitelerden aynı ilan gelebilir)
+    combined_df["collected_at"] = datetime.now()
+
+    # Puanlama ve embedding temiz metin üzerinde çalışır; tekrar tespiti de temiz metinle yapılır
+    if normalize and "description" in combined_df.columns:
+        titles = combined_df["title"] if "title" in combined_df.columns else None
+        combined_df["description"] = normalize_descriptions(combined_df["description"], titles)
+
+    # Gelişmiş deduplication (farklı sitelerden aynı ilan gelebilir)
     logger.info("\n🔄 Deduplication başlatılıyor...")
     initial_count = len(combined_df)
 
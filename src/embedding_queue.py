@@ -0,0 +1,134 @@
+"""
+Kalıcı Embedding Kuyruğu
+Gömülmeyi bekleyen ilanlar koleksiyon başına bir SQLite dosyasında tutulur.
+Her embedding API'den döner dönmez kuyruğa yazılır ve küçük parçalar halinde
+store'a işlenir; çalıştırma yarıda kesilirse bir sonraki çalıştırma kaldığı
+yerden devam eder ve hazır embedding'ler yeniden istenmez.
+"""
+
+# Standard Library
+import json
+import logging
+import sqlite3
+from collections.abc import Iterable
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+# Third Party
+import numpy as np
+
+from .job_schema import job_document, job_metadata, stable_job_id
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SUFFIX = ".queue.sqlite3"
+DEFAULT_COMMIT_SIZE = 25
+# Bu kadar başarısız denemeden sonra ilan kuyruktan çıkarılır
+MAX_ATTEMPTS = 3
+
+
+def queue_path(persist_directory: str | Path, collection_name: str) -> Path:
+    """Koleksiyonun kuyruk dosyası (ör. ``data/chromadb/job_embeddings.queue.sqlite3``)"""
+    return Path(persist_directory) / f"{collection_name}{QUEUE_SUFFIX}"
+
+
+class EmbeddingQueue:
+    """İlan ID'si, dokümanı, metadata'sı ve (hazırsa) embedding'i ile iş kuyruğu
+
+    Durumlar: ``embedding`` boşsa bekliyor, doluysa store'a işlenmeyi bekliyor;
+    store'a işlenen satırlar silinir. Sıra ekleme sırasıdır.
+    """
+
+    def __init__(self, path: str | Path, max_attempts: int = MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS queue ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL UNIQUE, document TEXT NOT NULL, "
+                "metadata TEXT NOT NULL, embedding BLOB, attempts INTEGER NOT NULL DEFAULT 0)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM queue").fetchone()[0]
+
+    def enqueue(self, jobs: Iterable[dict[str, Any]]) -> int:
+        """İlanları kuyruğa ekle (zaten kuyruktakiler atlanır); eklenen sayıyı döner"""
+        rows = [
+            (stable_job_id(job), job_document(job), json.dumps(job_metadata(job), ensure_ascii=False)) for job in jobs
+        ]
+        with closing(self._connect()) as connection, connection:
+            before = connection.total_changes
+            connection.executemany("INSERT OR IGNORE INTO queue (job_id, document, metadata) VALUES (?, ?, ?)", rows)
+            return connection.total_changes - before
+
+    def pending(self) -> list[tuple[str, str]]:
+        """Henüz gömülmemiş ``(job_id, document)`` çiftleri, kuyruk sırasıyla"""
+        with closing(self._connect()) as connection:
+            return connection.execute(
+                "SELECT job_id, document FROM queue WHERE embedding IS NULL ORDER BY seq"
+            ).fetchall()
+
+    def mark_embedded(self, job_id: str, embedding: list[float]) -> None:
+        """Embedding'i kalıcı olarak kaydet (store'a işlenene kadar kuyrukta kalır)"""
+        blob = np.asarray(embedding, dtype=np.float32).tobytes()
+        with closing(self._connect()) as connection, connection:
+            connection.execute("UPDATE queue SET embedding = ? WHERE job_id = ?", (blob, job_id))
+
+    def mark_failed(self, job_id: str) -> None:
+        """Başarısız denemeyi say; ``max_attempts`` dolunca ilanı kuyruktan çıkar"""
+        if self._count_failures([job_id]):
+            logger.warning(f"⚠️ {job_id} {self.max_attempts} denemede gömülemedi, kuyruktan çıkarıldı")
+
+    def _count_failures(self, job_ids: list[str]) -> int:
+        """Denemeleri artır, ``max_attempts`` dolanları sil; silinen sayıyı döner"""
+        rows = [(job_id,) for job_id in job_ids]
+        with closing(self._connect()) as connection, connection:
+            connection.executemany("UPDATE queue SET attempts = attempts + 1 WHERE job_id = ?", rows)
+            before = connection.total_changes
+            connection.executemany(
+                "DELETE FROM queue WHERE job_id = ? AND attempts >= ?",
+                [(job_id, self.max_attempts) for job_id in job_ids],
+            )
+            return connection.total_changes - before
+
+    def flush(self, store: Any) -> int:
+        """Hazır embedding'leri store'a işle ve yazılanları kuyruktan sil; eklenen sayıyı döner
+
+        ``add_records`` mevcut ID'leri atladığından, işleme ile silme arasında
+        kesilen bir çalıştırma tekrar oynatıldığında çift kayıt oluşmaz.
+        Yalnızca store'da bulunan ID'ler silinir; reddedilenler embedding'leriyle
+        kuyrukta kalır ve bir deneme sayılır.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT job_id, document, metadata, embedding FROM queue WHERE embedding IS NOT NULL ORDER BY seq"
+            ).fetchall()
+        if not rows:
+            return 0
+        records = {
+            job_id: (np.frombuffer(blob, dtype=np.float32).tolist(), document, json.loads(metadata))
+            for job_id, document, metadata, blob in rows
+        }
+        try:
+            added = store.add_records(records)
+        except Exception as e:
+            logger.error(f"❌ Kuyruktaki embedding'ler store'a işlenemedi: {e}", exc_info=True)
+            added = 0
+        stored = store.existing_ids(list(records))
+        with closing(self._connect()) as connection, connection:
+            connection.executemany("DELETE FROM queue WHERE job_id = ?", [(job_id,) for job_id in stored])
+        rejected = [job_id for job_id in records if job_id not in stored]
+        if rejected:
+            dropped = self._count_failures(rejected)
+            logger.warning(
+                f"⚠️ {len(rejected)} hazır embedding store'a yazılamadı, kuyrukta bekliyor"
+                + (f" ({dropped} ilan {self.max_attempts} denemeden sonra çıkarıldı)" if dropped else "")
+            )
+        return added
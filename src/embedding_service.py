@@ -17,15 +17,29 @@ from dotenv import load_dotenv
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+DEFAULT_EMBEDDING_MODEL = "models/text-embedding-004"
+
 
 class EmbeddingService:
-    def __init__(self, batch_size: int = 10, retry_count: int = 3, rate_limit_delay: float = 0.1):
-        """Gemini API'yi başlat ve konfigürasyon ayarlarını sakla"""
+    def __init__(
+        self,
+        batch_size: int = 10,
+        retry_count: int = 3,
+        rate_limit_delay: float = 0.1,
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        output_dimensionality: int | None = None,
+    ):
+        """Gemini API'yi başlat ve konfigürasyon ayarlarını sakla
+
+        ``output_dimensionality`` verilirse API'den bu boyutta (kısaltılmış)
+        vektör istenir; destekleyen modellerde (ör. text-embedding-004) geçerlidir.
+        """
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key or api_key == "your_gemini_api_key_here":
             raise ValueError("Gemini API key geçerli değil! .env dosyasını kontrol edin.")
         genai.configure(api_key=api_key)
-        self.model = "models/text-embedding-004"
+        self.model = model
+        self.output_dimensionality = output_dimensionality
         self.batch_size = batch_size
         self.retry_count = retry_count
         self.rate_limit_delay = rate_limit_delay
@@ -52,7 +66,8 @@ class EmbeddingService:
         retry_count = retry_count if retry_count is not None else self.retry_count
         for attempt in range(retry_count):
             try:
-                result = genai.embed_content(model=self.model, content=text, task_type="retrieval_document")
+                options = {"output_dimensionality": self.output_dimensionality} if self.output_dimensionality else {}
+                result = genai.embed_content(model=self.model, content=text, task_type="retrieval_document", **options)
                 return result["embedding"]  # type: ignore
             except Exception as e:
                 logger.warning(f"⚠️ Embedding hatası (deneme {attempt + 1}/{retry_count}): {str(e)}")
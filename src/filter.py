@@ -5,9 +5,17 @@ Junior/entry-level pozisyonlar için akıllı filtreleme işlemleri
 
 # Standard Library
 import logging
+import math
+from numbers import Real
+
+from .intelligent_scoring import ScoreRecord
+from .job_schema import stable_job_id
 
 logger = logging.getLogger(__name__)
 
+# Embedding öncesi ön eleme kuralları
+CASCADE_MODES = ("score", "junior")
+
 
 def _get_filter_blacklists():
     """Filtreleme blacklist'lerini döndürür"""
@@ -105,12 +113,20 @@ def _get_filter_blacklists():
     )
 
 
+def _job_text(job):
+    """İlanın başlık ve açıklamasını string olarak döndür"""
+    return str(job.get("title") or ""), str(job.get("description") or "")
+
+
 def _check_job_filters(job, blacklists):
     """Tek bir iş ilanını blacklist'lere karşı kontrol et"""
-    title_bl, exp_bl, resp_bl, scope_bl = blacklists
+    title, description = _job_text(job)
+    return _check_text_filters(title.lower(), description.lower(), blacklists)
+
 
-    title = job.get("title", "").lower()
-    description = job.get("description", "").lower()
+def _check_text_filters(title, description, blacklists):
+    """Küçük harfe çevrilmiş başlık/açıklamayı blacklist'lere karşı kontrol et"""
+    title_bl, exp_bl, resp_bl, scope_bl = blacklists
 
     # Filtreleme kontrolleri
     if any(word in title for word in title_bl):
@@ -185,34 +201,128 @@ def filter_junior_suitable_jobs(jobs_list, debug=False):
     return filtered_jobs
 
 
-def score_jobs(jobs_list, scoring_system, debug=False):
-    """Apply intelligent scoring system and return jobs above threshold."""
+def _score_records(jobs_list, scoring_system, job_ids=None):
+    """Her ilanın ScoreRecord'u; CV yetenekleri tanımlıysa yetenek bonusu dahil"""
+    bonuses = {}
+    if scoring_system.cv_skills:
+        job_ids = job_ids if job_ids is not None else [stable_job_id(job) for job in jobs_list]
+        scoring_system.skill_index.add_jobs(jobs_list, job_ids)
+        bonuses = scoring_system.skill_bonuses()
+
+    records = []
+    for i, job in enumerate(jobs_list):
+        record = scoring_system.score_record(job)
+        if bonuses:
+            record.add_skill_bonus(bonuses.get(job_ids[i], 0))
+        records.append(record)
+    return records
+
+
+def score_jobs(jobs_list, scoring_system, debug=False, keep_order=False):
+    """Apply intelligent scoring system and return jobs above threshold.
+
+    Each job gets an int ``score`` and a compact ``score_details`` record
+    (see :class:`ScoreRecord`); use :func:`explain_score` to build a plain
+    dict for the jobs that are actually displayed or exported.
+
+    When ``cv_skill_keywords`` are configured, jobs are added to the scoring
+    system's skill index and matching postings receive the CV skill bonus.
+
+    Results are sorted by score unless ``keep_order`` is set, in which case
+    the input order (e.g. the hybrid search RRF ranking) is preserved.
+    """
     scored = []
-    for job in jobs_list:
-        total, details = scoring_system.score_job(job)
-        job["score"] = total
-        job["score_details"] = details
-        if scoring_system.should_include(total):
+    for job, record in zip(jobs_list, _score_records(jobs_list, scoring_system), strict=True):
+        job["score"] = record.total
+        job["score_details"] = record
+        if scoring_system.should_include(record.total):
             scored.append(job)
             if debug:
-                logger.debug(f"✅ Skor {total} ile kabul: {job.get('title', 'N/A')} - {details}")
+                logger.debug(f"✅ Skor {record.total} ile kabul: {job.get('title', 'N/A')} - {record!r}")
         elif debug:
-            logger.debug(f"🔥 Skor {total} ile reddedildi: {job.get('title', 'N/A')} - {details}")
+            logger.debug(f"🔥 Skor {record.total} ile reddedildi: {job.get('title', 'N/A')} - {record!r}")
 
-    scored.sort(key=lambda x: x["score"], reverse=True)
+    if not keep_order:
+        scored.sort(key=lambda x: x["score"], reverse=True)
     return scored
 
 
+def cascade_mask(jobs_list, scoring_system, mode="score", pre_threshold=None):
+    """Embedding öncesi ucuz ön eleme: her ilan için gömülmeye değer mi?
+
+    ``"score"`` anahtar kelime skoru ``pre_threshold`` (None ise puanlama
+    eşiği) ve üzerinde olanları, ``"junior"`` junior filtresinden geçenleri
+    seçer. İlanda hesaplanmış ``keyword_score`` varsa yeniden puanlanmaz.
+    """
+    if mode not in CASCADE_MODES:
+        raise ValueError(f"Geçersiz ön eleme modu: {mode!r} (seçenekler: {', '.join(CASCADE_MODES)})")
+    if mode == "junior":
+        blacklists = _get_filter_blacklists()
+        return [_check_job_filters(job, blacklists) == "passed" for job in jobs_list]
+
+    threshold = scoring_system.threshold if pre_threshold is None else pre_threshold
+    mask = []
+    for job in jobs_list:
+        score = job.get("keyword_score")
+        if not isinstance(score, Real) or math.isnan(score):
+            score = scoring_system.score_record(job).total
+        mask.append(score >= threshold)
+    return mask
+
+
+def explain_score(job):
+    """Return the score breakdown of a scored job as a plain dict (built on demand)."""
+    details = job.get("score_details")
+    if details is None:
+        return {}
+    return details.explain() if isinstance(details, ScoreRecord) else dict(details)
+
+
 def compare_filters(jobs_list, scoring_system, debug=False):
-    """Return comparison of legacy filter and intelligent scoring results."""
-    old_filtered = filter_junior_suitable_jobs(jobs_list, debug=debug)
-    new_filtered = score_jobs(jobs_list, scoring_system, debug=debug)
+    """Return comparison of legacy filter and intelligent scoring results.
 
-    old_titles = {job.get("title") for job in old_filtered}
-    new_titles = {job.get("title") for job in new_filtered}
+    Both rule sets are evaluated in a single pass per job and jobs are
+    identified by their stable job ID, so postings sharing a title stay
+    distinct. The intelligent side scores jobs exactly like
+    :func:`score_jobs`, CV skill bonus included. Input job dicts are not
+    modified.
+    """
+    blacklists = _get_filter_blacklists()
+    old_only, new_only, intersection = [], [], []
+    unique = {}
+    for job in jobs_list or []:
+        unique.setdefault(stable_job_id(job), job)
+    jobs = list(unique.values())
 
+    # Same scoring path as score_jobs (including the CV skill bonus)
+    records = _score_records(jobs, scoring_system, job_ids=list(unique))
+    for job_id, job, record in zip(unique, jobs, records, strict=True):
+        # Scoring regexes are case-insensitive; only the legacy rules need lowercase text
+        title, description = _job_text(job)
+        old_passed = _check_text_filters(title.lower(), description.lower(), blacklists) == "passed"
+        new_passed = scoring_system.should_include(record.total)
+
+        if old_passed and new_passed:
+            intersection.append(job_id)
+        elif old_passed:
+            old_only.append(job_id)
+        elif new_passed:
+            new_only.append(job_id)
+        if debug:
+            logger.debug(f"🔀 {job_id}: eski={old_passed} yeni={new_passed} skor={record.total}")
+
+    counts = {
+        "total": len(unique),
+        "old_passed": len(old_only) + len(intersection),
+        "new_passed": len(new_only) + len(intersection),
+        "old_only": len(old_only),
+        "new_only": len(new_only),
+        "intersection": len(intersection),
+    }
+    logger.info(f"🔀 Filtre karşılaştırması: {counts}")
     return {
-        "old_only": list(old_titles - new_titles),
-        "new_only": list(new_titles - old_titles),
-        "intersection": list(old_titles & new_titles),
+        "old_only": old_only,
+        "new_only": new_only,
+        "intersection": intersection,
+        "counts": counts,
     }
@@ -0,0 +1,17 @@
+"""Stable hashes for texts and config sections."""
+
+# Standard Library
+import hashlib
+import json
+from typing import Any
+
+
+def text_hash(text: str) -> str:
+    """Return a short, stable hash of the given text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def config_hash(section: Any) -> str:
+    """Return a stable hash of a (JSON serialisable) config section."""
+    canonical = json.dumps(section, sort_keys=True, ensure_ascii=False, default=str)
+    return text_hash(canonical)
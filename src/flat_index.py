@@ -0,0 +1,683 @@
+"""
+Düz (Flat) Vektör İndeksi
+ChromaDB'ye alternatif, NumPy tabanlı kesin (exact) arama yapan depolama.
+
+Vektörler normalize edilmiş float32 matris olarak bellek eşlemeli bir
+``vectors.npy`` dosyasında, metadata ve dokümanlar ise yanındaki
+``records.jsonl`` tablosunda saklanır. Top-k sorgusu tek bir matris-vektör
+çarpımı ve ``argpartition`` ile yanıtlanır. int8 modunda tarama yanındaki
+``vectors.int8.npy`` / ``scales.npy`` dosyaları üzerinde yapılır.
+"""
+
+# Standard Library
+import json
+import logging
+import os
+import shutil
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# Third Party
+import numpy as np
+import pandas as pd
+
+from .job_schema import POSTED_TS_FIELD, job_document, job_metadata, stable_job_id, to_timestamp
+from .quantization import INDEX_QUANTIZATION_MODES, quantize, quantized_scores
+from .snapshot import DEFAULT_IMPORT_CHUNK_SIZE, export_snapshot, import_snapshot
+from .store_lock import DEFAULT_LOCK_TIMEOUT, locked, store_writer_lock
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.npy"
+RECORDS_FILE = "records.jsonl"
+# int8 modunda taranan kopya ve satır ölçekleri (vectors.npy yalnızca yeniden sıralamada okunur)
+QUANTIZED_FILE = "vectors.int8.npy"
+SCALES_FILE = "scales.npy"
+MIN_CAPACITY = 1024
+DEFAULT_RERANK_FACTOR = 4
+# Nicemlenmiş tahminlerde eşik aramasına tanınan pay (yüzde puanı)
+QUANTIZED_THRESHOLD_MARGIN = 2.0
+
+_COMPARATORS = {
+    "$eq": lambda value, target: value == target,
+    "$ne": lambda value, target: value != target,
+    "$gt": lambda value, target: value is not None and value > target,
+    "$gte": lambda value, target: value is not None and value >= target,
+    "$lt": lambda value, target: value is not None and value < target,
+    "$lte": lambda value, target: value is not None and value <= target,
+    "$in": lambda value, target: value in target,
+    "$nin": lambda value, target: value not in target,
+}
+
+
+def matches_where(metadata: dict[str, Any], where: dict[str, Any] | None) -> bool:
+    """Evaluate a ChromaDB-style ``where`` clause against one metadata dict."""
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, target in condition.items():
+                try:
+                    if not _COMPARATORS[op](value, target):
+                        return False
+                except TypeError:
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+def _top_indices(similarities: np.ndarray, n_results: int, min_similarity: float | None) -> np.ndarray:
+    """Eşik (yüzde) üzerindeki ya da en benzer ``n_results`` indeks, azalan benzerlik sırasıyla"""
+    if min_similarity is not None:
+        top = np.flatnonzero(similarities * 100 >= min_similarity)
+    else:
+        k = min(n_results, similarities.shape[0])
+        top = np.argpartition(-similarities, k - 1)[:k] if k < similarities.shape[0] else np.arange(k)
+    return top[np.argsort(-similarities[top], kind="stable")]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class FlatVectorStore:
+    """VectorStore ile aynı API'yi sunan NumPy tabanlı düz indeks"""
+
+    def __init__(
+        self,
+        persist_directory: str | None = None,
+        collection_name: str | None = None,
+        quantization: str = "none",
+        rerank_factor: int = DEFAULT_RERANK_FACTOR,
+        lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+    ):
+        """Düz indeksi başlat (persist_directory yoksa yalnızca bellekte tutulur)
+
+        ``quantization`` "int8" ise int8 matris ve satır ölçekleri diskte
+        ayrı memmap dosyalarında tutulur ve tarama yalnızca onlar üzerinde
+        yapılır; en iyi ``n_results * rerank_factor`` aday float32 vektörlerle
+        yeniden sıralanır (float32 dosyasından yalnızca bu satırlar okunur).
+        """
+        if quantization not in INDEX_QUANTIZATION_MODES:
+            raise ValueError(
+                f"Desteklenmeyen nicemleme modu: {quantization} (seçenekler: {', '.join(INDEX_QUANTIZATION_MODES)}; "
+                "float16 yalnızca snapshot'larda kullanılır)"
+            )
+        self.quantization = quantization
+        self.rerank_factor = max(1, int(rerank_factor))
+        self._quantized: np.ndarray | None = None
+        self._scales: np.ndarray | None = None
+        self.collection_name = collection_name or "job_embeddings"
+        self.directory = Path(persist_directory) / self.collection_name if persist_directory else None
+        # Yazmalar süreçler arası kilit altında; başka süreç yazdıysa önce diskten yeniden yüklenir
+        self.writer_lock = store_writer_lock(persist_directory, lock_timeout)
+        self._disk_state: tuple[int, int] | None = None
+        self._matrix: np.ndarray | None = None
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._metadatas: list[dict[str, Any]] = []
+        self._documents: list[str] = []
+        self.collection: FlatVectorStore | None = None
+        self.last_rejected_ids: list[str] = []
+        self.last_pruned_ids: list[str] = []
+        # Kesin tarama zaten bellekte; arama önbelleği yalnızca ChromaDB backend'inde
+        self.search_cache = None
+        logger.info(f"✅ Düz vektör indeksi başlatıldı: {self.directory or 'bellek içi'}")
+
+    @staticmethod
+    def _stable_job_id(job_dict: dict[str, Any]) -> str:
+        return stable_job_id(job_dict)
+
+    # --- Depolama -------------------------------------------------------------
+
+    @property
+    def dimension(self) -> int | None:
+        return None if self._matrix is None else int(self._matrix.shape[1])
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _records_state(self) -> tuple[int, int] | None:
+        """Kayıt dosyasının (boyut, mtime) imzası; başka sürecin yazdığını anlamak için"""
+        if self.directory is None or not (self.directory / RECORDS_FILE).exists():
+            return None
+        stat = (self.directory / RECORDS_FILE).stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def _refresh_if_changed(self) -> None:
+        """Kayıt dosyası bu süreç dışında değiştiyse indeksi diskten yeniden yükle"""
+        if self.collection is not None and self._records_state() != self._disk_state:
+            logger.info("🔄 Düz indeks başka bir süreç tarafından güncellenmiş, yeniden yükleniyor")
+            self._load()
+
+    def _has_torn_tail(self) -> bool:
+        path = self.directory / RECORDS_FILE
+        if not path.exists() or path.stat().st_size == 0:
+            return False
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def _truncate_torn_tail(self) -> None:
+        """Çökme sonrası yarım kalan son satırı kes
+
+        Kesilmezse sonraki ekleme o satırın devamına yazılır; bozuk satır
+        ortada kalır ve ardından gelen kayıtlar vektör satırlarıyla kayar.
+        """
+        if not self._has_torn_tail():
+            return
+        with self.writer_lock:
+            # Kilidi bekleyen sürede yazan süreç satırını tamamlamış olabilir
+            if not self._has_torn_tail():
+                return
+            with open(self.directory / RECORDS_FILE, "rb+") as f:
+                end = f.seek(0, os.SEEK_END)
+                position = end
+                while position > 0:
+                    step = min(64 * 1024, position)
+                    position -= step
+                    f.seek(position)
+                    newline = f.read(step).rfind(b"\n")
+                    if newline != -1:
+                        position += newline + 1
+                        break
+                f.truncate(position)
+            logger.warning(f"⚠️ Yarım kalmış son kayıt satırı kesildi ({end - position} bayt)")
+
+    def _load(self) -> None:
+        """Diskteki kayıtları ve vektör matrisini yükle"""
+        self._ids, self._rows, self._metadatas, self._documents = [], {}, [], []
+        self._matrix = None
+        self._quantized = self._scales = None
+        if self.directory is not None:
+            self._truncate_torn_tail()
+        self._disk_state = self._records_state()
+        if self._disk_state is None:
+            return
+        with open(self.directory / RECORDS_FILE, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("⚠️ Yarım kalmış kayıt satırı atlandı")
+                    continue
+                self._append_record(record["id"], record.get("document", ""), record.get("metadata", {}))
+        vectors_path = self.directory / VECTORS_FILE
+        if vectors_path.exists():
+            self._matrix = np.load(vectors_path, mmap_mode="r+")
+            if self.quantization != "none":
+                self._load_quantized()
+        # Vektörleri yazılmamış kayıtlar (yarıda kalan ekleme) yok sayılır
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if len(self._ids) > capacity:
+            del self._ids[capacity:], self._metadatas[capacity:], self._documents[capacity:]
+            self._rows = {job_id: row for job_id, row in self._rows.items() if row < capacity}
+
+    def _load_quantized(self) -> None:
+        """int8 dosyalarını aç; yoksa ya da matrisle uyuşmuyorsa float32'den bir kez oluştur"""
+        quantized_path, scales_path = self.directory / QUANTIZED_FILE, self.directory / SCALES_FILE
+        if quantized_path.exists() and scales_path.exists():
+            quantized = np.load(quantized_path, mmap_mode="r+")
+            scales = np.load(scales_path, mmap_mode="r+")
+            if quantized.shape == self._matrix.shape and scales.shape == (self._matrix.shape[0],):
+                self._quantized, self._scales = quantized, scales
+                return
+        with self.writer_lock:
+            self._build_quantized()
+
+    def _build_quantized(self) -> None:
+        """float32 matristen int8 kopyayı ve ölçekleri parça parça üret"""
+        capacity, dimension = self._matrix.shape
+        self._quantized = self._scales = None
+        quantized = self._new_array(QUANTIZED_FILE, (capacity, dimension), np.int8)
+        scales = self._new_array(SCALES_FILE, (capacity,), np.float32)
+        for start in range(0, len(self._ids), MIN_CAPACITY):
+            stop = min(start + MIN_CAPACITY, len(self._ids))
+            quantized[start:stop], scales[start:stop] = quantize(self._matrix[start:stop], self.quantization)
+        self._quantized = self._commit_array(QUANTIZED_FILE, quantized)
+        self._scales = self._commit_array(SCALES_FILE, scales)
+        logger.info(f"🗜️ {len(self._ids)} vektörün int8 kopyası oluşturuldu")
+
+    def _new_array(self, filename: str, shape: tuple[int, ...], dtype: Any) -> np.ndarray:
+        """Bellekte sıfır dizi ya da geçici memmap dosyası (``_commit_array`` ile yerine konur)"""
+        if self.directory is None:
+            return np.zeros(shape, dtype=dtype)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return np.lib.format.open_memmap(self.directory / f"{filename}.tmp", mode="w+", dtype=dtype, shape=shape)
+
+    def _commit_array(self, filename: str, array: np.ndarray) -> np.ndarray:
+        """Geçici dosyayı atomik olarak yerine koy ve memmap olarak yeniden aç"""
+        if self.directory is None:
+            return array
+        array.flush()
+        del array
+        os.replace(self.directory / f"{filename}.tmp", self.directory / filename)
+        return np.load(self.directory / filename, mmap_mode="r+")
+
+    def _discard_quantized(self) -> None:
+        """Nicemleme kapalıyken yazılan satırlar int8 kopyayı bayatlatır; sonraki açılışta yeniden üretilir"""
+        if self.directory is not None:
+            (self.directory / QUANTIZED_FILE).unlink(missing_ok=True)
+            (self.directory / SCALES_FILE).unlink(missing_ok=True)
+
+    def _append_record(self, job_id: str, document: str, metadata: dict[str, Any]) -> None:
+        self._rows[job_id] = len(self._ids)
+        self._ids.append(job_id)
+        self._documents.append(document)
+        self._metadatas.append(metadata)
+
+    def _ensure_capacity(self, rows_needed: int, dimension: int) -> None:
+        """Matris (ve int8 kopyası) kapasitesini gerekirse ikiye katlayarak büyüt"""
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if rows_needed <= capacity:
+            return
+        new_capacity = max(MIN_CAPACITY, capacity * 2, rows_needed)
+        arrays = [("_matrix", VECTORS_FILE, (new_capacity, dimension), np.float32)]
+        if self.quantization != "none":
+            arrays += [
+                ("_quantized", QUANTIZED_FILE, (new_capacity, dimension), np.int8),
+                ("_scales", SCALES_FILE, (new_capacity,), np.float32),
+            ]
+        for attribute, filename, shape, dtype in arrays:
+            grown = self._new_array(filename, shape, dtype)
+            current = getattr(self, attribute)
+            if current is not None:
+                grown[: len(self._ids)] = current[: len(self._ids)]
+            del current
+            setattr(self, attribute, None)
+            setattr(self, attribute, self._commit_array(filename, grown))
+
+    # --- VectorStore API ------------------------------------------------------
+
+    def create_collection(self) -> bool:
+        """İndeksi diskten yükle veya boş başlat"""
+        try:
+            self._load()
+            self.collection = self
+            if self._ids:
+                logger.info(f"✅ Mevcut düz indeks yüklendi ({len(self._ids)} öğe)")
+            else:
+                logger.info("✅ Yeni düz indeks oluşturuldu")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Düz indeks yükleme hatası: {str(e)}", exc_info=True)
+            return False
+
+    def get_collection(self):
+        """İndeksi döndür; başka bir süreç yazdıysa önce diskten yeniden yükle
+
+        Okuma ve yazma yollarının tamamı buradan geçer; kontrol tek bir
+        ``stat`` çağrısıdır.
+        """
+        if self.collection is None:
+            self.create_collection()
+        else:
+            self._refresh_if_changed()
+        return self.collection
+
+    def existing_ids(self, job_ids: list[str]) -> set[str]:
+        self.get_collection()
+        return {job_id for job_id in job_ids if job_id in self._rows}
+
+    def job_exists(self, job_dict: dict[str, Any]) -> bool:
+        """İş ilanının zaten mevcut olup olmadığını kontrol eder."""
+        self.get_collection()
+        return self._stable_job_id(job_dict) in self._rows
+
+    def add_jobs(self, jobs_df: pd.DataFrame, embeddings: list[list[float] | None]) -> bool:
+        """İş ilanlarını ekle; mevcut ID'ler ve boyutu uymayan vektörler atlanır"""
+        self.get_collection()
+        try:
+            records: dict[str, tuple[list[float], str, dict[str, Any]]] = {}
+            for i, (_, job_row) in enumerate(jobs_df.iterrows()):
+                if i >= len(embeddings) or embeddings[i] is None:
+                    continue
+                job_dict = job_row.to_dict()
+                records.setdefault(
+                    self._stable_job_id(job_dict), (embeddings[i], job_document(job_dict), job_metadata(job_dict))
+                )
+            self.add_records(records)
+            return True
+        except Exception as e:
+            logger.error(f"❌ İş ilanları ekleme hatası: {str(e)}", exc_info=True)
+            return False
+
+    @locked
+    def add_records(
+        self, records: dict[str, tuple[list[float], str, dict[str, Any]]], batch_size: int | None = None
+    ) -> int:
+        """Hazır ``{id: (embedding, document, metadata)}`` kayıtlarını ekle; eklenen sayıyı döner"""
+        self.get_collection()
+        new_ids: list[str] = []
+        self.last_rejected_ids = []
+        dimension = self.dimension
+        for job_id, (embedding, _, _) in records.items():
+            if job_id in self._rows:
+                continue
+            dimension = dimension or len(embedding)
+            if len(embedding) != dimension:
+                logger.warning(f"⚠️ İlan eklenemedi ({job_id}): boyut {len(embedding)} != {dimension}")
+                self.last_rejected_ids.append(job_id)
+                continue
+            new_ids.append(job_id)
+
+        if not new_ids:
+            logger.info("ℹ️ Eklenecek yeni iş ilanı bulunamadı (tümü zaten mevcut)")
+            return 0
+
+        vectors = np.asarray([records[job_id][0] for job_id in new_ids], dtype=np.float32)
+        self._write_rows(new_ids, vectors, [records[job_id][1:] for job_id in new_ids])
+        logger.info(f"✅ {len(new_ids)} yeni iş ilanı düz indekse eklendi")
+        return len(new_ids)
+
+    def iter_jobs(self, page_size: int | None = None, include_embeddings: bool = False) -> Iterator[dict[str, Any]]:
+        """İndeksteki ilanları ``{"ids", "matches", "metadatas"}`` sayfaları halinde gez"""
+        self.get_collection()
+        page = max(1, page_size or 100)
+        for start in range(0, len(self._ids), page):
+            jobs = {
+                "ids": self._ids[start : start + page],
+                "matches": self._documents[start : start + page],
+                "metadatas": self._metadatas[start : start + page],
+            }
+            if include_embeddings:
+                jobs["embeddings"] = np.array(self._matrix[start : start + len(jobs["ids"])], dtype=np.float32)
+            yield jobs
+
+    def export_snapshot(self, path: str | Path, quantization: str = "none") -> int:
+        """ID'leri, embedding matrisini (isteğe bağlı nicemlenmiş) ve metadata'yı snapshot dizinine yaz"""
+        return export_snapshot(self, path, quantization=quantization)
+
+    def import_snapshot(self, path: str | Path, chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE) -> int:
+        """Snapshot'ı API çağrısı yapmadan parça parça indekse yükle"""
+        return import_snapshot(self, path, chunk_size=chunk_size)
+
+    def _write_rows(self, ids: list[str], vectors: np.ndarray, records: list[tuple[str, dict[str, Any]]]) -> None:
+        """Önce vektörleri, sonra kayıt satırlarını yaz (kayıt sayısı esas alınır)"""
+        start = len(self._ids)
+        self._ensure_capacity(start + len(ids), vectors.shape[1])
+        normalized = _normalize_rows(vectors)
+        self._matrix[start : start + len(ids)] = normalized
+        if self.quantization != "none":
+            quantized, scales = quantize(normalized, self.quantization)
+            self._quantized[start : start + len(ids)] = quantized
+            self._scales[start : start + len(ids)] = scales
+        if self.directory is not None:
+            self._matrix.flush()
+            if self.quantization != "none":
+                self._quantized.flush()
+                self._scales.flush()
+            else:
+                self._discard_quantized()
+            lines = [
+                json.dumps({"id": job_id, "document": document, "metadata": metadata}) + "\n"
+                for job_id, (document, metadata) in zip(ids, records, strict=True)
+            ]
+            with open(self.directory / RECORDS_FILE, "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+            self._disk_state = self._records_state()
+        for job_id, (document, metadata) in zip(ids, records, strict=True):
+            self._append_record(job_id, document, metadata)
+
+    def _read_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Yeniden sıralanacak float32 satırlar; diskteyse yalnızca bu satırlar dosyadan okunur
+
+        Memmap üzerinden okumak çevredeki sayfaları da sürecin belleğine
+        eşliyordu; tek tek okuma taramanın int8 dosyasında kalmasını sağlar.
+        """
+        if not isinstance(self._matrix, np.memmap):
+            return self._matrix[rows]
+        row_bytes = self._matrix.shape[1] * self._matrix.itemsize
+        vectors = np.empty((len(rows), self._matrix.shape[1]), dtype=np.float32)
+        with open(self._matrix.filename, "rb") as f:
+            for i, row in enumerate(rows):
+                f.seek(self._matrix.offset + int(row) * row_bytes)
+                vectors[i] = np.frombuffer(f.read(row_bytes), dtype=np.float32)
+        return vectors
+
+    def _quantized_matrix(self) -> tuple[np.ndarray, np.ndarray | None]:
+        """Kayıtlı satırların int8 kopyası ve ölçekleri (diskteki memmap'in görünümü)"""
+        return self._quantized[: len(self._ids)], self._scales[: len(self._ids)]
+
+    def _candidate_rows(self, filter_metadata: dict[str, Any] | None) -> np.ndarray:
+        """Filtreye uyan satır indeksleri"""
+        if not filter_metadata:
+            return np.arange(len(self._ids))
+        return np.array(
+            [row for row in range(len(self._ids)) if matches_where(self._metadatas[row], filter_metadata)],
+            dtype=np.int64,
+        )
+
+    def _format_results(self, rows: np.ndarray, similarities: np.ndarray) -> dict[str, list]:
+        return {
+            "ids": [self._ids[row] for row in rows],
+            "matches": [self._documents[row] for row in rows],
+            "distances": [float(1.0 - similarity) for similarity in similarities],
+            "metadatas": [self._metadatas[row] for row in rows],
+        }
+
+    def search_jobs(
+        self,
+        query_embedding: list[float],
+        n_results: int = 10,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> dict[str, list]:
+        """Kesin cosine benzerliği ile iş ilanı ara"""
+        return self.search_jobs_batch([query_embedding], n_results=n_results, filter_metadata=filter_metadata)[0]
+
+    def search_jobs_above(
+        self,
+        query_embedding: list[float],
+        min_similarity: float,
+        filter_metadata: dict[str, Any] | None = None,
+        page_size: int = 50,
+    ) -> dict[str, list]:
+        """Benzerliği ``min_similarity`` (yüzde) ve üzerindeki tüm ilanları kesin tarama ile getir"""
+        return self.search_jobs_batch(
+            [query_embedding], n_results=page_size, filter_metadata=filter_metadata, min_similarity=min_similarity
+        )[0]
+
+    def search_jobs_batch(
+        self,
+        query_matrix: Any,
+        n_results: int = 10,
+        filter_metadata: dict[str, Any] | None = None,
+        min_similarity: float | None = None,
+    ) -> list[dict[str, list]]:
+        """Birden fazla sorguyu tek matris çarpımıyla ara
+
+        ``min_similarity`` (yüzde) verilirse ``n_results`` yok sayılır ve eşik
+        üzerindeki tüm ilanlar döner.
+        """
+        queries = np.atleast_2d(np.asarray(query_matrix, dtype=np.float32))
+        empty = [{"ids": [], "matches": [], "distances": [], "metadatas": []} for _ in range(len(query_matrix))]
+        self.get_collection()
+        if self._matrix is None or not self._ids or not empty:
+            return empty
+
+        try:
+            rows = self._candidate_rows(filter_metadata)
+            if rows.size == 0:
+                logger.info("ℹ️ Arama kriterlerine uygun iş ilanı bulunamadı")
+                return empty
+
+            queries = _normalize_rows(queries)
+            if self.quantization == "none":
+                candidates = self._matrix[rows] if filter_metadata else self._matrix[: len(self._ids)]
+                similarity_matrix = queries @ candidates.T
+                results = []
+                for similarities in similarity_matrix:
+                    top = _top_indices(similarities, n_results, min_similarity)
+                    results.append(self._format_results(rows[top], similarities[top]))
+            else:
+                results = self._search_quantized(queries, rows, n_results, filter_metadata, min_similarity)
+            logger.info(f"🔍 {len(results)} sorgu için {sum(len(r['metadatas']) for r in results)} iş ilanı bulundu")
+            return results
+        except Exception as e:
+            logger.error(f"❌ Vektör arama hatası: {str(e)}", exc_info=True)
+            return empty
+
+    def _search_quantized(
+        self,
+        queries: np.ndarray,
+        rows: np.ndarray,
+        n_results: int,
+        filter_metadata: dict[str, Any] | None,
+        min_similarity: float | None,
+    ) -> list[dict[str, list]]:
+        """Nicemlenmiş matriste aday seç, adayları float32 vektörlerle kesin olarak yeniden sırala"""
+        quantized, scales = self._quantized_matrix()
+        if filter_metadata:
+            quantized, scales = quantized[rows], None if scales is None else scales[rows]
+        approximate = quantized_scores(queries, quantized, scales)
+
+        results = []
+        for query, estimates in zip(queries, approximate, strict=True):
+            if min_similarity is not None:
+                # Nicemleme hatası için eşik biraz gevşetilir; kesin eşik yeniden sıralamada uygulanır
+                candidates = np.flatnonzero(estimates * 100 >= min_similarity - QUANTIZED_THRESHOLD_MARGIN)
+            else:
+                candidates = _top_indices(estimates, n_results * self.rerank_factor, None)
+            candidate_rows = rows[np.sort(candidates)]
+            exact = self._read_rows(candidate_rows) @ query
+            top = _top_indices(exact, n_results, min_similarity)
+            results.append(self._format_results(candidate_rows[top], exact[top]))
+        return results
+
+    def get_jobs(
+        self,
+        job_ids: list[str],
+        filter_metadata: dict[str, Any] | None = None,
+        include_embeddings: bool = False,
+    ) -> dict[str, list]:
+        """ID'leri verilen ilanları (varsa filtreye uyanları) istenen sırayla getir"""
+        self.get_collection()
+        rows = [
+            self._rows[job_id]
+            for job_id in job_ids
+            if job_id in self._rows and matches_where(self._metadatas[self._rows[job_id]], filter_metadata)
+        ]
+        jobs = {
+            "ids": [self._ids[row] for row in rows],
+            "matches": [self._documents[row] for row in rows],
+            "metadatas": [self._metadatas[row] for row in rows],
+        }
+        if include_embeddings:
+            jobs["embeddings"] = [self._matrix[row].tolist() for row in rows]
+        return jobs
+
+    def get_stats(self) -> dict[str, Any]:
+        """İndeks istatistiklerini getir"""
+        self.get_collection()
+        return {
+            "total_jobs": len(self._ids),
+            "collection_name": self.collection_name,
+            "backend": "numpy",
+            "dimension": self.dimension,
+            "last_updated": datetime.now().isoformat(),
+        }
+
+    @locked
+    def prune(self, older_than: datetime, field: str = POSTED_TS_FIELD, page_size: int | None = None) -> int:
+        """``field`` tarihi ``older_than`` öncesinde kalan ilanları sil ve indeksi sıkıştır
+
+        Tarih alanı olmayan ilanlar korunur. Silinen ilan sayısını döner;
+        ID'ler ``last_pruned_ids`` içinde raporlanır.
+        """
+        self.last_pruned_ids = []
+        self.get_collection()
+        cutoff = to_timestamp(older_than)
+        if cutoff is None or not self._ids:
+            return 0
+        expired = {"$lt": cutoff}
+        keep = [row for row, metadata in enumerate(self._metadatas) if not matches_where(metadata, {field: expired})]
+        deleted = len(self._ids) - len(keep)
+        if deleted:
+            kept = set(keep)
+            self.last_pruned_ids = [job_id for row, job_id in enumerate(self._ids) if row not in kept]
+            self._rewrite(keep)
+            logger.info(f"🧹 {deleted} eski iş ilanı düz indeksten silindi ({field} < {older_than:%Y-%m-%d})")
+        return deleted
+
+    @locked
+    def compact(self) -> bool:
+        """Kayıt dosyasını ve matrisi yalnızca mevcut satırlarla yeniden yaz"""
+        self.get_collection()
+        if self.directory is None or self._matrix is None:
+            return False
+        self._rewrite(list(range(len(self._ids))))
+        return True
+
+    def _rewrite(self, rows: list[int]) -> None:
+        """Yalnızca seçilen satırlarla matrisi ve kayıtları yeniden yaz (geçici dosya + replace)"""
+        dimension = self.dimension
+        capacity = max(MIN_CAPACITY, len(rows))
+        records = [(self._ids[row], self._documents[row], self._metadatas[row]) for row in rows]
+        if self.directory is None:
+            compacted = np.zeros((capacity, dimension), dtype=np.float32)
+            compacted[: len(rows)] = self._matrix[rows]
+            self._matrix = compacted
+        else:
+            tmp_vectors = self.directory / f"{VECTORS_FILE}.tmp"
+            compacted = np.lib.format.open_memmap(
+                tmp_vectors, mode="w+", dtype=np.float32, shape=(capacity, dimension)
+            )
+            compacted[: len(rows)] = self._matrix[rows]
+            compacted.flush()
+            del compacted
+            tmp_records = self.directory / f"{RECORDS_FILE}.tmp"
+            with open(tmp_records, "w", encoding="utf-8") as f:
+                for job_id, document, metadata in records:
+                    f.write(json.dumps({"id": job_id, "document": document, "metadata": metadata}) + "\n")
+            self._matrix = self._quantized = self._scales = None
+            # Yarıda kesilirse int8 kopya bir sonraki açılışta yeniden üretilir
+            self._discard_quantized()
+            os.replace(tmp_vectors, self.directory / VECTORS_FILE)
+            os.replace(tmp_records, self.directory / RECORDS_FILE)
+            self._matrix = np.load(self.directory / VECTORS_FILE, mmap_mode="r+")
+            self._disk_state = self._records_state()
+        self._ids, self._rows, self._metadatas, self._documents = [], {}, [], []
+        for job_id, document, metadata in records:
+            self._append_record(job_id, document, metadata)
+        if self.quantization != "none":
+            self._build_quantized()
+
+    def save_search_cache(self) -> bool:
+        return False
+
+    @locked
+    def drop_collection(self) -> bool:
+        """İndeks dizinini tamamen sil"""
+        if self.directory is not None and self.directory.exists():
+            shutil.rmtree(self.directory)
+        self._load()
+        self.collection = None
+        return True
+
+    @locked
+    def clear_collection(self) -> bool:
+        """İndeksi temizle (dikkatli kullan!)"""
+        try:
+            self._matrix = None
+            if self.directory is not None and self.directory.exists():
+                shutil.rmtree(self.directory)
+            self._load()
+            logger.info("🗑️ Düz indeks başarıyla temizlendi")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Düz indeks temizleme hatası: {str(e)}", exc_info=True)
+            return False
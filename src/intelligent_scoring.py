@@ -5,6 +5,17 @@ from __future__ import annotations
 # Standard Library
 import logging
 import re
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+
+from .fingerprint import config_hash, text_hash
+from .score_cache import ScoreCache
+from .skill_index import SkillIndex
+
+logger = logging.getLogger(__name__)
+
+# Only the head of a description is scanned for weighted keywords
+DESCRIPTION_SCAN_CHARS = 3000
 
 
 def _create_regex_pattern(keyword: str) -> re.Pattern:
@@ -39,42 +50,139 @@ def _compile_weighted_patterns(items: dict[str, int]) -> list[tuple[re.Pattern,
     return patterns
 
 
-logger = logging.getLogger(__name__)
+# Supported variations: "3 yıl", "4 sene", "2 yr", "5 yrs", "1 year", "7 years", "10+ years"
+EXPERIENCE_PATTERN = re.compile(
+    r"(\d+)\+?\s*(y[ıi]l|sene|yrs?|years?)",
+    re.IGNORECASE,
+)
 
 
-class IntelligentScoringSystem:
-    """Weighted scoring and regex-based experience detection."""
+@dataclass(frozen=True)
+class ScoringPlan:
+    """Compiled, immutable form of the ``scoring_system`` config section."""
+
+    fingerprint: str
+    weights: dict[str, int]
+    threshold: float
+    title_patterns: dict[str, list[re.Pattern]]
+    description_weights: dict[str, list[tuple[re.Pattern, int]]]
+    experience_penalties: dict[int, int]
+    experience_steps: tuple[tuple[int, int], ...]
+    cv_skills: tuple[str, ...]
+    cv_skill_boost_threshold: float
+    cv_skill_bonus_points: int
+    component_versions: dict[str, str]
+
+
+class ScoreRecord(Mapping):
+    """Compact per-job score breakdown.
+
+    Uses ``__slots__`` instead of a per-job dict and behaves as a read-only
+    mapping, so ``record["title"]`` keeps working. Call :meth:`explain` to
+    build a plain dict only for jobs that are displayed or exported.
+    """
+
+    __slots__ = ("title", "description", "experience", "skills", "total")
+    FIELDS = ("title", "description", "experience", "skills", "total")
+
+    def __init__(self, title: int = 0, description: int = 0, experience: int = 0, skills: int = 0):
+        self.title = title
+        self.description = description
+        self.experience = experience
+        self.skills = skills
+        self.total = title + description + experience + skills
+
+    def add_skill_bonus(self, points: int) -> None:
+        self.skills += points
+        self.total += points
+
+    def __getitem__(self, key: str) -> int:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def explain(self) -> dict[str, int]:
+        return {name: getattr(self, name) for name in self.FIELDS}
 
-    def __init__(self, config: dict):
-        scoring_cfg = config.get("scoring_system", {})
+    def __repr__(self) -> str:
+        return f"ScoreRecord({', '.join(f'{name}={getattr(self, name)}' for name in self.FIELDS)})"
 
-        weight_cfg = scoring_cfg.get("weights", {})
-        self.weights = {
-            "negative": weight_cfg.get("negative", -30),
-            "positive": weight_cfg.get("positive", 30),
-        }
-        self.threshold = scoring_cfg.get("threshold", 0)
 
-        title_cfg = scoring_cfg.get("title_keywords", {})
-        desc_weights_cfg = scoring_cfg.get("description_weights", {})
-        exp_penalty_cfg = scoring_cfg.get("experience_penalties", {"5": -40, "4": -20})
-        cv_cfg = scoring_cfg.get("cv_skill_keywords", {})
+# Compiled plans shared by every IntelligentScoringSystem in the process
+_PLAN_CACHE: dict[str, ScoringPlan] = {}
 
-        self.title_patterns = {
+
+def compile_scoring_plan(scoring_cfg: dict) -> ScoringPlan:
+    """Return the compiled plan for a scoring config, reusing it when the fingerprint matches."""
+    fingerprint = config_hash(scoring_cfg)
+    plan = _PLAN_CACHE.get(fingerprint)
+    if plan is not None:
+        return plan
+
+    weight_cfg = scoring_cfg.get("weights", {})
+    weights = {
+        "negative": weight_cfg.get("negative", -30),
+        "positive": weight_cfg.get("positive", 30),
+    }
+    title_cfg = scoring_cfg.get("title_keywords", {})
+    desc_weights_cfg = scoring_cfg.get("description_weights", {})
+    exp_penalty_cfg = scoring_cfg.get("experience_penalties", {"5": -40, "4": -20})
+    cv_cfg = scoring_cfg.get("cv_skill_keywords") or []
+    experience_penalties = {int(k): int(v) for k, v in exp_penalty_cfg.items()}
+
+    plan = ScoringPlan(
+        fingerprint=fingerprint,
+        weights=weights,
+        threshold=scoring_cfg.get("threshold", 0),
+        title_patterns={
             "negative": _compile_patterns_from_config(title_cfg.get("negative", [])),
             "positive": _compile_patterns_from_config(title_cfg.get("positive", [])),
-        }
-        self.description_weights = {
+        },
+        description_weights={
             "negative": _compile_weighted_patterns(desc_weights_cfg.get("negative", {})),
             "positive": _compile_weighted_patterns(desc_weights_cfg.get("positive", {})),
-        }
-        self.experience_penalties = {int(k): int(v) for k, v in exp_penalty_cfg.items()}
-        self.cv_skill_patterns = _compile_patterns_from_config(cv_cfg)
-        # Supported variations: "3 yıl", "4 sene", "2 yr", "5 yrs", "1 year", "7 years", "10+ years"
-        self.experience_pattern = re.compile(
-            r"(\d+)\+?\s*(y[ıi]l|sene|yrs?|years?)",
-            re.IGNORECASE,
-        )
+        },
+        experience_penalties=experience_penalties,
+        experience_steps=tuple(sorted(experience_penalties.items(), reverse=True)),
+        cv_skills=tuple(
+            dict.fromkeys(part.strip().lower() for item in cv_cfg for part in str(item).split(",") if part.strip())
+        ),
+        cv_skill_boost_threshold=float(scoring_cfg.get("cv_skill_boost_threshold", 0.8)),
+        cv_skill_bonus_points=int(scoring_cfg.get("cv_skill_bonus_points", 0)),
+        # Each component is versioned by the config it depends on
+        component_versions={
+            "title": config_hash([weights, title_cfg]),
+            "description": config_hash(desc_weights_cfg),
+            "experience": config_hash([exp_penalty_cfg, EXPERIENCE_PATTERN.pattern]),
+        },
+    )
+    _PLAN_CACHE[fingerprint] = plan
+    logger.debug("Compiled scoring plan %s", fingerprint)
+    return plan
+
+
+class IntelligentScoringSystem:
+    """Weighted scoring and regex-based experience detection."""
+
+    def __init__(self, config: dict, cache: ScoreCache | None = None):
+        plan = compile_scoring_plan(config.get("scoring_system", {}))
+        self.plan = plan
+        self.weights = plan.weights
+        self.threshold = plan.threshold
+        self.title_patterns = plan.title_patterns
+        self.description_weights = plan.description_weights
+        self.experience_penalties = plan.experience_penalties
+        self.cv_skills = plan.cv_skills
+        self.skill_index = SkillIndex()
+        self.experience_pattern = EXPERIENCE_PATTERN
+        self.component_versions = plan.component_versions
+        self.cache = cache
 
     def score_title(self, title: str) -> int:
         if not title:  # Handle None, empty string, etc.
@@ -93,7 +201,7 @@ class IntelligentScoringSystem:
         """Score job description based on weighted keyword matches."""
         if not description:  # Handle None, empty string, etc.
             return 0
-        text = description[:3000]
+        text = description[:DESCRIPTION_SCAN_CHARS]
         score = 0
         for pattern, weight in self.description_weights.get("positive", []):
             if pattern.search(text):
@@ -108,33 +216,69 @@ class IntelligentScoringSystem:
         """Detect experience years and apply configured penalties."""
         if not text:  # Handle None, empty string, etc.
             return 0
-        matches = self.experience_pattern.findall(text.lower())
+        # experience_pattern is case-insensitive, no need to lowercase the text
+        matches = self.experience_pattern.findall(text)
         if not matches:
             logger.debug("No experience information found")
             return 0
         years = max(int(m[0]) for m in matches)
-        for threshold, penalty in sorted(self.experience_penalties.items(), reverse=True):
+        for threshold, penalty in self.plan.experience_steps:
             if years >= threshold:
                 logger.debug("Experience %s years -> %s", years, penalty)
                 return penalty
         logger.debug("Experience %s years -> 0", years)
         return 0
 
-    def score_job(self, job_data: dict[str, str]) -> tuple[int, dict[str, int]]:
+    def _digest(self, text: str) -> str | None:
+        """Hash text for the memo cache (None when caching is off or text is empty)."""
+        if self.cache is None or not isinstance(text, str) or not text:
+            return None
+        return text_hash(text)
+
+    def _cached_component(self, component: str, text: str, digest: str | None, scorer: Callable[[str], int]) -> int:
+        """Return a component score from the memo cache, computing it on a miss."""
+        if self.cache is None or digest is None:
+            return scorer(text)
+        key = ScoreCache.make_key(component, self.component_versions[component], digest)
+        score = self.cache.get(key)
+        if score is None:
+            score = scorer(text)
+            self.cache.set(key, score)
+        return score
+
+    def score_record(self, job_data: dict[str, str]) -> ScoreRecord:
+        """Score a job and return the compact breakdown."""
         title = job_data.get("title", "")
         desc = job_data.get("description", "")
-        title_score = self.score_title(title)
-        desc_score = self.score_description(desc)
-        exp_score = self.score_experience(desc)
-        total = title_score + desc_score + exp_score
-        details = {
-            "title": title_score,
-            "description": desc_score,
-            "experience": exp_score,
-            "total": total,
-        }
-        logger.debug("Job '%s' scored %s", title, details)
-        return total, details
+        # DataFrame records carry NaN for missing text
+        title = title if isinstance(title, str) else ""
+        desc = desc if isinstance(desc, str) else ""
+        title_digest = self._digest(title)
+        desc_digest = self._digest(desc)
+        record = ScoreRecord(
+            title=self._cached_component("title", title, title_digest, self.score_title),
+            description=self._cached_component("description", desc, desc_digest, self.score_description),
+            experience=self._cached_component("experience", desc, desc_digest, self.score_experience),
+        )
+        logger.debug("Job '%s' scored %r", title, record)
+        return record
+
+    def score_job(self, job_data: dict[str, str]) -> tuple[int, dict[str, int]]:
+        record = self.score_record(job_data)
+        return record.total, record.explain()
+
+    def skill_bonuses(self, skill_index: SkillIndex | None = None) -> dict[str, int]:
+        """Bonus points per job ID for postings covering enough of the CV skills.
+
+        A job earns ``cv_skill_bonus_points`` when the share of
+        ``cv_skill_keywords`` it mentions reaches ``cv_skill_boost_threshold``.
+        """
+        if not self.cv_skills or not self.plan.cv_skill_bonus_points:
+            return {}
+        index = skill_index if skill_index is not None else self.skill_index
+        required = self.plan.cv_skill_boost_threshold * len(self.cv_skills)
+        counts = index.match_counts(self.cv_skills)
+        return {job_id: self.plan.cv_skill_bonus_points for job_id, count in counts.items() if count >= required}
 
     def should_include(self, score: float) -> bool:
         include = score >= self.threshold
@@ -0,0 +1,138 @@
+"""
+İş İlanı Şeması
+İlanlar için kararlı kimlik üretimi ve ortak alan yardımcıları.
+"""
+
+# Standard Library
+import hashlib
+import json
+import math
+from datetime import date, datetime, timedelta
+from typing import Any
+
+# Vector store metadata keeps only what filtering and display need; the full
+# description is stored once, as the document text.
+METADATA_FIELDS = (
+    "title",
+    "company",
+    "location",
+    "site",
+    "source_site",
+    "persona_source",
+    "job_url",
+    "url",
+    "date_posted",
+    "collected_at",
+    "job_type",
+    "is_remote",
+    "keyword_score",
+)
+
+# Typed fields derived at ingest so filters can run inside the index
+POSTED_TS_FIELD = "posted_ts"
+COLLECTED_TS_FIELD = "collected_ts"
+
+
+def stable_job_id(job_dict: dict[str, Any]) -> str:
+    """Create a deterministic job ID using URL if available."""
+    url = job_dict.get("url") or job_dict.get("job_url")
+    if isinstance(url, str) and url:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    else:
+        canonical = json.dumps(job_dict, sort_keys=True, ensure_ascii=False, default=str)
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"job_{digest}"
+
+
+def _metadata_value(value: Any) -> str | int | float | bool | None:
+    """Convert a value to a type ChromaDB metadata accepts (None = drop the field)."""
+    if value is None or isinstance(value, bool | int | str):
+        return value
+    if isinstance(value, float):
+        return None if math.isnan(value) else value
+    if hasattr(value, "item") and not hasattr(value, "isoformat"):
+        # NumPy scalar -> Python scalar
+        return _metadata_value(value.item())
+    if hasattr(value, "isoformat"):
+        # datetime / date / pandas Timestamp; NaT is not equal to itself
+        return None if value != value else value.isoformat()
+    return str(value)
+
+
+def sanitize_metadata(job_dict: dict[str, Any]) -> dict[str, str | int | float | bool]:
+    """Return metadata without NaN/None values and with dates as ISO strings."""
+    clean = {}
+    for key, value in job_dict.items():
+        converted = _metadata_value(value)
+        if converted is not None:
+            clean[str(key)] = converted
+    return clean
+
+
+def to_timestamp(value: Any) -> int | None:
+    """Convert a date, datetime, pandas Timestamp or ISO string to epoch seconds."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    if hasattr(value, "to_pydatetime"):
+        # pandas Timestamp; NaT is not equal to itself
+        if value != value:
+            return None
+        value = value.to_pydatetime()
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return None
+
+
+def job_metadata(job_dict: dict[str, Any]) -> dict[str, str | int | float | bool]:
+    """Return the slim, sanitized metadata stored alongside a job vector.
+
+    Besides the display fields, ``posted_ts`` (posting date, falling back to
+    the collection date) and ``collected_ts`` are stored as epoch seconds and
+    ``keyword_score`` as an int, so ``where`` clauses can compare them.
+    """
+    metadata = sanitize_metadata({key: job_dict[key] for key in METADATA_FIELDS if key in job_dict})
+    collected_ts = to_timestamp(job_dict.get("collected_at"))
+    posted_ts = to_timestamp(job_dict.get("date_posted")) or collected_ts
+    if collected_ts is not None:
+        metadata[COLLECTED_TS_FIELD] = collected_ts
+    if posted_ts is not None:
+        metadata[POSTED_TS_FIELD] = posted_ts
+    if isinstance(metadata.get("keyword_score"), float):
+        metadata["keyword_score"] = int(metadata["keyword_score"])
+    return metadata
+
+
+def build_where(
+    sites: list[str] | None = None,
+    personas: list[str] | None = None,
+    max_age_days: float | None = None,
+    min_keyword_score: int | None = None,
+    now: datetime | None = None,
+) -> dict[str, Any] | None:
+    """Build a ChromaDB ``where`` clause from search filters (None if no filter)."""
+    conditions: list[dict[str, Any]] = []
+    if sites:
+        conditions.append({"source_site": {"$in": list(sites)}})
+    if personas:
+        conditions.append({"persona_source": {"$in": list(personas)}})
+    if max_age_days is not None:
+        cutoff = (now or datetime.now()) - timedelta(days=max_age_days)
+        conditions.append({POSTED_TS_FIELD: {"$gte": int(cutoff.timestamp())}})
+    if min_keyword_score is not None:
+        conditions.append({"keyword_score": {"$gte": int(min_keyword_score)}})
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def job_document(job_dict: dict[str, Any]) -> str:
+    """Return the full text stored as the job's document (its description)."""
+    description = job_dict.get("description")
+    return description if isinstance(description, str) else ""
@@ -0,0 +1,173 @@
+"""Local BM25 index over job titles and descriptions.
+
+Complements vector search: exact skill and tool names in a CV ("kubernetes",
+"c#") rank postings that mention them even when the embedding similarity is
+modest, and no embedding API call is needed to score a posting lexically.
+The index grows incrementally at ingest, drops postings pruned from the
+vector store and is persisted as compact JSON.
+"""
+
+from __future__ import annotations
+
+# Standard Library
+import json
+import logging
+import math
+import os
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+from .job_schema import stable_job_id
+from .skill_index import job_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+# Reciprocal rank fusion constant (Cormack et al.); dampens the weight of top ranks
+DEFAULT_RRF_K = 60
+
+
+class LexicalIndex:
+    """Okapi BM25 over job text with idempotent adds and JSON persistence."""
+
+    def __init__(self, path: str | Path | None = None, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        self.path = Path(path) if path else None
+        self.k1 = k1
+        self.b = b
+        self._reset()
+        if self.path:
+            self.load()
+
+    def _reset(self) -> None:
+        self._ids: list[str] = []
+        self._doc_index: dict[str, int] = {}
+        self._lengths: list[int] = []
+        self._total_length = 0
+        self._postings: defaultdict[str, dict[int, int]] = defaultdict(dict)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, job_id: object) -> bool:
+        return job_id in self._doc_index
+
+    def add(self, job_id: str, text: str) -> bool:
+        """Index a posting; returns False if the ID is already indexed."""
+        if job_id in self._doc_index:
+            return False
+        doc = len(self._ids)
+        tokens = tokenize(text)
+        self._doc_index[job_id] = doc
+        self._ids.append(job_id)
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        for token, tf in Counter(tokens).items():
+            self._postings[token][doc] = tf
+        return True
+
+    def remove(self, job_ids: Iterable[str]) -> int:
+        """Drop postings by ID (unknown IDs are ignored); returns the number removed.
+
+        Documents are renumbered so the index stays dense.
+        """
+        dropped = {self._doc_index[job_id] for job_id in job_ids if job_id in self._doc_index}
+        if not dropped:
+            return 0
+        kept = [doc for doc in range(len(self._ids)) if doc not in dropped]
+        renumbered = {old: new for new, old in enumerate(kept)}
+        self._ids = [self._ids[doc] for doc in kept]
+        self._lengths = [self._lengths[doc] for doc in kept]
+        self._doc_index = {job_id: doc for doc, job_id in enumerate(self._ids)}
+        self._total_length = sum(self._lengths)
+        postings: defaultdict[str, dict[int, int]] = defaultdict(dict)
+        for token, docs in self._postings.items():
+            remaining = {renumbered[doc]: tf for doc, tf in docs.items() if doc in renumbered}
+            if remaining:
+                postings[token] = remaining
+        self._postings = postings
+        return len(dropped)
+
+    def add_jobs(self, jobs: Iterable[dict], job_ids: Iterable[str] | None = None) -> int:
+        """Index job dicts (IDs default to their stable job ID); returns the number added."""
+        jobs = list(jobs)
+        ids = list(job_ids) if job_ids is not None else [stable_job_id(job) for job in jobs]
+        return sum(self.add(job_id, job_text(job)) for job_id, job in zip(ids, jobs, strict=True))
+
+    def search(self, text: str, n_results: int = 50) -> list[tuple[str, float]]:
+        """Top postings for a query text as ``(job_id, bm25_score)``, best first."""
+        if not self._ids:
+            return []
+        n_docs = len(self._ids)
+        avg_length = self._total_length / n_docs or 1.0
+        scores: defaultdict[int, float] = defaultdict(float)
+        for token in set(tokenize(text)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc] / avg_length)
+                scores[doc] += idf * tf * (self.k1 + 1) / (tf + norm)
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:n_results]
+        return [(self._ids[doc], score) for doc, score in top]
+
+    def load(self) -> bool:
+        """Load a persisted index; a missing or corrupt file leaves it empty."""
+        if not self.path or not self.path.exists():
+            return False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._ids = list(data["ids"])
+            self._lengths = list(data["lengths"])
+            self._doc_index = {job_id: doc for doc, job_id in enumerate(self._ids)}
+            self._total_length = sum(self._lengths)
+            self._postings = defaultdict(dict)
+            for token, pairs in data["postings"].items():
+                self._postings[token] = dict(pairs)
+            logger.info(f"✅ Sözcüksel indeks yüklendi ({len(self._ids)} ilan)")
+            return True
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️ Sözcüksel indeks okunamadı, boş başlatılıyor: {e}")
+            self._reset()
+            return False
+
+    def save(self) -> bool:
+        """Persist the index atomically (write to a temp file, then replace)."""
+        if not self.path:
+            return False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            data = {
+                "ids": self._ids,
+                "lengths": self._lengths,
+                "postings": {token: list(postings.items()) for token, postings in self._postings.items()},
+            }
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            logger.info(f"💾 Sözcüksel indeks kaydedildi ({len(self._ids)} ilan)")
+            return True
+        except OSError as e:
+            logger.warning(f"⚠️ Sözcüksel indeks kaydedilemedi: {e}")
+            return False
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = DEFAULT_RRF_K) -> list[tuple[str, float]]:
+    """Fuse ranked ID lists by summing ``1 / (k + rank)``; best first."""
+    scores: defaultdict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, job_id in enumerate(ranking, 1):
+            scores[job_id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def create_lexical_index(config: dict) -> LexicalIndex | None:
+    """Build a LexicalIndex from ``vector_store_settings.hybrid_search`` (None if disabled)."""
+    hybrid_cfg = config.get("vector_store_settings", {}).get("hybrid_search", {}) or {}
+    if not hybrid_cfg.get("enabled", False):
+        return None
+    return LexicalIndex(path=hybrid_cfg.get("index_path"))
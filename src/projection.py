@@ -0,0 +1,113 @@
+"""
+Boyut Düşürme (PCA Projeksiyonu)
+Embedding API'si düşük boyutlu çıktı veremediğinde, saklanan ilan vektörleri
+üzerinde bir PCA projeksiyonu öğrenilir ve koleksiyonla birlikte saklanır.
+İlanlar ve sorgular (CV'ler) aynı projeksiyondan geçirilir.
+"""
+
+# Standard Library
+import logging
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+# Third Party
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROJECTION_SUFFIX = ".pca.npz"
+
+
+def projection_path(persist_directory: str | Path, collection_name: str) -> Path:
+    """Koleksiyonun projeksiyon dosyası (ör. ``data/chromadb/job_embeddings__...__256__pca.pca.npz``)"""
+    return Path(persist_directory) / f"{collection_name}{PROJECTION_SUFFIX}"
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class PCAProjection:
+    """Birim uzunluğa getirilmiş vektörleri ilk ``dimension`` temel bileşene izdüşürür"""
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray, explained_variance_ratio: float = 1.0):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)
+        self.explained_variance_ratio = float(explained_variance_ratio)
+
+    @property
+    def dimension(self) -> int:
+        return int(self.components.shape[0])
+
+    @property
+    def input_dimension(self) -> int:
+        return int(self.components.shape[1])
+
+    @classmethod
+    def fit(cls, batches: Iterable[np.ndarray], dimension: int) -> "PCAProjection":
+        """Parça parça gelen vektörlerden projeksiyonu öğren
+
+        Yalnızca toplam ve ``d x d`` kovaryans birikimi tutulur; korpusun
+        tamamı belleğe alınmaz.
+        """
+        count = 0
+        total: np.ndarray | None = None
+        scatter: np.ndarray | None = None
+        for batch in batches:
+            rows = _unit_rows(np.asarray(batch, dtype=np.float64))
+            if not len(rows):
+                continue
+            if total is None:
+                total = np.zeros(rows.shape[1])
+                scatter = np.zeros((rows.shape[1], rows.shape[1]))
+            count += len(rows)
+            total += rows.sum(axis=0)
+            scatter += rows.T @ rows
+        if total is None or scatter is None or count < 2:
+            raise ValueError("PCA için en az iki vektör gerekli")
+        if not 0 < dimension <= len(total):
+            raise ValueError(f"Hedef boyut 1 ile {len(total)} arasında olmalı: {dimension}")
+        mean = total / count
+        covariance = scatter / count - np.outer(mean, mean)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1][:dimension]
+        variance = np.clip(eigenvalues, 0, None)
+        explained = variance[order].sum() / variance.sum() if variance.sum() > 0 else 1.0
+        return cls(mean, eigenvectors[:, order].T, explained)
+
+    def transform(self, vectors: np.ndarray) -> np.ndarray:
+        """Vektörleri (tek vektör ya da matris) düşük boyuta izdüşür"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        single = vectors.ndim == 1
+        rows = _unit_rows(np.atleast_2d(vectors))
+        projected = (rows - self.mean) @ self.components.T
+        return projected[0] if single else projected
+
+    def save(self, path: str | Path) -> None:
+        """Projeksiyonu atomik olarak kaydet (geçici dosya + replace)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                mean=self.mean,
+                components=self.components,
+                explained_variance_ratio=self.explained_variance_ratio,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PCAProjection | None":
+        """Kayıtlı projeksiyonu yükle (yoksa veya bozuksa None)"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                return cls(data["mean"], data["components"], float(data["explained_variance_ratio"]))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ PCA projeksiyonu okunamadı: {e}")
+            return None
@@ -0,0 +1,315 @@
+"""
+Sürümlü Koleksiyonlar ve Yeniden İndeksleme
+Her koleksiyon, vektörlerini üreten embedding modeli ve boyutuyla adlandırılır.
+Etkin koleksiyon, persist dizinindeki küçük bir işaretçi dosyasında tutulur.
+Model değiştiğinde ilanlar arka planda, yavaşlatılmış parçalar halinde yeni
+koleksiyona kopyalanır ve kopyalama bitince işaretçi atomik olarak değiştirilir.
+Aramalar bu süre boyunca eski koleksiyon üzerinden çalışmaya devam eder.
+
+Boyut PCA ile düşürülecekse API'ye gidilmez: projeksiyon mevcut vektörler
+üzerinde öğrenilir, koleksiyonla birlikte saklanır ve vektörler yerel olarak
+izdüşürülerek yeni koleksiyona kopyalanır.
+"""
+
+# Standard Library
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Third Party
+import numpy as np
+
+from .projection import PCAProjection, projection_path
+from .store_lock import EmbeddingClaims
+from .vector_store import JobStore, create_vector_store
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_COLLECTION_FILE = "active_collection.json"
+DEFAULT_REINDEX_BATCH_SIZE = 50
+DEFAULT_REINDEX_DELAY = 1.0
+# Bu kadar turda gömülemeyen ilan eksik bırakılarak geçişe izin verilir
+DEFAULT_REINDEX_ATTEMPTS = 3
+# Başka süreçlerin sahiplendiği ilanlar beklenirken yoklama aralığı (sn)
+DEFAULT_CLAIM_WAIT = 5.0
+
+
+def versioned_collection_name(base_name: str, model: str, dimension: int, reduction: str | None = None) -> str:
+    """Model ve boyutu içeren koleksiyon adı (ör. ``job_embeddings__text-embedding-004__768``)
+
+    PCA ile düşürülmüş koleksiyonlar ``__pca`` ekiyle ayrılır; aynı boyuttaki
+    API çıktısıyla (``output_dimensionality``) karışmazlar.
+    """
+    model_slug = re.sub(r"[^A-Za-z0-9._-]+", "-", model.rsplit("/", 1)[-1]).strip("-._")
+    name = f"{base_name}__{model_slug}__{int(dimension)}"
+    return f"{name}__pca" if reduction == "pca" else name
+
+
+def read_active_collection(persist_directory: str | Path) -> dict[str, Any] | None:
+    """Etkin koleksiyon işaretçisini oku (yoksa veya bozuksa None)"""
+    path = Path(persist_directory) / ACTIVE_COLLECTION_FILE
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            active = json.load(f)
+        return active if isinstance(active, dict) and active.get("collection") else None
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Etkin koleksiyon işaretçisi okunamadı: {e}")
+        return None
+
+
+def write_active_collection(
+    persist_directory: str | Path,
+    collection: str,
+    model: str,
+    dimension: int | None,
+    reduction: str | None = None,
+) -> None:
+    """İşaretçiyi atomik olarak yaz (geçici dosya + replace)
+
+    ``reduction``: None (modelin tam çıktısı), "api" (``output_dimensionality``)
+    veya "pca" (koleksiyonla saklanan projeksiyon).
+    """
+    directory = Path(persist_directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_path = directory / f"{ACTIVE_COLLECTION_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"collection": collection, "model": model, "dimension": dimension, "reduction": reduction}, f)
+    os.replace(tmp_path, directory / ACTIVE_COLLECTION_FILE)
+
+
+class Reindexer:
+    """Kaynak koleksiyondaki ilanları yeni modelle gömüp hedef koleksiyona kopyalar
+
+    Hedefte zaten bulunan ilanlar atlandığı için kesintiden sonra yeniden
+    başlatmak kaldığı yerden devam etmek demektir. Etkin koleksiyon işaretçisi
+    ancak hedef, kaynaktaki tüm ilanları içerdiğinde çevrilir; yalnızca
+    ``max_attempts`` turda gömülemeyen ilanların eksik kalmasına izin verilir.
+    Başka bir sürecin sahiplendiği ilanlar için ``claim_wait`` saniye beklenip
+    yeniden bakılır.
+    """
+
+    def __init__(
+        self,
+        source: JobStore,
+        target: JobStore,
+        embed: Callable[[str], list[float] | None],
+        persist_directory: str | Path,
+        model: str,
+        dimension: int,
+        batch_size: int = DEFAULT_REINDEX_BATCH_SIZE,
+        delay: float = DEFAULT_REINDEX_DELAY,
+        reduction: str | None = None,
+        claims: EmbeddingClaims | None = None,
+        max_attempts: int = DEFAULT_REINDEX_ATTEMPTS,
+        claim_wait: float = DEFAULT_CLAIM_WAIT,
+    ):
+        self.source = source
+        self.target = target
+        self.embed = embed
+        self.persist_directory = Path(persist_directory)
+        self.model = model
+        self.dimension = dimension
+        self.batch_size = max(1, int(batch_size))
+        self.delay = delay
+        self.reduction = reduction
+        self.claims = claims
+        self.max_attempts = max(1, int(max_attempts))
+        self.claim_wait = claim_wait
+        self.copied = 0
+        self.attempts: dict[str, int] = {}
+        self.failed_ids: set[str] = set()
+        self.switched = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _missing_ids(self) -> set[str]:
+        """Kaynakta olup hedefte olmayan ilan ID'leri"""
+        missing: set[str] = set()
+        for page in self.source.iter_jobs(self.batch_size):
+            existing = self.target.existing_ids(page["ids"])
+            missing.update(job_id for job_id in page["ids"] if job_id not in existing)
+        return missing
+
+    def _record_failure(self, job_id: str) -> None:
+        self.attempts[job_id] = self.attempts.get(job_id, 0) + 1
+        if self.attempts[job_id] >= self.max_attempts:
+            self.failed_ids.add(job_id)
+
+    def _copy_pass(self) -> int:
+        """Hedefte olmayan ilanları kopyala; bu turda kopyalanan sayıyı döner"""
+        copied = 0
+        for page in self.source.iter_jobs(self.batch_size):
+            if self._stop.is_set():
+                break
+            existing = self.target.existing_ids(page["ids"])
+            missing = [job_id for job_id in page["ids"] if job_id not in existing and job_id not in self.failed_ids]
+            # Aynı yeniden indekslemeyi yürüten başka bir sürecin ilanları atlanır
+            owned = self.claims.claim(missing) if self.claims is not None and missing else set(missing)
+            records = {}
+            try:
+                for job_id, document, metadata in zip(page["ids"], page["matches"], page["metadatas"], strict=True):
+                    if job_id not in owned:
+                        continue
+                    embedding = self.embed(document) if document else None
+                    if embedding is None or len(embedding) != self.dimension:
+                        self._record_failure(job_id)
+                        continue
+                    records[job_id] = (embedding, document, metadata)
+                if records:
+                    copied += self.target.add_records(records)
+                    self.copied += len(records)
+                    logger.info(f"🔁 Yeniden indeksleme: {self.copied} ilan kopyalandı")
+            finally:
+                # Gömülemeyenler de bırakılır; başka bir süreç yeniden deneyebilir
+                if self.claims is not None and owned:
+                    self.claims.release(owned)
+            if records:
+                time.sleep(self.delay)
+        return copied
+
+    def run(self) -> bool:
+        """Kopyalamayı tamamla ve etkin koleksiyonu değiştir; durdurulursa False döner"""
+        try:
+            while not self._stop.is_set():
+                copied = self._copy_pass()
+                remaining = self._missing_ids() - self.failed_ids
+                if not remaining or self._stop.is_set():
+                    break
+                if not copied:
+                    # Kalanlar başka süreçte işleniyor ya da gömme yeniden denenecek
+                    logger.info(
+                        f"⏳ {len(remaining)} ilan henüz hedefte değil, {self.claim_wait:g} sn sonra bakılacak"
+                    )
+                    self._stop.wait(self.claim_wait)
+        except Exception as e:
+            logger.error(f"❌ Yeniden indeksleme hatası (sonraki çalıştırmada devam edilecek): {e}", exc_info=True)
+            return False
+        if self._stop.is_set():
+            logger.info("⏸️ Yeniden indeksleme durduruldu; sonraki çalıştırmada devam edilecek")
+            return False
+        if self.failed_ids:
+            logger.warning(
+                f"⚠️ {len(self.failed_ids)} ilan {self.max_attempts} denemede yeni modelle gömülemedi ve aktarılmadı"
+            )
+        write_active_collection(
+            self.persist_directory, self.target.collection_name, self.model, self.dimension, self.reduction
+        )
+        self.switched = True
+        logger.info(f"✅ Etkin koleksiyon değiştirildi: {self.target.collection_name}")
+        return True
+
+    def start(self) -> threading.Thread:
+        """Yeniden indekslemeyi arka plan iş parçacığında başlat"""
+        self._thread = threading.Thread(target=self.run, name="reindexer")
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def start_reindex(
+    source: JobStore,
+    persist_directory: str | Path,
+    base_name: str,
+    model: str,
+    embed: Callable[[str], list[float] | None],
+    backend: str = "chroma",
+    batch_size: int = DEFAULT_REINDEX_BATCH_SIZE,
+    delay: float = DEFAULT_REINDEX_DELAY,
+    reduction: str | None = None,
+    claims: EmbeddingClaims | None = None,
+    **store_settings: Any,
+) -> Reindexer | None:
+    """Yeni model için sürümlü hedef koleksiyonu aç ve arka planda yeniden indekslemeyi başlat
+
+    ``reduction="api"`` ise ``embed`` zaten düşük boyutlu vektör döndürür;
+    yalnızca işaretçiye ve koleksiyon adına yansır.
+    """
+    probe = embed("embedding dimension probe")
+    if not probe:
+        logger.error(f"❌ '{model}' modeliyle embedding alınamadı, yeniden indeksleme başlatılmadı")
+        return None
+    target_name = versioned_collection_name(base_name, model, len(probe))
+    target = create_vector_store(
+        persist_directory=str(persist_directory), collection_name=target_name, backend=backend, **store_settings
+    )
+    if target is None or not target.create_collection():
+        logger.error(f"❌ Hedef koleksiyon açılamadı: {target_name}")
+        return None
+    logger.info(f"🔁 '{source.collection_name}' -> '{target_name}' yeniden indeksleme arka planda başlatıldı")
+    reindexer = Reindexer(
+        source,
+        target,
+        embed,
+        persist_directory,
+        model,
+        len(probe),
+        batch_size=batch_size,
+        delay=delay,
+        reduction=reduction,
+        claims=claims,
+    )
+    reindexer.start()
+    return reindexer
+
+
+def reduce_with_pca(
+    source: JobStore,
+    persist_directory: str | Path,
+    base_name: str,
+    model: str,
+    dimension: int,
+    backend: str = "chroma",
+    batch_size: int = DEFAULT_REINDEX_BATCH_SIZE,
+    **store_settings: Any,
+) -> JobStore | None:
+    """Kaynaktaki vektörlerle PCA öğren, izdüşürülmüş kopyayı oluştur ve etkin koleksiyonu değiştir
+
+    API çağrısı yapılmaz. Projeksiyon hedef koleksiyonun yanına kaydedilir ve
+    sonraki çalıştırmalarda yeni ilanlara ve sorgulara uygulanır.
+    """
+    total = source.get_stats().get("total_jobs", 0)
+    if total <= dimension:
+        logger.info(f"ℹ️ PCA için yeterli ilan yok ({total} <= {dimension}); tam boyutla devam ediliyor")
+        return None
+    projection = PCAProjection.fit(
+        (page["embeddings"] for page in source.iter_jobs(batch_size, include_embeddings=True)), dimension
+    )
+    target_name = versioned_collection_name(base_name, model, dimension, reduction="pca")
+    target = create_vector_store(
+        persist_directory=str(persist_directory), collection_name=target_name, backend=backend, **store_settings
+    )
+    if target is None or not target.create_collection():
+        logger.error(f"❌ Hedef koleksiyon açılamadı: {target_name}")
+        return None
+    # Yarıda kalmış bir kopyanın eski projeksiyonla yazılmış satırları tutarsız olur
+    target.clear_collection()
+    copied = 0
+    for page in source.iter_jobs(batch_size, include_embeddings=True):
+        vectors = projection.transform(page["embeddings"])
+        copied += target.add_records(
+            {
+                job_id: (vector, document, metadata)
+                for job_id, vector, document, metadata in zip(
+                    page["ids"], np.asarray(vectors), page["matches"], page["metadatas"], strict=True
+                )
+            }
+        )
+    projection.save(projection_path(persist_directory, target_name))
+    write_active_collection(persist_directory, target_name, model, dimension, reduction="pca")
+    logger.info(
+        f"📉 {copied} ilan {projection.input_dimension} -> {dimension} boyuta izdüşürüldü "
+        f"(korunan varyans: %{projection.explained_variance_ratio * 100:.1f}); etkin koleksiyon: {target_name}"
+    )
+    return target
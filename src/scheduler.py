@@ -0,0 +1,91 @@
+"""
+Süre ve Kota Bütçeli Çalıştırma
+``--time-budget`` / ``--max-embeddings`` verildiğinde pipeline her şeyi
+yapmaya çalışmak yerine işi ucuz sinyallere göre (anahtar kelime skoru,
+yayın tarihi) sıralar ve bütçe dolunca temiz biçimde durur; o ana kadar
+tamamlanan ilanlarla yine sıralı sonuç üretilir.
+"""
+
+# Standard Library
+import math
+import re
+import time
+from collections.abc import Callable, Iterable
+from numbers import Real
+from typing import Any
+
+from .intelligent_scoring import IntelligentScoringSystem
+from .job_schema import to_timestamp
+
+# Süre bütçesinin aşamalara paylaştırılması (geçen süre / toplam bütçe)
+COLLECTION_SHARE = 0.5  # Veri toplama en fazla bütçenin yarısını kullanır
+EMBEDDING_SHARE = 0.9  # Kalan %10 arama ve puanlamaya ayrılır
+
+# Arama terimindeki dışlanan kelimeler (ör. "-Senior") persona puanına katılmaz;
+# yalnızca kelime başındaki tire dışlamadır ("Entry-Level" korunur)
+NEGATED_TERM = re.compile(r"(?<!\S)-\S+")
+
+
+class Budget:
+    """Bir çalıştırmanın süre ve embedding kotası takibi (limit None = sınırsız)"""
+
+    def __init__(
+        self,
+        time_budget: float | None = None,
+        max_embeddings: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.time_budget = time_budget
+        self.max_embeddings = max_embeddings
+        self.embeddings_used = 0
+        self._clock = clock
+        self._started = clock()
+
+    @property
+    def limited(self) -> bool:
+        return self.time_budget is not None or self.max_embeddings is not None
+
+    def elapsed(self) -> float:
+        return self._clock() - self._started
+
+    def time_left(self, share: float = 1.0) -> bool:
+        """Bütçenin ``share`` oranı henüz dolmadıysa True"""
+        return self.time_budget is None or self.elapsed() < self.time_budget * share
+
+    def embeddings_left(self) -> int | None:
+        if self.max_embeddings is None:
+            return None
+        return max(self.max_embeddings - self.embeddings_used, 0)
+
+    def can_embed(self) -> bool:
+        """Bir embedding çağrısı için hem kota hem süre var mı?"""
+        return self.embeddings_left() != 0 and self.time_left(EMBEDDING_SHARE)
+
+    def spend(self, embeddings: int = 1) -> None:
+        self.embeddings_used += embeddings
+
+
+def persona_priority(term: str, scoring_system: IntelligentScoringSystem) -> int:
+    """Persona arama teriminin başlık skoru (dışlanan kelimeler hariç)"""
+    return scoring_system.score_title(NEGATED_TERM.sub(" ", term))
+
+
+def prioritize_personas(personas: Iterable[tuple[str, Any]], scoring_system: IntelligentScoringSystem) -> list:
+    """(ad, ayar) çiftlerini önce yüksek skorlu, sonra daha taze (küçük hours_old) olacak şekilde sırala"""
+    return sorted(
+        personas,
+        key=lambda item: (-persona_priority(item[1]["term"], scoring_system), item[1]["hours_old"]),
+    )
+
+
+def job_priority(job: dict[str, Any]) -> tuple[float, int]:
+    """İlan sıralama anahtarı: yüksek anahtar kelime skoru, sonra yeni tarih önce"""
+    score = job.get("keyword_score")
+    score = score if isinstance(score, Real) and not math.isnan(score) else 0
+    posted = to_timestamp(job.get("date_posted")) or 0
+    return -score, -posted
+
+
+def prioritize_jobs(indices: Iterable[int], jobs: list[dict[str, Any]]) -> list[int]:
+    """İlan indekslerini ``job_priority`` sırasına diz (eşitlikte ilk sıra korunur)"""
+    return sorted(indices, key=lambda i: job_priority(jobs[i]))
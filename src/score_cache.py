@@ -0,0 +1,100 @@
+"""Bounded memo cache for per-job score components.
+
+Keys combine the scored component, a fingerprint of the config section the
+component depends on and a hash of the scored text, so a config change only
+invalidates the components it affects.
+"""
+
+from __future__ import annotations
+
+# Standard Library
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 50_000
+
+
+class ScoreCache:
+    """LRU cache of integer score components with optional JSON persistence."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: str | Path | None = None):
+        self.max_entries = max(1, int(max_entries))
+        self.path = Path(path) if path else None
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def make_key(component: str, version: str, digest: str) -> str:
+        return f"{component}:{version}:{digest}"
+
+    def get(self, key: str) -> int | None:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: int) -> None:
+        self._entries[key] = int(value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def load(self) -> bool:
+        """Load persisted entries; a missing or corrupt file leaves the cache empty."""
+        if not self.path or not self.path.exists():
+            return False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            for key, value in data.get("entries", {}).items():
+                self.set(key, value)
+            logger.info(f"✅ Skor önbelleği yüklendi ({len(self._entries)} kayıt)")
+            return True
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"⚠️ Skor önbelleği okunamadı, boş başlatılıyor: {e}")
+            self._entries.clear()
+            return False
+
+    def save(self) -> bool:
+        """Persist entries atomically (write to a temp file, then replace)."""
+        if not self.path:
+            return False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": self._entries}, f)
+            os.replace(tmp_path, self.path)
+            logger.info(f"💾 Skor önbelleği kaydedildi ({len(self._entries)} kayıt, {self.stats()})")
+            return True
+        except OSError as e:
+            logger.warning(f"⚠️ Skor önbelleği kaydedilemedi: {e}")
+            return False
+
+
+def create_score_cache(config: dict) -> ScoreCache | None:
+    """Build a ScoreCache from ``scoring_system.cache`` settings (None if disabled)."""
+    cache_cfg = config.get("scoring_system", {}).get("cache", {}) or {}
+    if not cache_cfg.get("enabled", False):
+        return None
+    return ScoreCache(
+        max_entries=cache_cfg.get("max_entries", DEFAULT_MAX_ENTRIES),
+        path=cache_cfg.get("path"),
+    )
@@ -0,0 +1,157 @@
+"""Bounded cache of vector search results.
+
+Keys hash the query vector, the result count, the metadata filter and the
+collection version. Every add or delete bumps the version, which drops all
+entries, so a cached result is never served for a changed collection.
+
+For persistent caches the version lives in its own file next to the cache
+(``<collection>.version``) and is bumped by writers while they hold the
+store's writer lock. Readers re-read it before every lookup and before
+saving, so entries cached by one process are discarded as soon as another
+process changes the collection.
+"""
+
+from __future__ import annotations
+
+# Standard Library
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+# Third Party
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class SearchCache:
+    """LRU cache of search results tied to a collection version counter."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: str | Path | None = None):
+        self.max_entries = max(1, int(max_entries))
+        self.path = Path(path) if path else None
+        self.version_path = self.path.with_suffix(".version") if self.path else None
+        self.version = 0
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if self.path:
+            self.load()
+
+    def make_key(
+        self,
+        query: Sequence[float],
+        n_results: int | None,
+        filter_metadata: dict[str, Any] | None,
+        threshold_mode: bool = False,
+    ) -> str:
+        """Hash of the query vector and search options under the current version."""
+        options = json.dumps([None if threshold_mode else n_results, filter_metadata, threshold_mode], sort_keys=True)
+        digest = hashlib.blake2b(np.asarray(query, dtype=np.float32).tobytes(), digest_size=16)
+        digest.update(options.encode("utf-8"))
+        return f"{self.version}:{digest.hexdigest()}"
+
+    def get(self, key: str, min_similarity: float | None = None) -> dict[str, list] | None:
+        """Cached result for a key; a threshold search is served by any entry fetched at a lower threshold."""
+        entry = self._entries.get(key)
+        if entry is None:
+            usable = False
+        elif min_similarity is None:
+            usable = entry["min_similarity"] is None
+        else:
+            usable = entry["min_similarity"] is not None and min_similarity >= entry["min_similarity"]
+        if not usable:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry["result"]
+
+    def set(self, key: str, result: dict[str, list], min_similarity: float | None = None) -> None:
+        self._entries[key] = {"min_similarity": min_similarity, "result": result}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_version(self) -> int:
+        """Collection version as persisted by the last writer (in-memory version if none)."""
+        if self.version_path is None:
+            return self.version
+        try:
+            return int(self.version_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self.version if self.version_path.exists() else 0
+
+    def sync(self) -> None:
+        """Drop every entry if another process has changed the collection since they were cached."""
+        version = self._read_version()
+        if version != self.version:
+            self.version = version
+            self._entries.clear()
+
+    def bump(self) -> None:
+        """Advance the collection version and drop every cached result.
+
+        Persistent caches must be bumped under the store's writer lock so two
+        writers never hand out the same version.
+        """
+        self.version = max(self.version, self._read_version()) + 1
+        self._entries.clear()
+        if self.version_path is not None:
+            try:
+                self.version_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.version_path.with_suffix(".version.tmp")
+                tmp_path.write_text(str(self.version), encoding="utf-8")
+                os.replace(tmp_path, self.version_path)
+            except OSError as e:
+                logger.warning(f"⚠️ Arama önbelleği sürümü yazılamadı: {e}")
+        self.save()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "version": self.version}
+
+    def load(self) -> bool:
+        """Load persisted entries; a missing or corrupt file leaves the cache empty."""
+        if not self.path or not self.path.exists():
+            return False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.version = int(data.get("version", 0))
+            for key, entry in data.get("entries", {}).items():
+                self.set(key, entry["result"], entry.get("min_similarity"))
+            self.sync()
+            return True
+        except (OSError, ValueError, AttributeError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️ Arama önbelleği okunamadı, boş başlatılıyor: {e}")
+            self._entries.clear()
+            return False
+
+    def save(self) -> bool:
+        """Persist version and entries atomically (write to a temp file, then replace).
+
+        Entries are dropped first if the collection changed since they were cached.
+        """
+        if not self.path:
+            return False
+        self.sync()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.version, "entries": self._entries}, f)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            logger.warning(f"⚠️ Arama önbelleği kaydedilemedi: {e}")
+            return False
@@ -0,0 +1,428 @@
+"""
+Zamana Göre Bölünmüş (Sharded) Vector Store
+İlanlar yayın tarihlerine (``posted_ts``) göre haftalık ya da aylık alt
+koleksiyonlara yazılır. Aramalar yalnızca istenen zaman penceresiyle kesişen
+parçalara paralel gönderilir ve sonuçlar mesafeye göre birleştirilir. Süresi
+dolan parçalar tek tek silme yapılmadan bütün olarak düşürülür.
+"""
+
+# Standard Library
+import json
+import logging
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+# Third Party
+import pandas as pd
+
+from .job_schema import POSTED_TS_FIELD, job_document, job_metadata, stable_job_id, to_timestamp
+from .snapshot import DEFAULT_IMPORT_CHUNK_SIZE, export_snapshot, import_snapshot
+from .store_lock import DEFAULT_LOCK_TIMEOUT, locked, store_writer_lock
+
+logger = logging.getLogger(__name__)
+
+SHARD_PERIODS = ("week", "month")
+UNDATED_SHARD = "undated"
+SHARDS_FILE_SUFFIX = ".shards.json"
+DEFAULT_SEARCH_WORKERS = 4
+
+
+def shard_key(timestamp: int | float | None, period: str) -> str:
+    """Zaman damgasının düştüğü parça (ör. ``2024-06`` ya da ``2024-W23``)"""
+    if timestamp is None:
+        return UNDATED_SHARD
+    moment = datetime.fromtimestamp(timestamp)
+    if period == "week":
+        year, week, _ = moment.isocalendar()
+        return f"{year}-W{week:02d}"
+    return f"{moment.year}-{moment.month:02d}"
+
+
+def shard_bounds(key: str) -> tuple[int, int] | None:
+    """Parçanın ``[başlangıç, bitiş)`` zaman damgaları (tarihsiz parça için None)"""
+    if key == UNDATED_SHARD:
+        return None
+    year, rest = key.split("-", 1)
+    if rest.startswith("W"):
+        start = datetime.fromisocalendar(int(year), int(rest[1:]), 1)
+        end = start + timedelta(days=7)
+    else:
+        start = datetime(int(year), int(rest), 1)
+        end = datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def record_shard_key(metadata: dict[str, Any], period: str) -> str:
+    """Kaydın parçası; yayın tarihi olmayan ilanlar (``posted_ts`` toplama
+    zamanına düşse bile) tarihsiz parçaya gider, böylece sonraki toplamalarda
+    aynı ilan başka bir parçaya yazılmaz"""
+    if metadata.get("date_posted") is None:
+        return UNDATED_SHARD
+    return shard_key(metadata.get(POSTED_TS_FIELD), period)
+
+
+def time_window(where: dict[str, Any] | None, field: str = POSTED_TS_FIELD) -> tuple[float, float]:
+    """``where`` içindeki (üst düzey ya da ``$and``) ``field`` sınırlarından zaman penceresi çıkar"""
+    lower, upper = float("-inf"), float("inf")
+    conditions = (where or {}).get("$and", [where] if where else [])
+    for condition in conditions:
+        bounds = condition.get(field)
+        if not isinstance(bounds, dict):
+            continue
+        for operator, value in bounds.items():
+            if operator in ("$gte", "$gt"):
+                lower = max(lower, value)
+            elif operator in ("$lt", "$lte"):
+                upper = min(upper, value)
+    return lower, upper
+
+
+def _merge_results(results: list[dict[str, list]], n_results: int | None) -> dict[str, list]:
+    """Parça sonuçlarını mesafeye göre birleştir (``n_results`` None ise hepsi)
+
+    Aynı ID birden fazla parçada bulunursa yalnızca en yakın kaydı tutulur.
+    """
+    best: dict[str, tuple[float, str, str, dict[str, Any]]] = {}
+    for result in results:
+        for job_id, match, distance, metadata in zip(
+            result["ids"], result["matches"], result["distances"], result["metadatas"], strict=True
+        ):
+            if job_id not in best or distance < best[job_id][0]:
+                best[job_id] = (distance, job_id, match, metadata)
+    rows = sorted(best.values(), key=lambda row: row[0])[:n_results]
+    return {
+        "ids": [row[1] for row in rows],
+        "matches": [row[2] for row in rows],
+        "distances": [row[0] for row in rows],
+        "metadatas": [row[3] for row in rows],
+    }
+
+
+class ShardedVectorStore:
+    """Her zaman dilimi için ayrı bir alt store (``<koleksiyon>__<parça>``) tutan store
+
+    Alt store'lar seçilen backend'in sınıfıyla (``store_cls``) oluşturulur.
+    Parça listesi persist dizinindeki ``<koleksiyon>.shards.json`` dosyasında tutulur.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str | None = None,
+        collection_name: str | None = None,
+        store_cls: Any = None,
+        period: str = "month",
+        search_workers: int = DEFAULT_SEARCH_WORKERS,
+        lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+        **settings: Any,
+    ):
+        if period not in SHARD_PERIODS:
+            raise ValueError(f"Bilinmeyen parça süresi: {period} (seçenekler: {', '.join(SHARD_PERIODS)})")
+        if store_cls is None:
+            raise ValueError("Parça store sınıfı (store_cls) gerekli")
+        self.persist_directory = persist_directory
+        self.collection_name = collection_name or "job_embeddings"
+        self.store_cls = store_cls
+        self.period = period
+        self.search_workers = max(1, int(search_workers))
+        self.settings = dict(settings, lock_timeout=lock_timeout)
+        # Parçalarla aynı kilit: parça listesi ve parçalara yazma tek bir kritik bölge
+        self.writer_lock = store_writer_lock(persist_directory, lock_timeout)
+        self.shards: dict[str, Any] = {}
+        self.collection: ShardedVectorStore | None = None
+        self.last_rejected_ids: list[str] = []
+        self.last_pruned_ids: list[str] = []
+        self.search_cache = None
+
+    # --- Parça yönetimi ---------------------------------------------------
+
+    @property
+    def _manifest_path(self) -> Path | None:
+        if not self.persist_directory:
+            return None
+        return Path(self.persist_directory) / f"{self.collection_name}{SHARDS_FILE_SUFFIX}"
+
+    def _save_manifest(self) -> None:
+        """Parça listesini atomik olarak yaz (geçici dosya + replace)"""
+        path = self._manifest_path
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"period": self.period, "shards": sorted(self.shards)}, f)
+        os.replace(tmp_path, path)
+
+    def _open_shard(self, key: str) -> Any:
+        store = self.store_cls(
+            persist_directory=self.persist_directory, collection_name=f"{self.collection_name}__{key}", **self.settings
+        )
+        store.create_collection()
+        return store
+
+    def _shard_for(self, key: str) -> Any:
+        if key not in self.shards:
+            self.shards[key] = self._open_shard(key)
+            self._save_manifest()
+            logger.info(f"🧩 Yeni parça açıldı: {self.collection_name}__{key}")
+        return self.shards[key]
+
+    def shards_in_window(self, start: float = float("-inf"), end: float = float("inf")) -> list[str]:
+        """``[start, end]`` aralığıyla kesişen parçalar (tarihsiz parça her zaman dahil)"""
+        keys = []
+        for key in sorted(self.shards):
+            bounds = shard_bounds(key)
+            if bounds is None or (bounds[1] > start and bounds[0] <= end):
+                keys.append(key)
+        return keys
+
+    def _reload_manifest(self) -> None:
+        """Başka bir sürecin açtığı ya da düşürdüğü parçaları eşitle"""
+        path = self._manifest_path
+        if path is None or not path.exists():
+            return
+        with open(path, encoding="utf-8") as f:
+            keys = set(json.load(f).get("shards", []))
+        for key in set(self.shards) - keys:
+            del self.shards[key]
+        for key in keys - set(self.shards):
+            self.shards[key] = self._open_shard(key)
+
+    @locked
+    def drop_shards(self, older_than: datetime) -> int:
+        """Tamamı ``older_than`` öncesinde kalan parçaları bütün olarak düşür; silinen ilan sayısını döner
+
+        Düşürülen ilanların ID'leri ``last_pruned_ids`` listesine eklenir.
+        """
+        cutoff = to_timestamp(older_than)
+        if cutoff is None:
+            return 0
+        self._reload_manifest()
+        dropped = 0
+        for key in list(self.shards):
+            bounds = shard_bounds(key)
+            if bounds is None or bounds[1] > cutoff:
+                continue
+            shard = self.shards.pop(key)
+            dropped += shard.get_stats().get("total_jobs", 0)
+            for page in shard.iter_jobs():
+                self.last_pruned_ids += page["ids"]
+            shard.drop_collection()
+            logger.info(f"🗑️ Parça düşürüldü: {shard.collection_name}")
+        self._save_manifest()
+        return dropped
+
+    # --- VectorStore API --------------------------------------------------
+
+    def create_collection(self) -> bool:
+        """Kayıtlı parçaları aç"""
+        try:
+            path = self._manifest_path
+            if path is not None and path.exists():
+                with open(path, encoding="utf-8") as f:
+                    manifest = json.load(f)
+                if manifest.get("period", self.period) != self.period:
+                    logger.warning(
+                        f"⚠️ Parça süresi değişti ({manifest['period']} -> {self.period}); "
+                        "mevcut parçalar korunur, yeni ilanlar yeni süreyle bölünür"
+                    )
+                for key in manifest.get("shards", []):
+                    if key not in self.shards:
+                        self.shards[key] = self._open_shard(key)
+            self.collection = self
+            logger.info(f"✅ {len(self.shards)} parçalı koleksiyon yüklendi ({self.period})")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Parçalı koleksiyon yükleme hatası: {str(e)}", exc_info=True)
+            return False
+
+    def get_collection(self):
+        if self.collection is None:
+            self.create_collection()
+        return self.collection
+
+    def job_exists(self, job_dict: dict[str, Any]) -> bool:
+        """İlan herhangi bir parçada var mı (parça tarihten hesaplanmaz; tarih değişmiş olabilir)"""
+        return bool(self.existing_ids([stable_job_id(job_dict)]))
+
+    def existing_ids(self, job_ids: list[str]) -> set[str]:
+        self.get_collection()
+        found: set[str] = set()
+        for shard in self.shards.values():
+            found.update(shard.existing_ids(job_ids))
+        return found
+
+    def add_jobs(self, jobs_df: pd.DataFrame, embeddings: list[list[float] | None]) -> bool:
+        """İş ilanlarını yayın tarihlerine göre parçalara ekle"""
+        try:
+            batch: dict[str, tuple[list[float], str, dict[str, Any]]] = {}
+            for i, (_, job_row) in enumerate(jobs_df.iterrows()):
+                if i < len(embeddings) and embeddings[i] is not None:
+                    job_dict = job_row.to_dict()
+                    batch.setdefault(
+                        stable_job_id(job_dict), (embeddings[i], job_document(job_dict), job_metadata(job_dict))
+                    )
+            self.add_records(batch)
+            return True
+        except Exception as e:
+            logger.error(f"❌ İş ilanları ekleme hatası: {str(e)}", exc_info=True)
+            return False
+
+    @locked
+    def add_records(
+        self, records: dict[str, tuple[list[float], str, dict[str, Any]]], batch_size: int | None = None
+    ) -> int:
+        """Kayıtları ``posted_ts`` değerine göre parçalara dağıt; eklenen sayıyı döner
+
+        Herhangi bir parçada zaten bulunan ID'ler atlanır.
+        """
+        self.get_collection()
+        self._reload_manifest()
+        existing = self.existing_ids(list(records))
+        grouped: dict[str, dict[str, tuple[list[float], str, dict[str, Any]]]] = {}
+        for job_id, record in records.items():
+            if job_id not in existing:
+                grouped.setdefault(record_shard_key(record[2], self.period), {})[job_id] = record
+        added = 0
+        self.last_rejected_ids = []
+        for key, shard_records in grouped.items():
+            shard = self._shard_for(key)
+            added += shard.add_records(shard_records, batch_size=batch_size)
+            self.last_rejected_ids += shard.last_rejected_ids
+        return added
+
+    def iter_jobs(self, page_size: int | None = None, include_embeddings: bool = False) -> Iterator[dict[str, Any]]:
+        self.get_collection()
+        for key in sorted(self.shards):
+            yield from self.shards[key].iter_jobs(page_size, include_embeddings=include_embeddings)
+
+    def export_snapshot(self, path: str | Path, quantization: str = "none") -> int:
+        """Tüm parçaları tek bir snapshot'a yaz"""
+        return export_snapshot(self, path, quantization=quantization)
+
+    def import_snapshot(self, path: str | Path, chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE) -> int:
+        """Snapshot'ı yayın tarihlerine göre parçalara yükle"""
+        return import_snapshot(self, path, chunk_size=chunk_size)
+
+    def search_jobs(
+        self,
+        query_embedding: list[float],
+        n_results: int = 10,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> dict[str, list]:
+        return self.search_jobs_batch([query_embedding], n_results=n_results, filter_metadata=filter_metadata)[0]
+
+    def search_jobs_above(
+        self,
+        query_embedding: list[float],
+        min_similarity: float,
+        filter_metadata: dict[str, Any] | None = None,
+        page_size: int = 50,
+    ) -> dict[str, list]:
+        return self.search_jobs_batch(
+            [query_embedding], n_results=page_size, filter_metadata=filter_metadata, min_similarity=min_similarity
+        )[0]
+
+    def search_jobs_batch(
+        self,
+        query_matrix: Any,
+        n_results: int = 10,
+        filter_metadata: dict[str, Any] | None = None,
+        min_similarity: float | None = None,
+    ) -> list[dict[str, list]]:
+        """Filtredeki ``posted_ts`` penceresiyle kesişen parçaları paralel ara ve birleştir"""
+        queries = list(query_matrix)
+        self.get_collection()
+        keys = self.shards_in_window(*time_window(filter_metadata))
+        if not keys:
+            return [{"ids": [], "matches": [], "distances": [], "metadatas": []} for _ in queries]
+
+        def search(key: str) -> list[dict[str, list]]:
+            return self.shards[key].search_jobs_batch(queries, n_results, filter_metadata, min_similarity)
+
+        with ThreadPoolExecutor(max_workers=min(self.search_workers, len(keys))) as executor:
+            per_shard = list(executor.map(search, keys))
+        logger.info(f"🧩 {len(keys)}/{len(self.shards)} parça arandı")
+        limit = None if min_similarity is not None else n_results
+        return [_merge_results([results[i] for results in per_shard], limit) for i in range(len(queries))]
+
+    def get_jobs(
+        self,
+        job_ids: list[str],
+        filter_metadata: dict[str, Any] | None = None,
+        include_embeddings: bool = False,
+    ) -> dict[str, list]:
+        """ID'leri verilen ilanları penceredeki parçalardan istenen sırayla getir"""
+        self.get_collection()
+        found: dict[str, tuple[str, dict[str, Any], Any]] = {}
+        for key in self.shards_in_window(*time_window(filter_metadata)):
+            jobs = self.shards[key].get_jobs(job_ids, filter_metadata, include_embeddings=include_embeddings)
+            embeddings = jobs.get("embeddings") or [None] * len(jobs["ids"])
+            for job_id, match, metadata, embedding in zip(
+                jobs["ids"], jobs["matches"], jobs["metadatas"], embeddings, strict=True
+            ):
+                found[job_id] = (match, metadata, embedding)
+        ordered = [job_id for job_id in job_ids if job_id in found]
+        result = {
+            "ids": ordered,
+            "matches": [found[job_id][0] for job_id in ordered],
+            "metadatas": [found[job_id][1] for job_id in ordered],
+        }
+        if include_embeddings:
+            result["embeddings"] = [found[job_id][2] for job_id in ordered]
+        return result
+
+    def get_stats(self) -> dict[str, Any]:
+        self.get_collection()
+        counts = {key: shard.get_stats().get("total_jobs", 0) for key, shard in sorted(self.shards.items())}
+        return {
+            "total_jobs": sum(counts.values()),
+            "collection_name": self.collection_name,
+            "period": self.period,
+            "shards": counts,
+            "last_updated": datetime.now().isoformat(),
+        }
+
+    @locked
+    def prune(self, older_than: datetime, field: str = POSTED_TS_FIELD, page_size: int | None = None) -> int:
+        """Eski parçaları bütün olarak düşür, sınırdaki parçayı ilan ilan temizle"""
+        self.last_pruned_ids = []
+        self.get_collection()
+        deleted = self.drop_shards(older_than) if field == POSTED_TS_FIELD else 0
+        for shard in self.shards.values():
+            deleted += shard.prune(older_than, field=field, page_size=page_size)
+            self.last_pruned_ids += shard.last_pruned_ids
+        return deleted
+
+    def compact(self) -> bool:
+        self.get_collection()
+        # Her parça sıkıştırılır; any() ilk True'da durmasın diye önce liste kurulur
+        compacted = [shard.compact() for shard in self.shards.values()]
+        return any(compacted)
+
+    @locked
+    def drop_collection(self) -> bool:
+        """Tüm parçaları ve parça listesini sil"""
+        self.get_collection()
+        for shard in self.shards.values():
+            shard.drop_collection()
+        self.shards = {}
+        path = self._manifest_path
+        if path is not None and path.exists():
+            path.unlink()
+        return True
+
+    @locked
+    def clear_collection(self) -> bool:
+        """Tüm parçaları düşür (dikkatli kullan!)"""
+        self.drop_collection()
+        self._save_manifest()
+        logger.info("🗑️ Parçalı koleksiyon başarıyla temizlendi")
+        return True
+
+    def save_search_cache(self) -> bool:
+        saved = [shard.save_search_cache() for shard in self.shards.values()]
+        return any(saved)
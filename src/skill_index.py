@@ -0,0 +1,91 @@
+"""Inverted index from skill tokens to the job IDs that mention them.
+
+The index is built once per corpus and grows incrementally as postings are
+added. Matching a CV's skills against every job is a handful of set
+intersections instead of one regex scan per job and skill.
+"""
+
+from __future__ import annotations
+
+# Standard Library
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+
+from .job_schema import stable_job_id
+
+# Keeps "c++" / "c#" intact; dots, hyphens and spaces split tokens so that
+# "react.js", "React JS" and "react-js" all index the same way.
+_TOKEN_PATTERN = re.compile(r"[\w+#]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens of a text (empty list for non-strings)."""
+    if not isinstance(text, str) or not text:
+        return []
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def job_text(job: dict) -> str:
+    """Text of a posting that skills are matched against."""
+    title = job.get("title")
+    description = job.get("description")
+    return f"{title if isinstance(title, str) else ''} {description if isinstance(description, str) else ''}"
+
+
+class SkillIndex:
+    """Token -> job ID -> token positions, with idempotent, incremental updates.
+
+    Positions let multi-word skills ("power bi") match only as a phrase.
+    """
+
+    def __init__(self):
+        self._postings: defaultdict[str, dict[str, set[int]]] = defaultdict(dict)
+        self._job_ids: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._job_ids)
+
+    def __contains__(self, job_id: object) -> bool:
+        return job_id in self._job_ids
+
+    def add(self, job_id: str, text: str) -> bool:
+        """Index a posting; returns False if the ID is already indexed."""
+        if job_id in self._job_ids:
+            return False
+        self._job_ids.add(job_id)
+        for position, token in enumerate(tokenize(text)):
+            self._postings[token].setdefault(job_id, set()).add(position)
+        return True
+
+    def add_jobs(self, jobs: Iterable[dict], job_ids: Iterable[str] | None = None) -> int:
+        """Index job dicts (IDs default to their stable job ID); returns the number added."""
+        jobs = list(jobs)
+        ids = list(job_ids) if job_ids is not None else [stable_job_id(job) for job in jobs]
+        return sum(self.add(job_id, job_text(job)) for job_id, job in zip(ids, jobs, strict=True))
+
+    def jobs_with_skill(self, skill: str) -> set[str]:
+        """IDs of jobs containing the skill's tokens adjacent and in order."""
+        tokens = tokenize(skill)
+        if not tokens:
+            return set()
+        postings = [self._postings.get(token, {}) for token in tokens]
+        smallest = min(postings, key=len)
+        candidates = {job_id for job_id in smallest if all(job_id in posting for posting in postings)}
+        if len(tokens) == 1:
+            return candidates
+        return {
+            job_id
+            for job_id in candidates
+            if any(
+                all(start + offset in postings[offset][job_id] for offset in range(1, len(tokens)))
+                for start in postings[0][job_id]
+            )
+        }
+
+    def match_counts(self, skills: Iterable[str]) -> Counter[str]:
+        """Number of the given skills found in each matching job."""
+        counts: Counter[str] = Counter()
+        for skill in skills:
+            counts.update(self.jobs_with_skill(skill))
+        return counts
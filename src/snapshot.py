@@ -0,0 +1,142 @@
+"""
+Vector Store Snapshot'ları
+Bir koleksiyonu embedding API'sine gitmeden taşınabilir hale getirir.
+
+Snapshot dizini üç, int8 nicemlemede dört dosyadan oluşur:
+
+- ``embeddings.npy``: embedding matrisi (float32; ya da float16 / int8 nicemlenmiş)
+- ``scales.npy``: satır başına ölçekler (yalnızca int8)
+- ``records.jsonl``: satır sırasıyla ``{"id", "document", "metadata"}``
+- ``manifest.json``: satır sayısı, boyut ve kaynak koleksiyon
+"""
+
+# Standard Library
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# Third Party
+import numpy as np
+
+from .quantization import QUANTIZATION_MODES, dequantize, quantize
+
+logger = logging.getLogger(__name__)
+
+EMBEDDINGS_FILE = "embeddings.npy"
+SCALES_FILE = "scales.npy"
+RECORDS_FILE = "records.jsonl"
+MANIFEST_FILE = "manifest.json"
+SNAPSHOT_FORMAT_VERSION = 1
+DEFAULT_EXPORT_PAGE_SIZE = 1000
+DEFAULT_IMPORT_CHUNK_SIZE = 1000
+
+
+def export_snapshot(
+    store: Any, path: str | Path, page_size: int = DEFAULT_EXPORT_PAGE_SIZE, quantization: str = "none"
+) -> int:
+    """Store'daki tüm ilanları sayfa sayfa snapshot dizinine yaz; yazılan satır sayısını döner
+
+    ``quantization`` "float16" veya "int8" ise matris nicemlenmiş olarak yazılır
+    (yükleme sırasında float32'ye açılır).
+    """
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"Bilinmeyen nicemleme modu: {quantization}")
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    capacity = store.get_stats().get("total_jobs", 0)
+    matrix: np.ndarray | None = None
+    scales: np.ndarray | None = None
+    count = 0
+
+    with open(directory / RECORDS_FILE, "w", encoding="utf-8") as records:
+        for page in store.iter_jobs(page_size, include_embeddings=True):
+            embeddings, page_scales = quantize(page["embeddings"], quantization)
+            if matrix is None:
+                rows_total = max(capacity, len(page["ids"]))
+                matrix = np.lib.format.open_memmap(
+                    directory / EMBEDDINGS_FILE,
+                    mode="w+",
+                    dtype=embeddings.dtype,
+                    shape=(rows_total, embeddings.shape[1]),
+                )
+                if page_scales is not None:
+                    scales = np.lib.format.open_memmap(
+                        directory / SCALES_FILE, mode="w+", dtype=np.float32, shape=(rows_total,)
+                    )
+            # Dışa aktarma sırasında eklenen ilanlar snapshot'a alınmaz
+            rows = min(len(page["ids"]), matrix.shape[0] - count)
+            matrix[count : count + rows] = embeddings[:rows]
+            if scales is not None:
+                scales[count : count + rows] = page_scales[:rows]
+            for job_id, document, metadata in zip(
+                page["ids"][:rows], page["matches"][:rows], page["metadatas"][:rows], strict=True
+            ):
+                records.write(json.dumps({"id": job_id, "document": document, "metadata": metadata}) + "\n")
+            count += rows
+            if count == matrix.shape[0]:
+                break
+
+    dimension = None
+    if matrix is not None:
+        dimension = int(matrix.shape[1])
+        matrix.flush()
+        del matrix
+    if scales is not None:
+        scales.flush()
+        del scales
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "count": count,
+        "dimension": dimension,
+        "quantization": quantization,
+        "collection_name": store.collection_name,
+        "created_at": datetime.now().isoformat(),
+    }
+    with open(directory / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    logger.info(f"📦 {count} ilan snapshot'a aktarıldı: {directory}")
+    return count
+
+
+def read_snapshot(
+    path: str | Path,
+) -> tuple[dict[str, Any], np.ndarray | None, np.ndarray | None, list[dict[str, Any]]]:
+    """Manifest, bellek eşlemeli (nicemlenmiş olabilir) matris, int8 ölçekleri ve kayıtları oku"""
+    directory = Path(path)
+    with open(directory / MANIFEST_FILE, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Desteklenmeyen snapshot sürümü: {manifest.get('format_version')}")
+    count = manifest["count"]
+    if count == 0:
+        return manifest, None, None, []
+    matrix = np.load(directory / EMBEDDINGS_FILE, mmap_mode="r")[:count]
+    scales = None
+    if manifest.get("quantization") == "int8":
+        scales = np.load(directory / SCALES_FILE, mmap_mode="r")[:count]
+    with open(directory / RECORDS_FILE, encoding="utf-8") as f:
+        records = [json.loads(line) for line, _ in zip(f, range(count), strict=False)]
+    if len(records) != count:
+        raise ValueError(f"Snapshot eksik: {len(records)}/{count} kayıt")
+    return manifest, matrix, scales, records
+
+
+def import_snapshot(store: Any, path: str | Path, chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE) -> int:
+    """Snapshot'ı parça parça store'a ekle (mevcut ID'ler atlanır); eklenen sayıyı döner"""
+    manifest, matrix, scales, records = read_snapshot(path)
+    added = 0
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start : start + chunk_size]
+        end = start + len(chunk)
+        vectors = dequantize(matrix[start:end], None if scales is None else scales[start:end])
+        added += store.add_records(
+            {
+                record["id"]: (vector, record.get("document", ""), record.get("metadata", {}))
+                for record, vector in zip(chunk, vectors, strict=True)
+            },
+            batch_size=chunk_size,
+        )
+    logger.info(f"📥 Snapshot'tan {added}/{manifest['count']} ilan yüklendi")
+    return added
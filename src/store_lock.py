@@ -0,0 +1,228 @@
+"""
+Süreçler Arası Yazma Koordinasyonu
+Aynı persist dizinini kullanan süreçler (ör. cron + elle çalıştırma) için:
+
+- ``WriterLock``: dizin başına tek yazıcı garantisi veren dosya kilidi
+  (POSIX'te ``fcntl.flock``, Windows'ta ``msvcrt.locking``). Okumalar kilit
+  almaz; yalnızca ekleme/silme/sıkıştırma kilit altında çalışır.
+- ``EmbeddingClaims``: SQLite üzerinde süreli "bu ilanı ben gömüyorum"
+  kayıtları; iki süreç aynı ilan için API'ye gitmez.
+"""
+
+# Standard Library
+import functools
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from contextlib import closing, nullcontext
+from pathlib import Path
+from typing import Any, TypeVar
+
+try:
+    # Standard Library
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+try:
+    # Standard Library
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+WRITER_LOCK_FILE = ".writer.lock"
+CLAIMS_FILE = "embedding_claims.sqlite3"
+DEFAULT_LOCK_TIMEOUT = 300.0
+DEFAULT_CLAIM_TTL = 3600.0
+LOCK_POLL_INTERVAL = 0.1
+# SQLite'ın sorgu başına değişken sınırının altında kalan parça boyutu
+CLAIM_CHUNK_SIZE = 500
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class WriterLock:
+    """Süreçler arası, iş parçacıkları için yeniden girilebilir yazma kilidi
+
+    Aynı dosya için tek bir örnek kullanılmalıdır (bkz. ``writer_lock``);
+    ``flock`` kilitleri dosya tanıtıcısı başınadır ve aynı süreçte ikinci bir
+    tanıtıcı kendini kilitlerdi.
+    """
+
+    def __init__(self, path: str | Path, timeout: float = DEFAULT_LOCK_TIMEOUT):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: int | None = None
+
+    def acquire(self) -> None:
+        """Kilidi al; ``timeout`` saniyede alınamazsa TimeoutError"""
+        deadline = time.monotonic() + self.timeout
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Yazma kilidi alınamadı: {self.path}")
+        if self._depth == 0:
+            try:
+                self._acquire_file(deadline)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def _acquire_file(self, deadline: float) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        waited = False
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                raise TimeoutError(f"Yazma kilidi {self.timeout:.0f} sn içinde alınamadı: {self.path}")
+            if not waited:
+                logger.info("⏳ Başka bir süreç koleksiyona yazıyor, kilit bekleniyor...")
+                waited = True
+            time.sleep(LOCK_POLL_INTERVAL)
+        # Tanılama için kilidi tutan süreç yazılır
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{socket.gethostname()}:{os.getpid()}\n".encode())
+        self._fd = fd
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            try:
+                _unlock(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> "WriterLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.release()
+
+
+_locks: dict[Path, WriterLock] = {}
+_locks_guard = threading.Lock()
+
+
+def writer_lock(persist_directory: str | Path, timeout: float = DEFAULT_LOCK_TIMEOUT) -> WriterLock:
+    """Persist dizininin (süreç içinde paylaşılan) yazma kilidi"""
+    path = (Path(persist_directory) / WRITER_LOCK_FILE).resolve()
+    with _locks_guard:
+        lock = _locks.get(path)
+        if lock is None:
+            lock = _locks[path] = WriterLock(path, timeout)
+        lock.timeout = timeout
+        return lock
+
+
+def store_writer_lock(persist_directory: str | Path | None, timeout: float = DEFAULT_LOCK_TIMEOUT) -> Any:
+    """Kalıcı store'lar için yazma kilidi; bellek içi store'larda etkisiz bağlam"""
+    return writer_lock(persist_directory, timeout) if persist_directory else nullcontext()
+
+
+def locked(method: F) -> F:  # noqa: UP047
+    """Store metodunu ``self.writer_lock`` altında çalıştır"""
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        with self.writer_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+class EmbeddingClaims:
+    """İlan ID'leri için süreli sahiplik kayıtları (SQLite)
+
+    ``claim`` yalnızca bu sürecin aldığı ID'leri döner; başka bir sürecin
+    geçerli kaydı olan ilanlar atlanır. Süreç çökerse kayıtlar ``ttl``
+    sonunda kendiliğinden geçersizleşir.
+    """
+
+    def __init__(self, path: str | Path, ttl: float = DEFAULT_CLAIM_TTL, owner: str | None = None):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS claims (job_id TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def claim(self, job_ids: Iterable[str]) -> set[str]:
+        """ID'leri sahiplenmeye çalış; bu sürece ait olanları döner"""
+        job_ids = list(dict.fromkeys(job_ids))
+        now = time.time()
+        owned: set[str] = set()
+        connection = self._connect()
+        try:
+            connection.isolation_level = None
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("DELETE FROM claims WHERE expires < ?", (now,))
+            for start in range(0, len(job_ids), CLAIM_CHUNK_SIZE):
+                chunk = job_ids[start : start + CLAIM_CHUNK_SIZE]
+                connection.executemany(
+                    "INSERT OR IGNORE INTO claims (job_id, owner, expires) VALUES (?, ?, ?)",
+                    [(job_id, self.owner, now + self.ttl) for job_id in chunk],
+                )
+                placeholders = ",".join("?" * len(chunk))
+                rows = connection.execute(
+                    f"SELECT job_id FROM claims WHERE owner = ? AND job_id IN ({placeholders})",
+                    [self.owner, *chunk],
+                )
+                owned.update(row[0] for row in rows)
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+        if len(owned) < len(job_ids):
+            logger.info(f"🔒 {len(job_ids) - len(owned)} ilan başka bir süreç tarafından işleniyor, atlandı")
+        return owned
+
+    def release(self, job_ids: Iterable[str] | None = None) -> None:
+        """Bu sürecin kayıtlarını (ya da yalnızca verilen ID'lerinkini) bırak"""
+        with closing(self._connect()) as connection, connection:
+            if job_ids is None:
+                connection.execute("DELETE FROM claims WHERE owner = ?", (self.owner,))
+                return
+            job_ids = list(job_ids)
+            for start in range(0, len(job_ids), CLAIM_CHUNK_SIZE):
+                chunk = job_ids[start : start + CLAIM_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                connection.execute(
+                    f"DELETE FROM claims WHERE owner = ? AND job_id IN ({placeholders})",
+                    [self.owner, *chunk],
+                )
@@ -0,0 +1,131 @@
+"""
+İlan Metni Normalizasyonu
+LinkedIn/Indeed açıklamalarındaki HTML/markdown kalıntılarını temizler,
+boşlukları sadeleştirir ve birçok ilanda tekrar eden kalıp paragrafları
+(fırsat eşitliği beyanları, şirket tanıtımları) çıkarır. Temiz metin hem
+puanlamaya hem embedding'e gider: API'ye daha az karakter gönderilir ve
+anahtar kelime taraması daha kısa metin üzerinde çalışır.
+"""
+
+# Standard Library
+import html
+import logging
+import re
+from collections.abc import Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Bir paragrafın kalıp sayılması için geçtiği en az (farklı başlıklı) ilan sayısı
+BOILERPLATE_MIN_POSTINGS = 3
+# Bundan kısa paragraflar ("Requirements:" gibi başlıklar) tekrar sayımına girmez
+BOILERPLATE_MIN_CHARS = 40
+
+BLOCK_TAG = re.compile(r"<\s*/?\s*(?:br|p|div|h[1-6]|ul|ol|tr|table|section)\b[^>]*>", re.IGNORECASE)
+LIST_ITEM_TAG = re.compile(r"<\s*li\b[^>]*>", re.IGNORECASE)
+TAG = re.compile(r"<[^>]+>")
+MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+MARKDOWN_ESCAPE = re.compile(r"\\([\\`*_{}\[\]()#+\-.!|>])")
+# Yalnızca kelimeyi saran çiftler açılır; `__init__` gibi adlar ve tek işaretler korunur
+MARKDOWN_EMPHASIS = re.compile(r"(?!__[a-z\d_]+__)(\*\*|`|(?<!\w)__)(?=\S)(.+?)(?<=\S)\1")
+MARKDOWN_HEADING = re.compile(r"^[ \t]*#{1,6}[ \t]*", re.MULTILINE)
+MARKDOWN_BULLET = re.compile(r"^[ \t]*[*•·][ \t]+", re.MULTILINE)
+INLINE_SPACE = re.compile(r"[ \t\f\v\u00a0\u200b]+")
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n+")
+
+# Tek bir ilanda görülse bile çıkarılan yasal kalıplar
+BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"equal (?:employment )?opportunity",
+        r"without regard to (?:race|color|religion|sex|gender|age)",
+        r"affirmative action",
+        r"reasonable accommodation",
+        r"fırsat eşitliği",
+        r"eşit fırsat",
+        r"kişisel verilerin korunması|kvkk",
+    )
+]
+
+
+def normalize_text(text: str) -> str:
+    """HTML/markdown kalıntılarını temizle ve boşlukları sadeleştir (paragraflar korunur)"""
+    text = LIST_ITEM_TAG.sub("\n- ", text)
+    text = BLOCK_TAG.sub("\n", text)
+    text = html.unescape(TAG.sub(" ", text))
+    text = MARKDOWN_LINK.sub(r"\1", text)
+    text = MARKDOWN_ESCAPE.sub(r"\1", text)
+    text = MARKDOWN_EMPHASIS.sub(r"\2", text)
+    text = MARKDOWN_HEADING.sub("", text)
+    text = MARKDOWN_BULLET.sub("- ", text)
+    lines = (
+        INLINE_SPACE.sub(" ", line).strip() for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    )
+    return PARAGRAPH_BREAK.sub("\n\n", "\n".join(lines)).strip()
+
+
+def split_paragraphs(text: str) -> list[str]:
+    return [paragraph for paragraph in PARAGRAPH_BREAK.split(text) if paragraph.strip()]
+
+
+def _paragraph_key(paragraph: str) -> str:
+    return re.sub(r"\W+", " ", paragraph.lower()).strip()
+
+
+def is_boilerplate(paragraph: str) -> bool:
+    return any(pattern.search(paragraph) for pattern in BOILERPLATE_PATTERNS)
+
+
+def remove_boilerplate(
+    texts: list[str],
+    titles: list[Any] | None = None,
+    min_postings: int = BOILERPLATE_MIN_POSTINGS,
+    min_chars: int = BOILERPLATE_MIN_CHARS,
+) -> tuple[list[str], int]:
+    """En az ``min_postings`` farklı başlıklı ilanda geçen ve yasal kalıp paragrafları çıkar
+
+    Başlık sayılır, ilan değil: aynı pozisyonun birkaç şehirdeki kopyalarının
+    ortak açıklaması kalıp sanılmaz. Çıkarılınca boş kalacak metinler olduğu
+    gibi bırakılır. Temizlenmiş metinleri ve çıkarılan paragraf sayısını döner.
+    """
+    titles = titles if titles is not None else list(range(len(texts)))
+    split = [split_paragraphs(text) for text in texts]
+    contexts: dict[str, set] = {}
+    for title, paragraphs in zip(titles, split, strict=True):
+        for paragraph in paragraphs:
+            if len(paragraph) >= min_chars:
+                contexts.setdefault(_paragraph_key(paragraph), set()).add(str(title).strip().lower())
+    repeated = {key for key, seen in contexts.items() if len(seen) >= min_postings}
+
+    cleaned, removed = [], 0
+    for text, paragraphs in zip(texts, split, strict=True):
+        kept = [p for p in paragraphs if _paragraph_key(p) not in repeated and not is_boilerplate(p)]
+        if not kept:
+            cleaned.append(text)
+            continue
+        removed += len(paragraphs) - len(kept)
+        cleaned.append("\n\n".join(kept))
+    return cleaned, removed
+
+
+def normalize_descriptions(descriptions: Iterable[Any], titles: Iterable[Any] | None = None) -> list[Any]:
+    """Açıklama listesini normalize et; metin olmayan değerler (NaN) olduğu gibi döner"""
+    values = list(descriptions)
+    title_list = list(titles) if titles is not None else list(range(len(values)))
+    positions = [i for i, value in enumerate(values) if isinstance(value, str)]
+    if not positions:
+        return values
+
+    before = sum(len(values[i]) for i in positions)
+    cleaned, removed = remove_boilerplate(
+        [normalize_text(values[i]) for i in positions], [title_list[i] for i in positions]
+    )
+    for i, text in zip(positions, cleaned, strict=True):
+        values[i] = text
+    after = sum(len(text) for text in cleaned)
+    saved = (1 - after / before) * 100 if before else 0.0
+    logger.info(
+        f"🧹 Metin normalizasyonu: {before} → {after} karakter (%{saved:.1f} azalma), "
+        f"{removed} kalıp paragraf çıkarıldı"
+    )
+    return values
@@ -4,29 +4,105 @@ ChromaDB kullanarak iş ilanı vektörlerini saklar ve arama yapar.
 """
 
 # Standard Library
-import hashlib
-import json
+import inspect
 import logging
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 # Third Party
 import chromadb
+import numpy as np
 import pandas as pd
-import yaml
+from chromadb.errors import NotFoundError
+
+from .config import load_config
+from .flat_index import FlatVectorStore
+from .job_schema import POSTED_TS_FIELD, job_document, job_metadata, stable_job_id, to_timestamp
+from .search_cache import SearchCache
+from .sharded_store import DEFAULT_SEARCH_WORKERS, ShardedVectorStore
+from .snapshot import DEFAULT_IMPORT_CHUNK_SIZE, export_snapshot, import_snapshot
+from .store_lock import DEFAULT_LOCK_TIMEOUT, locked, store_writer_lock
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_UPSERT_BATCH_SIZE = 100
+SEARCH_CACHE_DIR = "search_cache"
+
+# compact() sırasında kayıtların kopyalandığı geçici koleksiyonun adı eki
+COMPACT_SUFFIX = "__compact"
+
+# vector_store_settings.hnsw anahtarı -> ChromaDB koleksiyon yapılandırmasındaki karşılığı.
+# M ve construction_ef indeks kurulurken sabitlenir; search_ef sonradan değiştirilebilir.
+HNSW_PARAMS = {"M": "max_neighbors", "construction_ef": "ef_construction", "search_ef": "ef_search"}
+
+
+def hnsw_metadata(hnsw: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Koleksiyon oluşturma metadata'sı (``hnsw:space`` + ayarlanan ``hnsw:*`` parametreleri)"""
+    hnsw = {key: value for key, value in (hnsw or {}).items() if value is not None}
+    unknown = set(hnsw) - set(HNSW_PARAMS)
+    if unknown:
+        raise ValueError(
+            f"Bilinmeyen HNSW parametresi: {', '.join(sorted(unknown))} (seçenekler: {', '.join(HNSW_PARAMS)})"
+        )
+    return {"hnsw:space": "cosine", **{f"hnsw:{key}": int(value) for key, value in hnsw.items()}}
+
+
+class NamedCollection:
+    """ChromaDB koleksiyonunu adıyla izleyen ince sarmalayıcı
+
+    ``compact`` ve ``clear_collection`` koleksiyonu silip aynı adla yeniden
+    kurar; başka bir handle'ın (ör. başka bir süreç ya da arka plandaki
+    yeniden indeksleme) tuttuğu koleksiyon ID'si geçersizleşir. Bir çağrı
+    ``NotFoundError`` verirse koleksiyon adıyla yeniden çözülür ve çağrı bir
+    kez tekrarlanır.
+    """
+
+    def __init__(self, client: Any, collection: Any):
+        self._client = client
+        self._collection = collection
+        self._name = collection.name
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._collection, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return getattr(self._collection, name)(*args, **kwargs)
+            except NotFoundError:
+                logger.info(f"🔄 '{self._name}' koleksiyonu yeniden kurulmuş, adıyla yeniden çözülüyor")
+                self._collection = self._client.get_collection(self._name)
+                return getattr(self._collection, name)(*args, **kwargs)
+
+        return call
+
+
 class VectorStore:
     def __init__(
         self,
         persist_directory: str | None = None,
         collection_name: str | None = None,
+        upsert_batch_size: int = DEFAULT_UPSERT_BATCH_SIZE,
+        upsert_workers: int = 1,
+        search_cache_size: int = 0,
+        hnsw: dict[str, Any] | None = None,
+        lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
     ):
-        """ChromaDB istemcisini başlat"""
+        """ChromaDB istemcisini başlat (``search_cache_size`` > 0 ise arama sonuçları önbelleğe alınır)
+
+        ``hnsw``: ``{"M", "construction_ef", "search_ef"}`` (verilmeyenler ChromaDB varsayılanıdır).
+        Kalıcı dizine yazan işlemler süreçler arası ``writer_lock`` altında çalışır;
+        okumalar kilit almaz.
+        """
         try:
+            self.hnsw_metadata = hnsw_metadata(hnsw)
+            self.persist_directory = Path(persist_directory) if persist_directory else None
+            self.writer_lock = store_writer_lock(persist_directory, lock_timeout)
             if persist_directory:
                 persist_path = Path(persist_directory)
                 persist_path.mkdir(parents=True, exist_ok=True)
@@ -37,13 +113,23 @@ class VectorStore:
                 logger.info("✅ ChromaDB geçici client başlatıldı")
             if collection_name is None:
                 try:
-                    with open("config.yaml", encoding="utf-8") as f:
-                        cfg = yaml.safe_load(f)
-                    collection_name = cfg.get("vector_store_settings", {}).get("collection_name")
+                    collection_name = load_config().vector_store_settings.get("collection_name")
                 except Exception as cfg_err:
                     logger.warning(f"Config load failed: {cfg_err}; using default collection name")
             self.collection_name = collection_name or "job_embeddings"
             self.collection: Any | None = None
+            self.upsert_batch_size = max(1, int(upsert_batch_size))
+            self.upsert_workers = max(1, int(upsert_workers))
+            self.last_rejected_ids: list[str] = []
+            self.last_pruned_ids: list[str] = []
+            self.search_cache: SearchCache | None = None
+            if search_cache_size > 0:
+                cache_path = (
+                    self.persist_directory / SEARCH_CACHE_DIR / f"{self.collection_name}.json"
+                    if self.persist_directory
+                    else None
+                )
+                self.search_cache = SearchCache(max_entries=search_cache_size, path=cache_path)
             logger.info("VectorStore başarıyla başlatıldı")
 
         except Exception as e:
@@ -53,25 +139,24 @@ class VectorStore:
     @staticmethod
     def _stable_job_id(job_dict: dict[str, Any]) -> str:
         """Create a deterministic job ID using URL if available."""
-        url = job_dict.get("url") or job_dict.get("job_url")
-        if url:
-            digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
-        else:
-            canonical = json.dumps(job_dict, sort_keys=True, ensure_ascii=False)
-            digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
-        return f"job_{digest}"
+        return stable_job_id(job_dict)
 
     def create_collection(self) -> bool:
         """Koleksiyon oluştur veya mevcut olanı getir"""
         try:
+            self._finish_interrupted_compaction()
             # get_or_create_collection kullanarak hem yeni oluşturma hem de mevcut getirme
-            self.collection = self.client.get_or_create_collection(
-                name=self.collection_name,
-                metadata={"hnsw:space": "cosine"},  # Cosine similarity kullan
+            self.collection = NamedCollection(
+                self.client,
+                self.client.get_or_create_collection(
+                    name=self.collection_name,
+                    metadata=self.hnsw_metadata,  # Cosine similarity + HNSW ayarları
+                ),
             )
 
             # Mevcut öğe sayısını kontrol et
             if self.collection is not None:
+                self._sync_hnsw_settings()
                 existing_count = self.collection.count()
                 if existing_count > 0:
                     logger.info(f"✅ Mevcut koleksiyon yüklendi ({existing_count} öğe)")
@@ -83,11 +168,57 @@ class VectorStore:
             logger.error(f"❌ Koleksiyon oluşturma/yükleme hatası: {str(e)}", exc_info=True)
             return False
 
+    def _hnsw_configuration(self) -> dict[str, Any]:
+        configuration = getattr(self.collection, "configuration", None) or {}
+        return configuration.get("hnsw") or {}
+
+    def _sync_hnsw_settings(self) -> None:
+        """Mevcut koleksiyonu config'teki HNSW ayarlarıyla karşılaştır
+
+        ``search_ef`` yerinde güncellenir; M / construction_ef farkı yalnızca
+        uyarılır, çünkü bunlar koleksiyon yeniden oluşturulunca uygulanır.
+        """
+        current = self._hnsw_configuration()
+        if not current:
+            return
+        search_ef = self.hnsw_metadata.get("hnsw:search_ef")
+        if search_ef is not None and current.get("ef_search") != search_ef:
+            self.set_search_ef(search_ef)
+        for key in ("M", "construction_ef"):
+            wanted = self.hnsw_metadata.get(f"hnsw:{key}")
+            if wanted is not None and current.get(HNSW_PARAMS[key]) != wanted:
+                logger.warning(
+                    f"⚠️ hnsw:{key}={wanted} yalnızca yeni koleksiyonlarda geçerli "
+                    f"(mevcut: {current.get(HNSW_PARAMS[key])}); clear_collection ya da snapshot ile yeniden oluşturun"
+                )
+
+    @locked
+    def set_search_ef(self, search_ef: int) -> bool:
+        """Sorgu zamanı aday listesi boyutunu (``hnsw:search_ef``) kalıcı olarak değiştir
+
+        Yüksek değer = daha iyi recall, daha yavaş arama. ChromaDB değeri indeks
+        belleğe yüklenirken okur; bu yüzden ilk aramadan önce çağrılmalıdır
+        (``create_collection`` bunu config'e göre kendisi yapar).
+        """
+        collection = self.get_collection()
+        if not collection:
+            return False
+        try:
+            collection.modify(configuration={"hnsw": {"ef_search": int(search_ef)}})
+        except Exception as e:
+            logger.warning(f"⚠️ hnsw:search_ef güncellenemedi: {e}")
+            return False
+        self.hnsw_metadata["hnsw:search_ef"] = int(search_ef)
+        # Aynı sorgu farklı sonuç döndürebilir; önbellekteki sonuçlar geçersizleşir
+        self._bump_version()
+        logger.info(f"🔧 hnsw:search_ef = {search_ef}")
+        return True
+
     def get_collection(self):
         """Mevcut koleksiyonu getir"""
         if not self.collection:
             try:
-                self.collection = self.client.get_collection(self.collection_name)
+                self.collection = NamedCollection(self.client, self.client.get_collection(self.collection_name))
                 logger.info("✅ Mevcut koleksiyon yüklendi")
             except Exception as e:
                 logger.info("⚠️ Koleksiyon bulunamadı, yeni oluşturuluyor...")
@@ -109,50 +240,145 @@ class VectorStore:
         except Exception:
             return False
 
+    def existing_ids(self, job_ids: list[str]) -> set[str]:
+        """Verilen ID'lerden koleksiyonda bulunanları parça parça sorgula"""
+        collection = self.get_collection()
+        if not collection or not job_ids:
+            return set()
+
+        found: set[str] = set()
+        for start in range(0, len(job_ids), self.upsert_batch_size):
+            chunk = job_ids[start : start + self.upsert_batch_size]
+            try:
+                found.update(collection.get(ids=chunk, include=[]).get("ids", []))
+            except Exception as e:
+                logger.warning(f"⚠️ Mevcut ilan kontrolü başarısız: {e}")
+        return found
+
     def add_jobs(self, jobs_df: pd.DataFrame, embeddings: list[list[float] | None]) -> bool:
         """
         İş ilanlarını ve embeddings'lerini koleksiyona ekle - Tekrar eklemeyi önler
+
+        Kayıtlar ``upsert_batch_size`` büyüklüğünde parçalar halinde ``upsert``
+        edilir; hata veren parça ikiye bölünerek yalnızca sorunlu satırlar
+        atlanır ve ``last_rejected_ids`` içinde raporlanır.
         """
         collection = self.get_collection()
         if not collection:
             return False
 
         try:
-            valid_jobs = []
-            valid_embeddings = []
-            valid_ids = []
+            batch: dict[str, tuple[list[float], str, dict[str, Any]]] = {}
 
             # Geçerli veri ve embedding'leri filtrele
             for i, (_, job_row) in enumerate(jobs_df.iterrows()):
                 if i < len(embeddings) and embeddings[i] is not None:
                     job_dict = job_row.to_dict()
-                    if self.job_exists(job_dict):
-                        continue
-
                     job_id = self._stable_job_id(job_dict)
-                    valid_jobs.append(job_dict)
-                    valid_embeddings.append(embeddings[i])
-                    valid_ids.append(job_id)
-
-            if not valid_jobs:
-                logger.info("ℹ️ Eklenecek yeni iş ilanı bulunamadı (tümü zaten mevcut)")
-                return True
+                    batch.setdefault(job_id, (embeddings[i], job_document(job_dict), job_metadata(job_dict)))
 
-            # Batch olarak ekle
-            collection.add(
-                embeddings=valid_embeddings,
-                documents=[f"{job.get('title', '')} {job.get('description', '')}" for job in valid_jobs],
-                metadatas=valid_jobs,
-                ids=valid_ids,
-            )
-
-            logger.info(f"✅ {len(valid_jobs)} yeni iş ilanı başarıyla eklendi")
+            self.add_records(batch)
             return True
 
         except Exception as e:
             logger.error(f"❌ İş ilanları ekleme hatası: {str(e)}", exc_info=True)
             return False
 
+    @locked
+    def add_records(
+        self, records: dict[str, tuple[list[float], str, dict[str, Any]]], batch_size: int | None = None
+    ) -> int:
+        """Hazır ``{id: (embedding, document, metadata)}`` kayıtlarını parça parça ekle
+
+        Koleksiyonda bulunan ID'ler atlanır; eklenen kayıt sayısını döner.
+        Yeniden indeksleme ve snapshot yükleme de bu yolu kullanır.
+        """
+        collection = self.get_collection()
+        batch_size = max(1, batch_size or self.upsert_batch_size)
+        existing = self.existing_ids(list(records))
+        new_ids = [job_id for job_id in records if job_id not in existing]
+        self.last_rejected_ids = []
+
+        if not new_ids:
+            logger.info("ℹ️ Eklenecek yeni iş ilanı bulunamadı (tümü zaten mevcut)")
+            return 0
+
+        chunks = [new_ids[start : start + batch_size] for start in range(0, len(new_ids), batch_size)]
+        if self.upsert_workers > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self.upsert_workers) as executor:
+                outcomes = list(executor.map(lambda ids: self._upsert_chunk(collection, ids, records), chunks))
+        else:
+            outcomes = [self._upsert_chunk(collection, ids, records) for ids in chunks]
+
+        added = sum(count for count, _ in outcomes)
+        self.last_rejected_ids = [job_id for _, rejected in outcomes for job_id in rejected]
+        if self.last_rejected_ids:
+            logger.warning(f"⚠️ {len(self.last_rejected_ids)} iş ilanı reddedildi: {self.last_rejected_ids}")
+
+        logger.info(f"✅ {added} yeni iş ilanı başarıyla eklendi ({len(chunks)} parça)")
+        if added:
+            self._bump_version()
+        return added
+
+    def iter_jobs(self, page_size: int | None = None, include_embeddings: bool = False) -> Iterator[dict[str, Any]]:
+        """Koleksiyondaki ilanları ``{"ids", "matches", "metadatas"}`` sayfaları halinde gez
+
+        ``include_embeddings`` ile her sayfaya ``embeddings`` (float32 matris) eklenir.
+        """
+        collection = self.get_collection()
+        if not collection:
+            return
+        page = max(1, page_size or self.upsert_batch_size)
+        include = ["documents", "metadatas"] + (["embeddings"] if include_embeddings else [])
+        offset = 0
+        while True:
+            items = collection.get(limit=page, offset=offset, include=include)
+            ids = items.get("ids", [])
+            if not ids:
+                return
+            jobs = {
+                "ids": ids,
+                "matches": [document or "" for document in items["documents"]],
+                "metadatas": [metadata or {} for metadata in items["metadatas"]],
+            }
+            if include_embeddings:
+                jobs["embeddings"] = np.asarray(items["embeddings"], dtype=np.float32)
+            yield jobs
+            offset += len(ids)
+
+    def export_snapshot(self, path: str | Path, quantization: str = "none") -> int:
+        """ID'leri, embedding matrisini (isteğe bağlı nicemlenmiş) ve metadata'yı snapshot dizinine yaz"""
+        return export_snapshot(self, path, quantization=quantization)
+
+    def import_snapshot(self, path: str | Path, chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE) -> int:
+        """Snapshot'ı API çağrısı yapmadan parça parça koleksiyona yükle"""
+        return import_snapshot(self, path, chunk_size=chunk_size)
+
+    def _upsert_chunk(
+        self,
+        collection: Any,
+        ids: list[str],
+        batch: dict[str, tuple[list[float], str, dict[str, Any]]],
+    ) -> tuple[int, list[str]]:
+        """Bir parçayı upsert et; hata olursa ikiye bölerek sorunlu satırları ayıkla"""
+        try:
+            collection.upsert(
+                ids=ids,
+                embeddings=[batch[job_id][0] for job_id in ids],
+                documents=[batch[job_id][1] for job_id in ids],
+                metadatas=[batch[job_id][2] for job_id in ids],
+            )
+            return len(ids), []
+        except Exception as e:
+            if len(ids) == 1:
+                logger.warning(f"⚠️ İlan eklenemedi ({ids[0]}): {e}")
+                return 0, ids
+            logger.debug(f"Parça ({len(ids)} ilan) başarısız, ikiye bölünüyor: {e}")
+            middle = len(ids) // 2
+            left_added, left_rejected = self._upsert_chunk(collection, ids[:middle], batch)
+            right_added, right_rejected = self._upsert_chunk(collection, ids[middle:], batch)
+            return left_added + right_added, left_rejected + right_rejected
+
     def search_jobs(
         self,
         query_embedding: list[float],
@@ -160,48 +386,141 @@ class VectorStore:
         filter_metadata: dict[str, Any] | None = None,
     ) -> dict[str, list]:
         """Vektör benzerliği ile iş ilanı ara"""
-        collection = self.get_collection()
-        if not collection:
-            return {"matches": [], "distances": [], "metadatas": []}
+        return self.search_jobs_batch([query_embedding], n_results=n_results, filter_metadata=filter_metadata)[0]
 
-        try:
-            where_clause = filter_metadata if filter_metadata else {}
+    def search_jobs_above(
+        self,
+        query_embedding: list[float],
+        min_similarity: float,
+        filter_metadata: dict[str, Any] | None = None,
+        page_size: int = 50,
+    ) -> dict[str, list]:
+        """Benzerliği ``min_similarity`` (yüzde) ve üzerindeki tüm ilanları getir"""
+        return self.search_jobs_batch(
+            [query_embedding], n_results=page_size, filter_metadata=filter_metadata, min_similarity=min_similarity
+        )[0]
 
-            results = collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results,
-                where=where_clause if where_clause else None,
-            )
+    def search_jobs_batch(
+        self,
+        query_matrix: Any,
+        n_results: int = 10,
+        filter_metadata: dict[str, Any] | None = None,
+        min_similarity: float | None = None,
+    ) -> list[dict[str, list]]:
+        """Birden fazla sorgu vektörünü tek ``collection.query`` çağrısıyla ara
+
+        ``min_similarity`` (yüzde) verilirse her sorgu için eşik üzerindeki tüm
+        ilanlar döner. ChromaDB sorgusu offset desteklemediği için sayfa boyutu
+        (``n_results``) her turda ikiye katlanır; her sorgunun son sonucu
+        eşiğin altına düştüğünde veya koleksiyon tükendiğinde durulur.
+        """
+        queries = [[float(value) for value in query] for query in query_matrix]
+        empty = [{"ids": [], "matches": [], "distances": [], "metadatas": []} for _ in queries]
+        if not self.get_collection() or not queries:
+            return empty
 
-            return self._extract_search_results(results)
+        try:
+            if self.search_cache is None:
+                return self._query_batch(queries, n_results, filter_metadata, min_similarity)
+
+            # Başka bir süreç koleksiyonu değiştirdiyse eski sonuçlar düşer
+            self.search_cache.sync()
+            threshold_mode = min_similarity is not None
+            keys = [self.search_cache.make_key(query, n_results, filter_metadata, threshold_mode) for query in queries]
+            results = [self.search_cache.get(key, min_similarity) for key in keys]
+            missing = [i for i, result in enumerate(results) if result is None]
+            if missing:
+                fetched = self._query_batch([queries[i] for i in missing], n_results, filter_metadata, min_similarity)
+                for i, result in zip(missing, fetched, strict=True):
+                    results[i] = result
+                    self.search_cache.set(keys[i], result, min_similarity)
+            else:
+                logger.info(f"⚡ {len(queries)} sorgu arama önbelleğinden yanıtlandı")
+            if threshold_mode:
+                # Daha düşük eşikle alınmış önbellek kaydı yeni eşikte kesilir
+                return [_results_above(result, min_similarity) for result in results]
+            return results
 
         except Exception as e:
             logger.error(f"❌ Vektör arama hatası: {str(e)}", exc_info=True)
-            return {"matches": [], "distances": [], "metadatas": []}
+            return empty
 
-    def _extract_search_results(self, results: dict | None) -> dict[str, list]:
-        """Search sonuçlarını güvenli şekilde çıkar"""
+    def _query_batch(
+        self,
+        queries: list[list[float]],
+        n_results: int,
+        filter_metadata: dict[str, Any] | None,
+        min_similarity: float | None,
+    ) -> list[dict[str, list]]:
+        """``collection.query`` ile toplu arama (eşik modunda sayfa boyutunu büyüterek)"""
+        collection = self.get_collection()
+        total = collection.count()
+        if total == 0:
+            logger.info("ℹ️ Arama kriterlerine uygun iş ilanı bulunamadı")
+            return [{"ids": [], "matches": [], "distances": [], "metadatas": []} for _ in queries]
+        page = min(max(1, n_results), total) if min_similarity is not None else n_results
+        while True:
+            results = collection.query(query_embeddings=queries, n_results=page, where=filter_metadata or None)
+            per_query = [self._extract_search_results(results, i) for i in range(len(queries))]
+            if min_similarity is None:
+                return per_query
+            if page >= total or all(
+                len(result["distances"]) < page or similarity_from_distance(result["distances"][-1]) < min_similarity
+                for result in per_query
+            ):
+                return [_results_above(result, min_similarity) for result in per_query]
+            page = min(page * 2, total)
+
+    def _extract_search_results(self, results: dict | None, index: int = 0) -> dict[str, list]:
+        """Search sonuçlarını (``index``. sorgu için) güvenli şekilde çıkar"""
         if not results:
-            return {"matches": [], "distances": [], "metadatas": []}
+            return {"ids": [], "matches": [], "distances": [], "metadatas": []}
 
+        ids = results.get("ids")
         metadatas = results.get("metadatas")
         documents = results.get("documents")
         distances = results.get("distances")
 
-        if metadatas and isinstance(metadatas, list) and len(metadatas) > 0 and metadatas[0] is not None:
-            metadatas_list = metadatas[0] if metadatas[0] else []
-            documents_list = documents[0] if documents and documents[0] else []
-            distances_list = distances[0] if distances and distances[0] else []
+        if metadatas and isinstance(metadatas, list) and len(metadatas) > index and metadatas[index] is not None:
+            metadatas_list = metadatas[index] if metadatas[index] else []
+            documents_list = documents[index] if documents and documents[index] else []
+            distances_list = distances[index] if distances and distances[index] else []
+            ids_list = ids[index] if ids and ids[index] else []
 
             logger.info(f"🔍 {len(metadatas_list)} iş ilanı bulundu")
             return {
+                "ids": ids_list,
                 "matches": documents_list,
                 "distances": distances_list,
                 "metadatas": metadatas_list,
             }
         else:
             logger.info("ℹ️ Arama kriterlerine uygun iş ilanı bulunamadı")
-            return {"matches": [], "distances": [], "metadatas": []}
+            return {"ids": [], "matches": [], "distances": [], "metadatas": []}
+
+    def get_jobs(
+        self,
+        job_ids: list[str],
+        filter_metadata: dict[str, Any] | None = None,
+        include_embeddings: bool = False,
+    ) -> dict[str, list]:
+        """ID'leri verilen ilanları (varsa filtreye uyanları) istenen sırayla getir"""
+        found: dict[str, tuple[str, dict[str, Any], Any]] = {}
+        collection = self.get_collection()
+        include = ["documents", "metadatas"] + (["embeddings"] if include_embeddings else [])
+        if collection and job_ids:
+            for start in range(0, len(job_ids), self.upsert_batch_size):
+                chunk = job_ids[start : start + self.upsert_batch_size]
+                try:
+                    items = collection.get(ids=chunk, where=filter_metadata or None, include=include)
+                except Exception as e:
+                    logger.warning(f"⚠️ İlanlar getirilemedi: {e}")
+                    continue
+                embeddings = items.get("embeddings")
+                for i, job_id in enumerate(items.get("ids", [])):
+                    embedding = list(embeddings[i]) if include_embeddings and embeddings is not None else None
+                    found[job_id] = (items["documents"][i] or "", items["metadatas"][i] or {}, embedding)
+        return _ordered_jobs(job_ids, found, include_embeddings)
 
     def get_stats(self) -> dict[str, Any]:
         """Koleksiyon istatistiklerini getir"""
@@ -211,23 +530,140 @@ class VectorStore:
 
         try:
             total_count = collection.count()
-            return {
+            stats = {
                 "total_jobs": total_count,
                 "collection_name": self.collection_name,
+                "hnsw": {key: self._hnsw_configuration().get(name) for key, name in HNSW_PARAMS.items()},
                 "last_updated": datetime.now().isoformat(),
             }
+            if self.search_cache is not None:
+                stats["search_cache"] = self.search_cache.stats()
+            return stats
         except Exception as e:
             logger.error(f"❌ İstatistik alma hatası: {str(e)}", exc_info=True)
             return {"total_jobs": 0, "error": str(e)}
 
+    @locked
+    def prune(self, older_than: datetime, field: str = POSTED_TS_FIELD, page_size: int | None = None) -> int:
+        """``field`` tarihi ``older_than`` öncesinde kalan ilanları sayfa sayfa sil
+
+        Tarih alanı olmayan (eski sürümle eklenmiş) ilanlara dokunulmaz.
+        Koleksiyon sıkıştırılmaz; ChromaDB silinen kayıtların yerini yeniden
+        kullanır (tam yeniden kurulum için :meth:`compact`). Silinen ilan
+        sayısını döner; ID'ler ``last_pruned_ids`` içinde raporlanır.
+        """
+        self.last_pruned_ids = []
+        collection = self.get_collection()
+        cutoff = to_timestamp(older_than)
+        if not collection or cutoff is None:
+            return 0
+
+        page = max(1, page_size or self.upsert_batch_size)
+        where = {field: {"$lt": cutoff}}
+        deleted = 0
+        try:
+            while True:
+                ids = collection.get(where=where, limit=page, include=[]).get("ids", [])
+                if not ids:
+                    break
+                collection.delete(ids=ids)
+                self.last_pruned_ids += ids
+                deleted += len(ids)
+        except Exception as e:
+            logger.error(f"❌ Eski ilanlar silinirken hata: {str(e)}", exc_info=True)
+
+        if deleted:
+            self._bump_version()
+            logger.info(f"🧹 {deleted} eski iş ilanı silindi ({field} < {older_than:%Y-%m-%d})")
+        return deleted
+
+    @locked
+    def compact(self) -> bool:
+        """Koleksiyonu yeniden kurarak silinen kayıtların yerini geri kazan (bakım komutu: ``--compact``)
+
+        Tüm kayıtları yeniden yazdığından her çalıştırmada değil, isteğe bağlı
+        çalıştırılır. ChromaDB silinen vektörleri HNSW indeksinde yalnızca
+        işaretler; açık istemcinin altında SQLite dosyasına VACUUM çalıştırmak
+        da güvenli değildir. Bunun yerine kayıtlar embedding'leriyle geçici bir
+        koleksiyona kopyalanır, eskisi silinir ve geçici koleksiyon eski adı
+        alır. Kesilen bir sıkıştırma ``create_collection`` içinde tamamlanır.
+        """
+        collection = self.get_collection()
+        if not collection:
+            return False
+        temp_name = f"{self.collection_name}{COMPACT_SUFFIX}"
+        try:
+            self._drop_if_exists(temp_name)
+            temp = self.client.create_collection(name=temp_name, metadata=collection.metadata or self.hnsw_metadata)
+            for page in self.iter_jobs(include_embeddings=True):
+                temp.add(
+                    ids=page["ids"],
+                    embeddings=page["embeddings"],
+                    documents=page["matches"],
+                    metadatas=page["metadatas"],
+                )
+            if temp.count() != collection.count():
+                raise RuntimeError(f"kopya eksik ({temp.count()} / {collection.count()})")
+            self.client.delete_collection(self.collection_name)
+            temp.modify(name=self.collection_name)
+        except Exception as e:
+            logger.warning(f"⚠️ Koleksiyon sıkıştırılamadı: {e}")
+            # Asıl koleksiyon silindiyse geçici kopya, kurtarma için yerinde bırakılır
+            if self.collection_name in self._collection_names():
+                self._drop_if_exists(temp_name)
+            return False
+        finally:
+            self.collection = None
+        self.get_collection()
+        self._bump_version()
+        logger.info(f"🗜️ Koleksiyon yeniden kurularak sıkıştırıldı ({self.collection.count()} ilan)")
+        return True
+
+    def _collection_names(self) -> set[str]:
+        return {collection.name for collection in self.client.list_collections()}
+
+    def _drop_if_exists(self, name: str) -> None:
+        if name in self._collection_names():
+            self.client.delete_collection(name)
+
+    def _finish_interrupted_compaction(self) -> None:
+        """Eski koleksiyon silinip geçici olan yeniden adlandırılamadan kesildiyse tamamla"""
+        names = self._collection_names()
+        temp_name = f"{self.collection_name}{COMPACT_SUFFIX}"
+        if temp_name not in names:
+            return
+        with self.writer_lock:
+            if self.collection_name in names:
+                self.client.delete_collection(temp_name)
+            else:
+                self.client.get_collection(temp_name).modify(name=self.collection_name)
+                logger.info("🗜️ Yarıda kalan sıkıştırma tamamlandı")
+
+    @locked
+    def drop_collection(self) -> bool:
+        """Koleksiyonu ve arama önbelleği dosyasını tamamen sil (yeniden oluşturmadan)"""
+        try:
+            self.client.delete_collection(self.collection_name)
+        except Exception as e:
+            logger.warning(f"⚠️ Koleksiyon silinemedi: {e}")
+            return False
+        self.collection = None
+        if self.search_cache is not None:
+            self.search_cache.bump()
+            if self.search_cache.path is not None:
+                self.search_cache.path.unlink(missing_ok=True)
+        return True
+
+    @locked
     def clear_collection(self) -> bool:
-        """Koleksiyonu temizle (dikkatli kullan!)"""
+        """Koleksiyonu silip boş olarak yeniden oluştur (dikkatli kullan!)"""
         try:
-            if self.collection:
-                # Tüm öğeleri sil
-                all_items = self.collection.get()
-                if all_items.get("ids"):
-                    self.collection.delete(ids=all_items["ids"])
+            if self.get_collection():
+                # ID'leri belleğe almak yerine koleksiyonun tamamı düşürülür
+                self.client.delete_collection(self.collection_name)
+                self.collection = None
+                self.create_collection()
+                self._bump_version()
                 logger.info("🗑️ Koleksiyon başarıyla temizlendi")
                 return True
             else:
@@ -237,14 +673,100 @@ class VectorStore:
             logger.error(f"❌ Koleksiyon temizleme hatası: {str(e)}", exc_info=True)
             return False
 
+    def _bump_version(self) -> None:
+        """Koleksiyon değişti: arama önbelleğini geçersiz kıl"""
+        if self.search_cache is not None:
+            self.search_cache.bump()
+
+    def save_search_cache(self) -> bool:
+        """Arama önbelleğini diske yaz (önbellek kapalıysa False)"""
+        return self.search_cache.save() if self.search_cache is not None else False
+
+
+def similarity_from_distance(distance: float) -> float:
+    """Cosine mesafesini yüzde benzerlik puanına çevir"""
+    return (1 - distance) * 100
+
+
+def _ordered_jobs(
+    job_ids: list[str], found: dict[str, tuple[str, dict[str, Any], Any]], include_embeddings: bool
+) -> dict[str, list]:
+    """get_jobs sonucunu istenen ID sırasına göre diz (bulunamayanlar atlanır)"""
+    ordered = [job_id for job_id in job_ids if job_id in found]
+    jobs = {
+        "ids": ordered,
+        "matches": [found[job_id][0] for job_id in ordered],
+        "metadatas": [found[job_id][1] for job_id in ordered],
+    }
+    if include_embeddings:
+        jobs["embeddings"] = [found[job_id][2] for job_id in ordered]
+    return jobs
+
+
+def _results_above(results: dict[str, list], min_similarity: float) -> dict[str, list]:
+    """Mesafeye göre sıralı sonuçları benzerlik eşiğinde kes"""
+    keep = sum(1 for distance in results["distances"] if similarity_from_distance(distance) >= min_similarity)
+    return {key: values[:keep] for key, values in results.items()}
+
+
+# Desteklenen depolama backend'leri (vector_store_settings.backend)
+BACKENDS = {"chroma": VectorStore, "numpy": FlatVectorStore}
+
+JobStore = VectorStore | FlatVectorStore | ShardedVectorStore
+
+
+def _init_settings(store_cls: type) -> set[str]:
+    """Backend kurucusunun kabul ettiği ayar adları (dizin ve koleksiyon adı hariç)"""
+    parameters = inspect.signature(store_cls.__init__).parameters
+    return set(parameters) - {"self", "persist_directory", "collection_name"}
+
+
+def backend_settings(store_cls: type, settings: dict[str, Any]) -> dict[str, Any]:
+    """Ayarlardan yalnızca ``store_cls``'in desteklediklerini seç
+
+    Başka bir backend'e ait ayarlar (ör. numpy için ``hnsw``) sessizce
+    atlanır; hiçbir backend'in tanımadığı anahtar yazım hatası sayılır.
+    """
+    known = set().union(*(_init_settings(cls) for cls in BACKENDS.values()))
+    unknown = set(settings) - known
+    if unknown:
+        raise ValueError(f"Bilinmeyen vector store ayarı: {', '.join(sorted(unknown))}")
+    supported = _init_settings(store_cls)
+    return {key: value for key, value in settings.items() if key in supported}
+
 
 # Yardımcı fonksiyonlar
 def create_vector_store(
-    persist_directory: str | None = None, collection_name: str | None = None
-) -> VectorStore | None:
-    """VectorStore örneği oluştur"""
+    persist_directory: str | None = None,
+    collection_name: str | None = None,
+    backend: str = "chroma",
+    shard_period: str | None = None,
+    shard_search_workers: int = DEFAULT_SEARCH_WORKERS,
+    **settings: Any,
+) -> JobStore | None:
+    """Seçilen backend için VectorStore örneği oluştur
+
+    ``shard_period`` ("week" / "month") verilirse ilanlar bu backend'in
+    zaman dilimli alt koleksiyonlarına bölünür. Backend'e yalnızca
+    desteklediği ayarlar geçirilir (bkz. :func:`backend_settings`).
+    """
     try:
-        return VectorStore(persist_directory=persist_directory, collection_name=collection_name)
+        store_cls = BACKENDS[backend]
+    except KeyError:
+        logger.error(f"Bilinmeyen vector store backend'i: {backend} (seçenekler: {', '.join(BACKENDS)})")
+        return None
+    try:
+        settings = backend_settings(store_cls, settings)
+        if shard_period:
+            return ShardedVectorStore(
+                persist_directory=persist_directory,
+                collection_name=collection_name,
+                store_cls=store_cls,
+                period=shard_period,
+                search_workers=shard_search_workers,
+                **settings,
+            )
+        return store_cls(persist_directory=persist_directory, collection_name=collection_name, **settings)
     except Exception as e:
         logger.error(f"VectorStore oluşturma hatası: {str(e)}")
         return None
@@ -0,0 +1,45 @@
+# Third Party
+import pytest
+import yaml
+
+# Local
+from src.config import ConfigError, load_config, parse_config
+from src.intelligent_scoring import IntelligentScoringSystem, compile_scoring_plan
+
+
+def load_raw():
+    with open("config.yaml", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def test_config_loaded_once_per_process():
+    first = load_config("config.yaml")
+    second = load_config("config.yaml")
+    assert first is second
+    assert first.job_search.min_similarity_threshold == 60
+    assert "Data_Analyst" in first.personas
+    assert first["paths"]["cv_file"] == first.paths.cv_file
+
+
+def test_invalid_config_rejected():
+    raw = load_raw()
+    raw["job_search_settings"]["target_sites"] = "linkedin"
+    with pytest.raises(ConfigError):
+        parse_config(raw)
+
+    raw = load_raw()
+    del raw["paths"]
+    with pytest.raises(ConfigError):
+        parse_config(raw)
+
+
+def test_scoring_plan_reused_for_same_fingerprint():
+    raw = load_raw()
+    first = IntelligentScoringSystem(raw)
+    second = IntelligentScoringSystem(load_raw())
+    assert first.plan is second.plan
+
+    raw["scoring_system"]["threshold"] = -10
+    changed = compile_scoring_plan(raw["scoring_system"])
+    assert changed is not first.plan
+    assert changed.fingerprint != first.plan.fingerprint
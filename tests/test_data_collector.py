@@ -31,3 +31,21 @@ def test_concurrent_scraping(monkeypatch):
     assert len(df) == 2
     assert duration < 0.4
     assert max(call_times) - min(call_times) < 0.3
+
+
+def test_descriptions_are_normalized_before_dedup(monkeypatch):
+    blurb = "Acme is a leading provider of innovative software solutions worldwide."
+    rows = [
+        {
+            "title": title,
+            "company": "Acme",
+            "location": "Istanbul",
+            "description": f"<p>**{title}**&nbsp;role</p>\n\n\n{blurb}\n\nWe are an equal opportunity employer.",
+        }
+        for title in ("Junior Developer", "Data Analyst", "QA Engineer")
+    ]
+    monkeypatch.setattr("src.data_collector.scrape_jobs", lambda **kwargs: pd.DataFrame(rows))
+    df = collect_job_data("x", site_names=["linkedin"], max_results_per_site=3, hours_old=1)
+    assert list(df["description"]) == [
+        f"{title} role" for title in ("Junior Developer", "Data Analyst", "QA Engineer")
+    ]
@@ -0,0 +1,68 @@
+# Third Party
+import numpy as np
+
+# Local
+from src.embedding_queue import EmbeddingQueue, queue_path
+from src.flat_index import FlatVectorStore
+from src.job_schema import stable_job_id
+
+
+def make_jobs(n):
+    return [
+        {
+            "title": f"Dev {i}",
+            "description": f"desc {i}",
+            "job_url": f"http://example.com/{i}",
+            "date_posted": "2024-06-01",
+        }
+        for i in range(n)
+    ]
+
+
+def test_interrupted_run_resumes_without_re_embedding(tmp_path):
+    jobs = make_jobs(5)
+    vectors = np.random.default_rng(0).normal(size=(5, 4)).astype(np.float32)
+    path = queue_path(tmp_path, "jobs")
+
+    queue = EmbeddingQueue(path)
+    assert queue.enqueue(jobs) == 5
+    assert queue.enqueue(jobs[:2]) == 0
+    for job_id, document in queue.pending()[:3]:
+        queue.mark_embedded(job_id, vectors[int(document.split()[1])].tolist())
+    # Çalıştırma burada kesilir: üç embedding hazır ama store'a yazılmadı
+
+    resumed = EmbeddingQueue(path)
+    store = FlatVectorStore()
+    assert [document for _, document in resumed.pending()] == ["desc 3", "desc 4"]
+    assert resumed.flush(store) == 3
+    assert len(resumed) == 2 and resumed.flush(store) == 0
+
+    result = store.search_jobs(vectors[1].tolist(), n_results=1)
+    assert result["ids"][0] == stable_job_id(jobs[1])
+    assert result["metadatas"][0]["title"] == "Dev 1" and "posted_ts" in result["metadatas"][0]
+
+
+def test_failing_job_is_dropped_after_max_attempts(tmp_path):
+    queue = EmbeddingQueue(tmp_path / "q.sqlite3", max_attempts=2)
+    queue.enqueue(make_jobs(1))
+    job_id = queue.pending()[0][0]
+    queue.mark_failed(job_id)
+    assert len(queue) == 1
+    queue.mark_failed(job_id)
+    assert len(queue) == 0
+
+
+def test_flush_keeps_rejected_embeddings_until_attempts_run_out(tmp_path):
+    jobs = make_jobs(3)
+    queue = EmbeddingQueue(queue_path(tmp_path, "jobs"), max_attempts=2)
+    queue.enqueue(jobs)
+    for (job_id, _), size in zip(queue.pending(), (4, 3, 4), strict=True):
+        queue.mark_embedded(job_id, [1.0] * size)
+
+    store = FlatVectorStore()  # İlk kayıt boyutu 4 yapar; 3 boyutlu embedding reddedilir
+    assert queue.flush(store) == 2
+    assert store.last_rejected_ids == [stable_job_id(jobs[1])]
+    assert len(queue) == 1 and queue.pending() == []
+
+    assert queue.flush(store) == 0
+    assert len(queue) == 0
@@ -46,3 +46,20 @@ def test_retry_logic(monkeypatch):
     emb = service.create_embedding("text")
     assert emb == [1.0]
     assert call_count["n"] == 2
+
+
+def test_output_dimensionality_is_requested_from_api(monkeypatch):
+    calls = []
+
+    def fake_embed_content(model, content, task_type=None, **options):
+        calls.append(options)
+        return {"embedding": [0.0] * options.get("output_dimensionality", 4)}
+
+    # Local
+    import src.embedding_service as es
+
+    monkeypatch.setattr(es.genai, "embed_content", fake_embed_content)
+    monkeypatch.setenv("GEMINI_API_KEY", "DUMMY")
+    assert len(EmbeddingService(output_dimensionality=2).create_embedding("text")) == 2
+    assert len(EmbeddingService().create_embedding("text")) == 4
+    assert calls == [{"output_dimensionality": 2}, {}]
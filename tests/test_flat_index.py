@@ -0,0 +1,153 @@
+# Third Party
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local
+from src.flat_index import FlatVectorStore, matches_where
+from src.vector_store import VectorStore, backend_settings, create_vector_store
+
+
+def make_jobs(n):
+    return pd.DataFrame(
+        [
+            {"title": f"Dev {i}", "description": f"desc {i}", "job_url": f"http://example.com/{i}", "site": "linkedin"}
+            for i in range(n)
+        ]
+    )
+
+
+def test_exact_top_k_matches_brute_force(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    store = FlatVectorStore(persist_directory=str(tmp_path))
+    assert store.add_jobs(make_jobs(50), vectors.tolist())
+
+    query = rng.normal(size=8).astype(np.float32)
+    results = store.search_jobs(query.tolist(), n_results=5)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+    assert [m["title"] for m in results["metadatas"]] == [f"Dev {i}" for i in expected]
+    assert results["matches"][0] == f"desc {expected[0]}"
+    assert results["distances"] == sorted(results["distances"])
+
+
+def test_persisted_store_reopens_and_skips_duplicates(tmp_path):
+    df = make_jobs(3)
+    embeddings = [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+    FlatVectorStore(persist_directory=str(tmp_path)).add_jobs(df, embeddings)
+
+    reopened = FlatVectorStore(persist_directory=str(tmp_path))
+    assert reopened.job_exists(df.iloc[0].to_dict())
+    reopened.add_jobs(df, embeddings)
+    assert reopened.get_stats()["total_jobs"] == 3
+    assert reopened.search_jobs([1.0, 0.0], n_results=1)["metadatas"][0]["title"] == "Dev 0"
+
+    assert reopened.clear_collection()
+    assert reopened.get_stats()["total_jobs"] == 0
+
+
+def test_where_filters_and_backend_factory():
+    assert matches_where({"site": "indeed", "score": 5}, {"$and": [{"site": "indeed"}, {"score": {"$gte": 3}}]})
+    assert not matches_where({"site": "indeed"}, {"site": {"$in": ["linkedin"]}})
+
+    store = create_vector_store(backend="numpy")
+    assert isinstance(store, FlatVectorStore)
+    df = make_jobs(2)
+    df.loc[1, "site"] = "indeed"
+    store.add_jobs(df, [[1.0, 0.0], [1.0, 0.1]])
+    results = store.search_jobs([1.0, 0.0], n_results=5, filter_metadata={"site": "indeed"})
+    assert [m["title"] for m in results["metadatas"]] == ["Dev 1"]
+    assert isinstance(create_vector_store(), VectorStore)
+    assert create_vector_store(backend="faiss") is None
+
+
+def test_create_vector_store_passes_only_supported_settings():
+    settings = {"hnsw": {"M": 8}, "upsert_batch_size": 10, "quantization": "int8", "rerank_factor": 2}
+    assert backend_settings(FlatVectorStore, settings) == {"quantization": "int8", "rerank_factor": 2}
+    assert backend_settings(VectorStore, settings) == {"hnsw": {"M": 8}, "upsert_batch_size": 10}
+    assert isinstance(create_vector_store(backend="numpy", **settings), FlatVectorStore)
+    assert create_vector_store(backend="numpy", rerank_facter=2) is None
+    with pytest.raises(TypeError):
+        FlatVectorStore(rerank_facter=2)
+
+
+def test_matrix_grows_beyond_capacity(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.flat_index.MIN_CAPACITY", 2)
+    store = FlatVectorStore(persist_directory=str(tmp_path))
+    for start in range(0, 6, 2):
+        df = make_jobs(6).iloc[start : start + 2]
+        store.add_jobs(df, [[float(i), 1.0] for i in range(start, start + 2)])
+    reopened = FlatVectorStore(persist_directory=str(tmp_path))
+    assert reopened.get_stats()["total_jobs"] == 6
+    assert reopened.search_jobs([5.0, 1.0], n_results=1)["metadatas"][0]["title"] == "Dev 5"
+
+
+def test_search_jobs_above_exact_scan():
+    store = FlatVectorStore()
+    store.add_jobs(make_jobs(4), [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [-1.0, 0.0]])
+    results = store.search_jobs_above([1.0, 0.0], min_similarity=90)
+    assert [m["title"] for m in results["metadatas"]] == ["Dev 0", "Dev 1"]
+
+
+def test_search_jobs_batch_matches_single_queries():
+    rng = np.random.default_rng(1)
+    store = FlatVectorStore()
+    store.add_jobs(make_jobs(20), rng.normal(size=(20, 4)).tolist())
+    queries = rng.normal(size=(3, 4))
+    batch = store.search_jobs_batch(queries, n_results=4)
+    for result, query in zip(batch, queries, strict=True):
+        single = store.search_jobs(query.tolist(), n_results=4)
+        assert result["metadatas"] == single["metadatas"]
+        assert np.allclose(result["distances"], single["distances"], atol=1e-5)
+
+
+def test_prune_drops_expired_jobs_on_both_backends(tmp_path):
+    from datetime import datetime
+
+    jobs = make_jobs(6)
+    jobs["date_posted"] = ["2024-01-01"] * 4 + ["2024-06-01"] * 2
+    vectors = np.eye(6, dtype=np.float32).tolist()
+    for backend in ("numpy", "chroma"):
+        store = create_vector_store(persist_directory=str(tmp_path / backend), backend=backend, upsert_batch_size=2)
+        store.create_collection()
+        store.add_jobs(jobs, vectors)
+
+        assert store.prune(older_than=datetime(2024, 3, 1)) == 4
+        assert len(store.last_pruned_ids) == 4 and not store.existing_ids(store.last_pruned_ids)
+        assert store.get_stats()["total_jobs"] == 2
+        titles = {m["title"] for m in store.search_jobs(vectors[4], n_results=5)["metadatas"]}
+        assert titles == {"Dev 4", "Dev 5"}
+
+    reopened = FlatVectorStore(persist_directory=str(tmp_path / "numpy"))
+    assert reopened.get_stats()["total_jobs"] == 2
+    assert reopened.search_jobs(vectors[5], n_results=1)["metadatas"][0]["title"] == "Dev 5"
+
+
+def test_clear_collection_drops_chroma_collection(tmp_path):
+    store = VectorStore(persist_directory=str(tmp_path), collection_name="clear_test")
+    store.add_jobs(make_jobs(3), np.eye(3).tolist())
+    assert store.clear_collection()
+    assert store.get_stats()["total_jobs"] == 0
+
+
+def test_torn_record_line_is_truncated_before_next_append(tmp_path):
+    vectors = np.eye(6).tolist()
+    df = make_jobs(6)
+    FlatVectorStore(persist_directory=str(tmp_path)).add_jobs(df.iloc[:3], vectors[:3])
+
+    # Çökme: 4. ilanın vektörü yazıldı, kayıt satırı yarıda kaldı
+    crashed = FlatVectorStore(persist_directory=str(tmp_path))
+    crashed.add_jobs(df.iloc[3:4], vectors[3:4])
+    records = tmp_path / "job_embeddings" / "records.jsonl"
+    content = records.read_bytes()
+    records.write_bytes(content[: content.rstrip(b"\n").rfind(b"\n") + 20])
+
+    reopened = FlatVectorStore(persist_directory=str(tmp_path))
+    assert reopened.get_stats()["total_jobs"] == 3
+    assert reopened.add_jobs(df.iloc[3:], vectors[3:])
+
+    final = FlatVectorStore(persist_directory=str(tmp_path))
+    assert final.get_stats()["total_jobs"] == 6
+    for i, vector in enumerate(vectors):
+        assert final.search_jobs(vector, n_results=1)["metadatas"][0]["title"] == f"Dev {i}"
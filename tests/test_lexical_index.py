@@ -0,0 +1,114 @@
+# Third Party
+import numpy as np
+import pandas as pd
+
+# Local
+from src.flat_index import FlatVectorStore
+from src.job_schema import stable_job_id
+from src.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from src.vector_store import VectorStore
+
+
+def test_bm25_ranks_exact_skill_matches_first():
+    index = LexicalIndex()
+    index.add("k8s", "Platform engineer with Kubernetes and Terraform")
+    index.add("web", "Frontend developer, React and CSS")
+    index.add("both", "Kubernetes operator written in Go, Kubernetes on-call")
+    assert not index.add("web", "duplicate")
+
+    hits = index.search("CV: Go, Kubernetes, Terraform", n_results=2)
+    assert [job_id for job_id, _ in hits] == ["both", "k8s"]
+    assert index.search("cobol") == []
+
+
+def test_index_round_trips_through_disk(tmp_path):
+    path = tmp_path / "lexical_index.json"
+    index = LexicalIndex(path=path)
+    index.add_jobs([{"title": "Data Analyst", "description": "SQL and Power BI"}], job_ids=["a"])
+    assert index.save()
+
+    reloaded = LexicalIndex(path=path)
+    assert "a" in reloaded and len(reloaded) == 1
+    assert reloaded.search("power bi") == index.search("power bi")
+    reloaded.add("b", "SQL developer")
+    assert [job_id for job_id, _ in reloaded.search("sql")] == ["b", "a"]
+
+
+def test_remove_renumbers_remaining_postings(tmp_path):
+    index = LexicalIndex(path=tmp_path / "lexical_index.json")
+    index.add("a", "Python backend developer")
+    index.add("b", "Python data engineer")
+    index.add("c", "Frontend React developer")
+    assert index.remove(["a", "missing"]) == 1 and index.remove(["a"]) == 0
+
+    assert "a" not in index and len(index) == 2
+    assert [job_id for job_id, _ in index.search("python")] == ["b"]
+    assert [job_id for job_id, _ in index.search("developer")] == ["c"]
+    assert index.search("backend") == []
+    index.save()
+    assert LexicalIndex(path=tmp_path / "lexical_index.json").search("python") == index.search("python")
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], k=60)
+    assert [job_id for job_id, _ in fused] == ["a", "c", "b"]
+
+
+def test_get_jobs_returns_requested_order_on_both_backends():
+    jobs = pd.DataFrame([{"title": f"Dev {i}", "job_url": f"http://example.com/{i}", "site": "x"} for i in range(3)])
+    for store in (VectorStore(collection_name="get_jobs_test"), FlatVectorStore()):
+        store.add_jobs(jobs, np.eye(3).tolist())
+        ids = store.search_jobs([0.0, 0.0, 1.0], n_results=3)["ids"]
+        fetched = store.get_jobs([ids[2], "missing", ids[0]], include_embeddings=True)
+        assert fetched["ids"] == [ids[2], ids[0]]
+        assert fetched["metadatas"][1]["title"] == "Dev 2"
+        assert np.allclose(fetched["embeddings"][1], [0.0, 0.0, 1.0])
+        assert [m["title"] for m in store.get_jobs(ids, filter_metadata={"title": "Dev 1"})["metadatas"]] == ["Dev 1"]
+
+
+def test_hybrid_search_drops_lexical_only_hits_below_threshold(monkeypatch):
+    # Local
+    import main
+
+    jobs = pd.DataFrame(
+        [
+            {"title": "Data Analyst", "description": "SQL dashboards", "job_url": "http://example.com/a"},
+            {"title": "Junior BI Analyst", "description": "Reporting", "job_url": "http://example.com/b"},
+            {"title": "Cook", "description": "Kitchen cook, Python lover", "job_url": "http://example.com/c"},
+        ]
+    )
+    store = FlatVectorStore()
+    store.add_jobs(jobs, [[1.0, 0.0], [0.9, 0.3], [0.0, 1.0]])
+    index = LexicalIndex()
+    index.add_jobs(jobs.to_dict("records"), job_ids=[stable_job_id(job) for job in jobs.to_dict("records")])
+    monkeypatch.setattr(main, "lexical_index", index)
+
+    (results,) = main._search_and_score_jobs_batch([[1.0, 0.0]], store, 60, cv_texts=["kitchen cook python"])
+    # Sözcüksel eşleşen ama benzerliği %0 olan ilan elenir; sıralama RRF sırasıdır
+    assert [job["title"] for job in results] == ["Data Analyst", "Junior BI Analyst"]
+    assert all(job["similarity_score"] >= 60 for job in results)
+
+
+def test_lexical_index_follows_stored_and_pruned_jobs(monkeypatch):
+    # Local
+    import main
+
+    jobs = pd.DataFrame(
+        [
+            {"title": "Data Analyst", "job_url": "http://example.com/a", "date_posted": "2024-01-01"},
+            {"title": "BI Analyst", "job_url": "http://example.com/b"},
+            {"title": "Rejected Analyst", "job_url": "http://example.com/c"},
+        ]
+    )
+    records = jobs.to_dict("records")
+    store = FlatVectorStore()
+    store.add_jobs(jobs.iloc[:2], [[1.0, 0.0], [0.0, 1.0]])
+    index = LexicalIndex()
+    monkeypatch.setattr(main, "lexical_index", index)
+    monkeypatch.setitem(main.config.vector_store_settings, "ttl_days", 30)
+
+    # Depoya yazılmayan ilan indekslenmez, süresi dolan ilan indeksten de düşer
+    assert main._index_stored_jobs(records, store) == 2
+    assert stable_job_id(records[2]) not in index
+    assert main._prune_expired_jobs(store) == 1
+    assert [job_id for job_id, _ in index.search("analyst")] == [stable_job_id(records[1])]
@@ -0,0 +1,67 @@
+# Third Party
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local
+from src.benchmark import benchmark_dimensions, make_queries
+from src.flat_index import FlatVectorStore
+from src.projection import PCAProjection, projection_path
+from src.reindex import read_active_collection, reduce_with_pca
+
+
+def low_rank_corpus(n=200, dim=32, rank=6, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.normal(size=(n, rank)) @ rng.normal(size=(rank, dim))).astype(np.float32)
+
+
+def test_pca_keeps_low_rank_structure_and_round_trips(tmp_path):
+    corpus = low_rank_corpus()
+    projection = PCAProjection.fit(np.array_split(corpus, 4), 8)
+    assert projection.dimension == 8 and projection.input_dimension == 32
+    assert projection.explained_variance_ratio > 0.99
+
+    reduced = projection.transform(corpus)
+    assert reduced.shape == (200, 8)
+    assert projection.transform(corpus[3]).shape == (8,)
+    unit = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    reduced_unit = reduced / np.linalg.norm(reduced, axis=1, keepdims=True)
+    assert set(np.argsort(-(unit @ unit[0]))[:5]) == set(np.argsort(-(reduced_unit @ reduced_unit[0]))[:5])
+
+    projection.save(tmp_path / "p.pca.npz")
+    loaded = PCAProjection.load(tmp_path / "p.pca.npz")
+    assert np.allclose(loaded.transform(corpus), reduced)
+    assert PCAProjection.load(tmp_path / "missing.npz") is None
+    with pytest.raises(ValueError):
+        PCAProjection.fit([corpus], 64)
+
+
+def test_reduce_with_pca_switches_to_projected_collection(tmp_path):
+    corpus = low_rank_corpus(n=40, dim=16)
+    jobs = pd.DataFrame(
+        [{"title": f"Dev {i}", "description": f"desc {i}", "job_url": f"http://example.com/{i}"} for i in range(40)]
+    )
+    source = FlatVectorStore(persist_directory=str(tmp_path), collection_name="jobs__m__16")
+    source.add_jobs(jobs, corpus.tolist())
+
+    assert reduce_with_pca(source, tmp_path, "jobs", "models/m", 60, backend="numpy") is None
+    target = reduce_with_pca(source, tmp_path, "jobs", "models/m", 8, backend="numpy")
+    assert target.collection_name == "jobs__m__8__pca"
+    assert read_active_collection(tmp_path) == {
+        "collection": "jobs__m__8__pca",
+        "model": "models/m",
+        "dimension": 8,
+        "reduction": "pca",
+    }
+    projection = PCAProjection.load(projection_path(tmp_path, target.collection_name))
+    result = target.search_jobs(projection.transform(corpus[5]).tolist(), n_results=1)
+    assert result["metadatas"][0]["title"] == "Dev 5"
+    assert target.get_stats()["total_jobs"] == 40
+
+
+def test_benchmark_reports_recall_per_dimension():
+    corpus = low_rank_corpus(n=300, dim=24)
+    rows = benchmark_dimensions(corpus, make_queries(corpus, 4), targets=[12, 4], k=5)
+    assert [row["dimension"] for row in rows] == [24, 12, 4]
+    assert rows[1]["recall@5"] >= 0.8
+    assert rows[0]["index_mb"] > rows[1]["index_mb"] > rows[2]["index_mb"]
@@ -0,0 +1,77 @@
+# Third Party
+import numpy as np
+import pytest
+
+# Local
+from src.benchmark import benchmark_quantization, make_queries
+from src.flat_index import FlatVectorStore
+from src.quantization import dequantize, quantize, quantized_scores
+
+
+def unit_rows(n, dim, seed=0):
+    rows = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize(("mode", "dtype", "tolerance"), [("float16", np.float16, 1e-3), ("int8", np.int8, 1e-2)])
+def test_quantize_round_trip_and_scores(mode, dtype, tolerance):
+    matrix = unit_rows(40, 16)
+    quantized, scales = quantize(matrix, mode)
+    assert quantized.dtype == dtype
+    assert np.abs(dequantize(quantized, scales) - matrix).max() < tolerance
+    queries = unit_rows(3, 16, seed=1)
+    assert np.abs(quantized_scores(queries, quantized, scales) - queries @ matrix.T).max() < 2 * tolerance
+    with pytest.raises(ValueError):
+        quantize(matrix, "int4")
+
+
+def test_quantized_search_reranks_with_float32():
+    corpus = unit_rows(300, 32)
+    exact = FlatVectorStore()
+    store = FlatVectorStore(quantization="int8", rerank_factor=4)
+    for target in (exact, store):
+        target.add_records({f"job_{i}": (vector, "", {}) for i, vector in enumerate(corpus)})
+
+    for query in make_queries(corpus, 5):
+        expected = exact.search_jobs(query, n_results=10)
+        result = store.search_jobs(query, n_results=10)
+        assert result["ids"] == expected["ids"]
+        assert np.allclose(result["distances"], expected["distances"], atol=1e-5)
+        assert store.search_jobs_above(query, 60)["ids"] == exact.search_jobs_above(query, 60)["ids"]
+
+
+def test_benchmark_reports_recall_and_scanned_bytes():
+    corpus = unit_rows(500, 24)
+    rows = benchmark_quantization(corpus, make_queries(corpus, 4), k=5)
+    by_mode = {row["mode"]: row for row in rows}
+    assert by_mode["none"]["recall@5"] == 1.0
+    assert by_mode["int8"]["recall@5"] >= 0.8
+    assert by_mode["int8"]["scan_mb"] < by_mode["none"]["scan_mb"]
+    assert "float16" not in by_mode
+
+
+def test_float16_is_not_an_index_mode():
+    with pytest.raises(ValueError):
+        FlatVectorStore(quantization="float16")
+
+
+def test_int8_matrix_is_persisted_and_rebuilt_when_stale(tmp_path):
+    corpus = unit_rows(60, 16)
+    records = {f"job_{i}": (vector, "", {}) for i, vector in enumerate(corpus)}
+    store = FlatVectorStore(persist_directory=str(tmp_path), quantization="int8")
+    store.add_records(dict(list(records.items())[:40]))
+    directory = tmp_path / "job_embeddings"
+    assert (directory / "vectors.int8.npy").exists() and (directory / "scales.npy").exists()
+
+    # Nicemleme kapalı bir örneğin eklemesi int8 kopyayı bayatlatır ve siler
+    FlatVectorStore(persist_directory=str(tmp_path)).add_records(dict(list(records.items())[40:]))
+    assert not (directory / "vectors.int8.npy").exists()
+
+    reopened = FlatVectorStore(persist_directory=str(tmp_path), quantization="int8")
+    exact = FlatVectorStore()
+    exact.add_records(records)
+    for query in make_queries(corpus, 5):
+        assert reopened.search_jobs(query, n_results=5)["ids"] == exact.search_jobs(query, n_results=5)["ids"]
+    assert (directory / "vectors.int8.npy").exists()
+    quantized, _ = reopened._quantized_matrix()
+    assert isinstance(quantized, np.memmap) and len(quantized) == 60
@@ -0,0 +1,103 @@
+# Standard Library
+import threading
+
+# Third Party
+import numpy as np
+import pandas as pd
+
+# Local
+from src.flat_index import FlatVectorStore
+from src.reindex import Reindexer, read_active_collection, versioned_collection_name, write_active_collection
+from src.store_lock import EmbeddingClaims
+from src.vector_store import VectorStore
+
+
+def make_source(n=5):
+    jobs = pd.DataFrame(
+        [{"title": f"Dev {i}", "description": f"desc {i}", "job_url": f"http://example.com/{i}"} for i in range(n)]
+    )
+    source = FlatVectorStore()
+    source.add_jobs(jobs, np.eye(n).tolist())
+    return source
+
+
+def test_versioned_name_and_pointer_round_trip(tmp_path):
+    name = versioned_collection_name("job_embeddings", "models/text-embedding-004", 768)
+    assert name == "job_embeddings__text-embedding-004__768"
+    assert read_active_collection(tmp_path) is None
+    write_active_collection(tmp_path, name, "models/text-embedding-004", 768)
+    assert read_active_collection(tmp_path) == {
+        "collection": name,
+        "model": "models/text-embedding-004",
+        "dimension": 768,
+        "reduction": None,
+    }
+
+
+def test_reindex_resumes_and_switches_active_collection(tmp_path):
+    source = make_source()
+    target = VectorStore(collection_name="reindex_target__new__2")
+    calls = []
+
+    def flaky_embed(text):
+        calls.append(text)
+        if len(calls) == 3:
+            raise RuntimeError("quota")
+        return [1.0, float(text[-1])]
+
+    first = Reindexer(source, target, flaky_embed, tmp_path, "new", 2, batch_size=2, delay=0)
+    assert not first.run()
+    assert read_active_collection(tmp_path) is None
+    assert target.get_stats()["total_jobs"] == 2
+
+    second = Reindexer(source, target, lambda text: [1.0, float(text[-1])], tmp_path, "new", 2, batch_size=2, delay=0)
+    assert second.run()
+    assert second.copied == 3
+    assert target.get_stats()["total_jobs"] == 5
+    assert read_active_collection(tmp_path)["collection"] == "reindex_target__new__2"
+
+
+def test_reindex_tolerates_only_jobs_that_keep_failing(tmp_path):
+    source = make_source(3)
+    target = VectorStore(collection_name="reindex_failing__new__2")
+
+    def embed(text):
+        return None if text == "desc 1" else [1.0, float(text[-1])]
+
+    reindexer = Reindexer(source, target, embed, tmp_path, "new", 2, delay=0, max_attempts=2, claim_wait=0)
+    assert reindexer.run()
+    assert reindexer.failed_ids == {source._ids[1]}
+    assert reindexer.attempts[source._ids[1]] == 2
+    assert target.get_stats()["total_jobs"] == 2
+
+
+def test_reindex_waits_for_jobs_claimed_by_another_process(tmp_path):
+    source = make_source(3)
+    target = VectorStore(collection_name="reindex_claimed__new__2")
+    other = EmbeddingClaims(tmp_path / "claims.sqlite3", owner="other")
+    held = source._ids[2]
+    assert other.claim([held]) == {held}
+
+    reindexer = Reindexer(
+        source,
+        target,
+        lambda text: [1.0, float(text[-1])],
+        tmp_path,
+        "new",
+        2,
+        delay=0,
+        claims=EmbeddingClaims(tmp_path / "claims.sqlite3", owner="me"),
+        claim_wait=0.05,
+    )
+    thread = threading.Thread(target=reindexer.run)
+    thread.start()
+    try:
+        threading.Event().wait(0.3)
+        assert not reindexer.switched
+        assert read_active_collection(tmp_path) is None
+        assert target.get_stats()["total_jobs"] == 2
+    finally:
+        other.release()
+        thread.join(5)
+    assert reindexer.switched
+    assert target.get_stats()["total_jobs"] == 3
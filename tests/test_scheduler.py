@@ -0,0 +1,62 @@
+# Third Party
+import yaml
+
+# Local
+from src.intelligent_scoring import IntelligentScoringSystem
+from src.scheduler import NEGATED_TERM, Budget, persona_priority, prioritize_jobs, prioritize_personas
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def load_scoring_system():
+    with open("config.yaml", encoding="utf-8") as f:
+        return IntelligentScoringSystem(yaml.safe_load(f))
+
+
+def test_budget_tracks_time_shares_and_embedding_quota():
+    clock = FakeClock()
+    budget = Budget(time_budget=100, max_embeddings=2, clock=clock)
+    assert budget.limited and budget.can_embed()
+    budget.spend(2)
+    assert budget.embeddings_left() == 0 and not budget.can_embed()
+
+    budget = Budget(time_budget=100, clock=clock)
+    clock.now = 60
+    assert not budget.time_left(0.5) and budget.can_embed()
+    clock.now = 95
+    assert not budget.can_embed() and budget.time_left()
+    assert not Budget().limited and Budget().can_embed()
+
+
+def test_personas_ordered_by_title_score_then_freshness():
+    personas = [
+        ("Senior", {"term": "Senior Developer", "hours_old": 24}),
+        ("Software", {"term": '"Software Engineer" -Senior -Lead', "hours_old": 72}),
+        ("Junior_Week", {"term": "Junior Developer -Senior", "hours_old": 168}),
+        ("Junior_Day", {"term": "Junior Developer", "hours_old": 24}),
+    ]
+    ordered = [name for name, _ in prioritize_personas(personas, load_scoring_system())]
+    assert ordered == ["Junior_Day", "Junior_Week", "Software", "Senior"]
+
+
+def test_only_leading_hyphen_negates_a_term():
+    term = '"Full-Stack Developer" Entry-Level -Senior'
+    assert NEGATED_TERM.sub(" ", term).split() == ['"Full-Stack', 'Developer"', "Entry-Level"]
+    scoring_system = load_scoring_system()
+    assert persona_priority(term, scoring_system) == scoring_system.score_title("Full-Stack Developer Entry-Level")
+
+
+def test_jobs_ordered_by_keyword_score_then_recency():
+    jobs = [
+        {"keyword_score": 10, "date_posted": "2024-06-01"},
+        {"keyword_score": 40, "date_posted": "2024-05-01"},
+        {"keyword_score": 10, "date_posted": "2024-06-10"},
+        {"keyword_score": float("nan")},
+    ]
+    assert prioritize_jobs(range(4), jobs) == [1, 2, 0, 3]
@@ -0,0 +1,58 @@
+# Standard Library
+import copy
+
+# Third Party
+import yaml
+
+# Local
+from src.intelligent_scoring import IntelligentScoringSystem
+from src.score_cache import ScoreCache
+
+
+def load_config():
+    with open("config.yaml", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def test_repeated_job_hits_cache():
+    cache = ScoreCache()
+    scoring = IntelligentScoringSystem(load_config(), cache=cache)
+    job = {"title": "Junior Developer", "description": "Python, 5 yıl deneyim"}
+    first = scoring.score_job(job)
+    assert cache.stats()["hits"] == 0
+    second = scoring.score_job(dict(job))
+    assert first == second
+    assert cache.stats()["hits"] == 3
+
+
+def test_title_config_change_only_recomputes_title():
+    cache = ScoreCache()
+    cfg = load_config()
+    job = {"title": "Junior Developer", "description": "Python"}
+    IntelligentScoringSystem(cfg, cache=cache).score_job(job)
+
+    changed = copy.deepcopy(cfg)
+    changed["scoring_system"]["title_keywords"]["positive"].append("developer")
+    scoring = IntelligentScoringSystem(changed, cache=cache)
+    hits_before = cache.hits
+    _, details = scoring.score_job(job)
+    assert cache.hits - hits_before == 2  # description + experience reused
+    assert details["title"] == 60
+
+
+def test_cache_is_bounded():
+    cache = ScoreCache(max_entries=2)
+    for i in range(5):
+        cache.set(f"k{i}", i)
+    assert len(cache) == 2
+    assert cache.get("k0") is None
+    assert cache.get("k4") == 4
+
+
+def test_cache_persistence_roundtrip(tmp_path):
+    path = tmp_path / "score_cache.json"
+    cache = ScoreCache(path=path)
+    cache.set("title:v:abc", 30)
+    assert cache.save()
+    reloaded = ScoreCache(path=path)
+    assert reloaded.get("title:v:abc") == 30
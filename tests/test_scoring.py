@@ -6,8 +6,9 @@ import pytest
 import yaml
 
 # Local
-from src.filter import compare_filters, filter_junior_suitable_jobs, score_jobs
-from src.intelligent_scoring import IntelligentScoringSystem
+from src.filter import cascade_mask, compare_filters, explain_score, filter_junior_suitable_jobs, score_jobs
+from src.intelligent_scoring import IntelligentScoringSystem, ScoreRecord
+from src.job_schema import stable_job_id
 
 
 def load_scoring_system():
@@ -150,8 +151,37 @@ def test_compare_filters_basic():
     ]
     scoring = load_scoring_system()
     result = compare_filters(jobs, scoring)
-    assert "Junior Developer" in result["intersection"]
-    assert "Senior Developer" not in result["intersection"]
+    senior_id, junior_id = (stable_job_id(job) for job in jobs)
+    assert junior_id in result["intersection"]
+    assert senior_id not in result["intersection"]
+    assert result["counts"]["total"] == 2
+
+
+def test_compare_filters_keeps_same_title_postings_distinct():
+    jobs = [
+        {"title": "Junior Developer", "description": "Python", "job_url": "http://example.com/1"},
+        {"title": "Junior Developer", "description": "Python", "job_url": "http://example.com/2"},
+    ]
+    scoring = load_scoring_system()
+    result = compare_filters(jobs, scoring)
+    assert result["counts"]["intersection"] == 2
+    assert "score" not in jobs[0]
+
+
+def test_compare_filters_applies_cv_skill_bonus_like_score_jobs():
+    with open("config.yaml", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+    cfg["scoring_system"]["cv_skill_keywords"] = ["sql", "power bi"]
+    jobs = [
+        {"title": "Data Analyst", "description": "SQL ve Power BI", "job_url": "http://example.com/1"},
+        {"title": "Data Analyst", "description": "Excel raporlama", "job_url": "http://example.com/2"},
+    ]
+    base = IntelligentScoringSystem(cfg).score_record(jobs[0]).total
+    cfg["scoring_system"]["threshold"] = base + 5
+    result = compare_filters(jobs, IntelligentScoringSystem(cfg))
+    expected = {stable_job_id(job) for job in score_jobs([dict(job) for job in jobs], IntelligentScoringSystem(cfg))}
+    assert expected == {stable_job_id(jobs[0])}
+    assert set(result["new_only"]) | set(result["intersection"]) == expected
 
 
 def test_scoring_performance():
@@ -162,6 +192,32 @@ def test_scoring_performance():
     assert (time.time() - start) < 1.0
 
 
+def test_score_jobs_attaches_compact_records():
+    scoring = load_scoring_system()
+    jobs = [{"title": "Junior Developer", "description": "Python"}]
+    result = score_jobs(jobs, scoring)
+    record = result[0]["score_details"]
+    assert isinstance(record, ScoreRecord)
+    assert not hasattr(record, "__dict__")
+    explanation = explain_score(result[0])
+    assert type(explanation) is dict
+    assert explanation["total"] == result[0]["score"] == 40
+
+
+def test_cascade_mask_skips_obviously_unsuitable_jobs():
+    scoring = load_scoring_system()
+    jobs = [
+        {"title": "Junior Developer", "description": "Python"},
+        {"title": "Senior Architect", "description": "10+ years experience"},
+        {"title": "Çağrı Merkezi Temsilcisi", "description": "Vardiyalı", "keyword_score": 50},
+    ]
+    assert cascade_mask(jobs, scoring) == [True, False, True]
+    assert cascade_mask(jobs, scoring, pre_threshold=60) == [False, False, False]
+    assert cascade_mask(jobs, scoring, mode="junior") == [True, False, False]
+    with pytest.raises(ValueError):
+        cascade_mask(jobs, scoring, mode="vector")
+
+
 def test_filter_empty_list():
     assert filter_junior_suitable_jobs([]) == []
 
@@ -0,0 +1,93 @@
+# Standard Library
+from datetime import datetime
+
+# Third Party
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local
+from src.flat_index import FlatVectorStore
+from src.job_schema import build_where, stable_job_id
+from src.sharded_store import UNDATED_SHARD, shard_bounds, shard_key, time_window
+from src.vector_store import create_vector_store
+
+NOW = datetime(2024, 6, 20)
+DATES = ["2024-03-05", "2024-04-10", "2024-05-15", "2024-06-18", None]
+
+
+def make_jobs(n):
+    return pd.DataFrame(
+        [
+            {
+                "title": f"Dev {i}",
+                "description": f"desc {i}",
+                "job_url": f"http://example.com/{i}",
+                "date_posted": DATES[i % len(DATES)],
+            }
+            for i in range(n)
+        ]
+    )
+
+
+def test_shard_keys_bounds_and_window():
+    june = datetime(2024, 6, 18).timestamp()
+    assert shard_key(june, "month") == "2024-06"
+    assert shard_key(june, "week") == "2024-W25"
+    assert shard_key(None, "month") == UNDATED_SHARD
+    assert shard_bounds("2024-12") == (int(datetime(2024, 12, 1).timestamp()), int(datetime(2025, 1, 1).timestamp()))
+    start, end = shard_bounds("2024-W25")
+    assert start <= june < end and end - start == 7 * 86400
+    assert shard_bounds(UNDATED_SHARD) is None
+
+    where = build_where(sites=["linkedin"], max_age_days=30, now=NOW)
+    assert time_window(where) == (int(datetime(2024, 5, 21).timestamp()), float("inf"))
+    assert time_window(None) == (float("-inf"), float("inf"))
+
+
+@pytest.mark.parametrize("backend", ["chroma", "numpy"])
+def test_sharded_search_matches_single_collection_and_drops_old_shards(tmp_path, backend):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(40, 8)).astype(np.float32)
+    store = create_vector_store(str(tmp_path), f"sharded_{backend}", backend=backend, shard_period="month")
+    assert store.create_collection() and store.add_jobs(make_jobs(40), vectors.tolist())
+    assert store.get_stats()["shards"] == dict.fromkeys(["2024-03", "2024-04", "2024-05", "2024-06", "undated"], 8)
+
+    flat = FlatVectorStore()
+    flat.add_jobs(make_jobs(40), vectors.tolist())
+    query = rng.normal(size=8).tolist()
+    assert store.search_jobs(query, n_results=7)["ids"] == flat.search_jobs(query, n_results=7)["ids"]
+
+    # Son 30 gün yalnızca Mayıs/Haziran parçalarına (ve tarihsiz parçaya) gider
+    searched = []
+    for key, shard in store.shards.items():
+        original = shard.search_jobs_batch
+        shard.search_jobs_batch = lambda *args, key=key, original=original, **kwargs: (
+            searched.append(key) or original(*args, **kwargs)
+        )
+    recent = store.search_jobs(query, n_results=40, filter_metadata=build_where(max_age_days=30, now=NOW))
+    assert sorted(searched) == ["2024-05", "2024-06", "undated"]
+    assert {metadata["date_posted"] for metadata in recent["metadatas"]} == {"2024-06-18"}
+
+    assert store.prune(older_than=datetime(2024, 5, 1)) == 16
+    assert len(set(store.last_pruned_ids)) == 16 and not store.existing_ids(store.last_pruned_ids)
+    reopened = create_vector_store(str(tmp_path), f"sharded_{backend}", backend=backend, shard_period="month")
+    assert reopened.create_collection()
+    assert sorted(reopened.shards) == ["2024-05", "2024-06", "undated"]
+    assert reopened.get_stats()["total_jobs"] == 24
+    assert reopened.job_exists(make_jobs(40).iloc[3].to_dict())
+
+
+def test_undated_posting_seen_again_later_is_stored_once(tmp_path):
+    store = create_vector_store(str(tmp_path), "sharded_undated", backend="numpy", shard_period="month")
+    job = {"title": "Dev", "description": "desc", "job_url": "http://example.com/u"}
+    for collected_at in (datetime(2024, 5, 3), datetime(2024, 6, 7)):
+        seen = dict(job, collected_at=collected_at)
+        if not store.job_exists(seen):
+            store.add_jobs(pd.DataFrame([seen]), [[1.0, 0.0]])
+    assert store.get_stats()["shards"] == {UNDATED_SHARD: 1}
+
+    # Başka parçaya düşmüş bir kopya bile aramada tek sonuç verir
+    store.shards["2024-06"] = store._open_shard("2024-06")
+    store.shards["2024-06"].add_jobs(pd.DataFrame([job]), [[1.0, 0.0]])
+    assert store.search_jobs([1.0, 0.0], n_results=5)["ids"] == [stable_job_id(job)]
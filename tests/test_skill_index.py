@@ -0,0 +1,49 @@
+# Third Party
+import yaml
+
+# Local
+from src.filter import score_jobs
+from src.intelligent_scoring import IntelligentScoringSystem
+from src.skill_index import SkillIndex, tokenize
+
+
+def test_tokenize_keeps_symbols_and_splits_separators():
+    assert tokenize("C++ ve C# ile React.js") == ["c++", "ve", "c#", "ile", "react", "js"]
+    assert tokenize(None) == []
+
+
+def test_index_is_incremental_and_idempotent():
+    index = SkillIndex()
+    assert index.add("a", "Python and SQL")
+    assert not index.add("a", "Java")
+    index.add("b", "Power BI dashboards with SQL")
+    assert index.jobs_with_skill("sql") == {"a", "b"}
+    assert index.jobs_with_skill("power bi") == {"b"}
+    assert index.jobs_with_skill("java") == set()
+    assert index.match_counts(["sql", "python"]) == {"a": 2, "b": 1}
+
+
+def test_multi_word_skill_requires_adjacent_tokens_in_order():
+    index = SkillIndex()
+    index.add("apart", "Power Apps and BI reporting")
+    index.add("reversed", "BI tools need power users")
+    index.add("phrase", "Dashboards in React JS and Power-BI")
+    assert index.jobs_with_skill("power bi") == {"phrase"}
+    assert index.jobs_with_skill("react.js") == {"phrase"}
+    assert index.jobs_with_skill("bi") == {"apart", "reversed", "phrase"}
+
+
+def test_cv_skill_boost_applied_in_score_jobs():
+    with open("config.yaml", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+    cfg["scoring_system"]["cv_skill_keywords"] = ["python", "sql", "power bi"]
+    cfg["scoring_system"]["cv_skill_boost_threshold"] = 0.6
+    scoring = IntelligentScoringSystem(cfg)
+    jobs = [
+        {"title": "Data Analyst", "description": "SQL ve Power BI", "job_url": "http://example.com/1"},
+        {"title": "Data Analyst", "description": "Excel raporlama", "job_url": "http://example.com/2"},
+    ]
+    scored = {job["job_url"]: job for job in score_jobs(jobs, scoring)}
+    assert scored["http://example.com/1"]["score_details"]["skills"] == 10
+    assert scored["http://example.com/2"]["score_details"]["skills"] == 0
+    assert len(scoring.skill_index) == 2
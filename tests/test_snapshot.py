@@ -0,0 +1,54 @@
+# Third Party
+import numpy as np
+import pandas as pd
+
+# Local
+from src.flat_index import FlatVectorStore
+from src.snapshot import read_snapshot
+from src.vector_store import VectorStore
+
+
+def make_jobs(n):
+    return pd.DataFrame(
+        [{"title": f"Dev {i}", "description": f"desc {i}", "job_url": f"http://example.com/{i}"} for i in range(n)]
+    )
+
+
+def test_snapshot_round_trip_between_backends(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(25, 6)).astype(np.float32)
+    source = VectorStore(collection_name="snapshot_source")
+    source.add_jobs(make_jobs(25), vectors.tolist())
+
+    assert source.export_snapshot(tmp_path / "snap") == 25
+    manifest, matrix, _, records = read_snapshot(tmp_path / "snap")
+    assert manifest["dimension"] == 6 and matrix.dtype == np.float32
+    assert len({record["id"] for record in records}) == 25
+
+    for target in (VectorStore(collection_name="snapshot_target"), FlatVectorStore()):
+        assert target.import_snapshot(tmp_path / "snap", chunk_size=10) == 25
+        assert target.import_snapshot(tmp_path / "snap", chunk_size=10) == 0
+        result = target.search_jobs(vectors[7].tolist(), n_results=1)
+        assert result["metadatas"][0]["title"] == "Dev 7"
+        assert result["matches"][0] == "desc 7"
+
+
+def test_empty_store_exports_empty_snapshot(tmp_path):
+    assert FlatVectorStore().export_snapshot(tmp_path) == 0
+    assert FlatVectorStore().import_snapshot(tmp_path) == 0
+
+
+def test_int8_snapshot_is_dequantized_on_import(tmp_path):
+    rng = np.random.default_rng(2)
+    vectors = rng.normal(size=(12, 16)).astype(np.float32)
+    source = FlatVectorStore()
+    source.add_jobs(make_jobs(12), vectors.tolist())
+
+    assert source.export_snapshot(tmp_path, quantization="int8") == 12
+    manifest, matrix, scales, _ = read_snapshot(tmp_path)
+    assert manifest["quantization"] == "int8" and matrix.dtype == np.int8 and scales.shape == (12,)
+
+    target = FlatVectorStore()
+    assert target.import_snapshot(tmp_path) == 12
+    for i in (0, 5, 11):
+        assert target.search_jobs(vectors[i].tolist(), n_results=1)["metadatas"][0]["title"] == f"Dev {i}"
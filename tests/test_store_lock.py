@@ -0,0 +1,107 @@
+# Standard Library
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+# Third Party
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local
+from src.flat_index import FlatVectorStore
+from src.store_lock import EmbeddingClaims, writer_lock
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def make_jobs(start, n):
+    return pd.DataFrame(
+        [
+            {"title": f"Dev {i}", "description": f"desc {i}", "job_url": f"http://example.com/{i}"}
+            for i in range(start, start + n)
+        ]
+    )
+
+
+def hold_lock(directory, seconds):
+    script = textwrap.dedent(
+        f"""
+        import sys, time
+        sys.path.insert(0, {str(ROOT)!r})
+        from src.store_lock import writer_lock
+        with writer_lock({str(directory)!r}):
+            print("locked", flush=True)
+            time.sleep({seconds})
+        """
+    )
+    process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True)
+    assert process.stdout.readline().strip() == "locked"
+    return process
+
+
+def test_writer_lock_is_reentrant_and_shared(tmp_path):
+    lock = writer_lock(tmp_path)
+    assert writer_lock(tmp_path) is lock
+    with lock, lock:
+        assert (tmp_path / ".writer.lock").exists()
+
+
+def test_writer_lock_times_out_while_other_process_writes(tmp_path):
+    process = hold_lock(tmp_path, 2)
+    try:
+        started = time.monotonic()
+        with pytest.raises(TimeoutError), writer_lock(tmp_path, timeout=0.3):
+            pass
+        assert time.monotonic() - started < 2
+    finally:
+        process.wait()
+    with writer_lock(tmp_path, timeout=1):
+        pass
+
+
+def test_claims_are_exclusive_until_released_or_expired(tmp_path):
+    first = EmbeddingClaims(tmp_path / "claims.sqlite3", owner="a")
+    second = EmbeddingClaims(tmp_path / "claims.sqlite3", owner="b")
+
+    assert first.claim(["1", "2", "3"]) == {"1", "2", "3"}
+    assert second.claim(["2", "3", "4"]) == {"4"}
+    first.release(["2"])
+    assert second.claim(["2", "3"]) == {"2"}
+    first.release()
+    assert second.claim(["3"]) == {"3"}
+
+    expiring = EmbeddingClaims(tmp_path / "claims.sqlite3", ttl=-1, owner="c")
+    assert expiring.claim(["9"]) == {"9"}
+    assert first.claim(["9"]) == {"9"}
+
+
+def test_flat_store_sees_rows_written_by_another_instance(tmp_path):
+    rng = np.random.default_rng(0)
+    writer = FlatVectorStore(persist_directory=str(tmp_path), collection_name="jobs")
+    reader = FlatVectorStore(persist_directory=str(tmp_path), collection_name="jobs")
+    writer.add_jobs(make_jobs(0, 3), rng.normal(size=(3, 4)).tolist())
+    reader.add_jobs(make_jobs(3, 2), rng.normal(size=(2, 4)).tolist())
+
+    reopened = FlatVectorStore(persist_directory=str(tmp_path), collection_name="jobs")
+    assert reopened.get_stats()["total_jobs"] == 5
+
+
+def test_flat_reader_sees_appends_and_prunes_of_another_instance(tmp_path):
+    jobs = make_jobs(0, 2)
+    jobs["date_posted"] = ["2024-01-01", "2024-06-01"]
+    writer = FlatVectorStore(persist_directory=str(tmp_path), collection_name="jobs")
+    reader = FlatVectorStore(persist_directory=str(tmp_path), collection_name="jobs")
+    writer.add_jobs(jobs.iloc[:1], [[1.0, 0.0]])
+    assert reader.job_exists(jobs.iloc[0].to_dict())
+
+    writer.add_jobs(jobs.iloc[1:], [[0.0, 1.0]])
+    assert reader.job_exists(jobs.iloc[1].to_dict())
+    assert reader.search_jobs([0.0, 1.0], n_results=1)["metadatas"][0]["title"] == "Dev 1"
+
+    assert writer.prune(older_than=pd.Timestamp("2024-03-01").to_pydatetime()) == 1
+    assert not reader.job_exists(jobs.iloc[0].to_dict())
+    assert reader.search_jobs([1.0, 0.0], n_results=5)["ids"] == writer.search_jobs([1.0, 0.0], n_results=5)["ids"]
+    assert reader.get_stats()["total_jobs"] == 1
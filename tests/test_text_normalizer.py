@@ -0,0 +1,31 @@
+# Local
+from src.text_normalizer import normalize_descriptions, normalize_text, remove_boilerplate
+
+
+def test_markup_is_stripped_and_whitespace_collapsed():
+    text = "## Requirements\r\n<ul><li>Python &amp; SQL</li></ul>  \n\n\n\n* **React**   \\- [docs](http://x)"
+    assert normalize_text(text) == "Requirements\n\n- Python & SQL\n\n- React - docs"
+
+
+def test_only_paired_emphasis_is_unwrapped():
+    text = "__Must have__: `pytest`, override __init__ in snake__case__name, 2 ** 10, a lone ` tick"
+    assert normalize_text(text) == (
+        "Must have: pytest, override __init__ in snake__case__name, 2 ** 10, a lone ` tick"
+    )
+
+
+def test_repeated_paragraphs_removed_only_across_distinct_titles():
+    shared = "Our company has been building enterprise software for over twenty years."
+    texts = [f"Role {i} details.\n\n{shared}" for i in range(3)]
+
+    cleaned, removed = remove_boilerplate(texts, titles=["A", "B", "C"])
+    assert cleaned == ["Role 0 details.", "Role 1 details.", "Role 2 details."] and removed == 3
+
+    # Aynı pozisyonun farklı şehirlerdeki kopyaları kalıp sayılmaz
+    cleaned, removed = remove_boilerplate(texts, titles=["A", "A", "A"])
+    assert cleaned == texts and removed == 0
+
+
+def test_boilerplate_only_description_is_kept_and_nan_passes_through():
+    only_eeo = "We are an equal opportunity employer."
+    assert normalize_descriptions([only_eeo, float("nan")])[0] == only_eeo
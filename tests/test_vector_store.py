@@ -1,11 +1,15 @@
 # Standard Library
 import tempfile
+from datetime import datetime
 
 # Third Party
+import numpy as np
 import pandas as pd
+import pytest
 
 # Local
-from src.vector_store import VectorStore
+from src.benchmark import benchmark_hnsw, make_queries
+from src.vector_store import VectorStore, hnsw_metadata
 
 
 def test_stable_job_id_consistency():
@@ -45,3 +49,208 @@ def test_duplicate_detection_across_runs():
         vs2.add_jobs(df, embeddings)
         count2 = vs2.get_stats()["total_jobs"]
         assert count2 == 1
+
+
+def test_add_jobs_sanitizes_metadata():
+    df = pd.DataFrame(
+        [
+            {
+                "title": "Dev",
+                "description": "desc",
+                "job_url": "http://example.com/1",
+                "location": float("nan"),
+                "company": None,
+                "collected_at": pd.Timestamp("2024-01-01 10:00"),
+            }
+        ]
+    )
+    vs = VectorStore(collection_name="sanitize_test")
+    assert vs.add_jobs(df, [[0.1, 0.2, 0.3]])
+    stored = vs.get_collection().get(include=["metadatas"])["metadatas"][0]
+    assert stored["collected_at"] == "2024-01-01T10:00:00"
+    assert "location" not in stored
+    assert "company" not in stored
+
+
+def test_description_stored_once_as_document():
+    df = pd.DataFrame(
+        [{"title": "Dev", "description": "long description", "job_url": "http://example.com/1", "emails": "x"}]
+    )
+    vs = VectorStore(collection_name="slim_test")
+    vs.add_jobs(df, [[0.1, 0.2, 0.3]])
+    stored = vs.get_collection().get(include=["metadatas", "documents"])
+    assert stored["documents"][0] == "long description"
+    assert stored["metadatas"][0] == {"title": "Dev", "job_url": "http://example.com/1"}
+
+
+def test_add_jobs_isolates_bad_rows():
+    jobs = [{"title": f"Dev {i}", "job_url": f"http://example.com/{i}"} for i in range(5)]
+    embeddings = [[0.1, 0.2, 0.3] for _ in range(5)]
+    embeddings[3] = [0.1, 0.2]  # Wrong dimension is rejected by ChromaDB
+    vs = VectorStore(collection_name="bisect_test", upsert_batch_size=4)
+    assert vs.add_jobs(pd.DataFrame(jobs), embeddings)
+    assert vs.get_stats()["total_jobs"] == 4
+    assert vs.last_rejected_ids == [vs._stable_job_id(jobs[3])]
+
+
+def test_search_jobs_above_returns_every_match_beyond_page_size():
+    jobs = [{"title": f"Dev {i}", "job_url": f"http://example.com/{i}"} for i in range(12)]
+    # First 9 jobs point almost the same way as the query, the rest are orthogonal
+    embeddings = [[1.0, 0.01 * i, 0.0] for i in range(9)] + [[0.0, 0.0, 1.0] for _ in range(3)]
+    vs = VectorStore(collection_name="range_test")
+    vs.add_jobs(pd.DataFrame(jobs), embeddings)
+
+    results = vs.search_jobs_above([1.0, 0.0, 0.0], min_similarity=90, page_size=2)
+    assert len(results["metadatas"]) == 9
+    assert all((1 - d) * 100 >= 90 for d in results["distances"])
+
+
+def test_search_jobs_batch_returns_results_per_query():
+    jobs = [{"title": f"Dev {i}", "job_url": f"http://example.com/{i}"} for i in range(3)]
+    vs = VectorStore(collection_name="batch_test")
+    vs.add_jobs(pd.DataFrame(jobs), [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+
+    results = vs.search_jobs_batch([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]], n_results=1)
+    assert [r["metadatas"][0]["title"] for r in results] == ["Dev 0", "Dev 2"]
+
+    above = vs.search_jobs_batch([[1.0, 0.1, 0.0], [0.0, 1.0, 1.0]], n_results=1, min_similarity=60)
+    assert [len(r["metadatas"]) for r in above] == [1, 2]
+
+
+def test_job_metadata_stores_typed_filter_fields():
+    from datetime import date, datetime
+
+    from src.job_schema import build_where, job_metadata, to_timestamp
+
+    metadata = job_metadata(
+        {"title": "Dev", "date_posted": date(2024, 5, 1), "collected_at": "2024-05-03T10:00:00", "keyword_score": 42.0}
+    )
+    assert metadata["posted_ts"] == to_timestamp(date(2024, 5, 1))
+    assert metadata["collected_ts"] == to_timestamp("2024-05-03T10:00:00")
+    assert metadata["keyword_score"] == 42 and isinstance(metadata["keyword_score"], int)
+    # Missing posting date falls back to the collection date
+    assert job_metadata({"collected_at": "2024-05-03"})["posted_ts"] == to_timestamp("2024-05-03")
+
+    assert build_where() is None
+    assert build_where(sites=["linkedin"]) == {"source_site": {"$in": ["linkedin"]}}
+    where = build_where(personas=["A"], max_age_days=1, min_keyword_score=10, now=datetime(2024, 5, 3))
+    assert where["$and"][1] == {"posted_ts": {"$gte": to_timestamp(datetime(2024, 5, 2))}}
+
+
+def test_search_pushes_filters_into_where_clause():
+    from src.job_schema import build_where
+
+    jobs = [
+        {"title": "Low", "job_url": "http://example.com/low", "source_site": "indeed", "keyword_score": 5},
+        {"title": "High", "job_url": "http://example.com/high", "source_site": "linkedin", "keyword_score": 80},
+    ]
+    vs = VectorStore(collection_name="where_test")
+    vs.add_jobs(pd.DataFrame(jobs), [[1.0, 0.0, 0.0], [0.9, 0.1, 0.0]])
+
+    where = build_where(sites=["linkedin", "indeed"], min_keyword_score=50)
+    results = vs.search_jobs_batch([[1.0, 0.0, 0.0]], n_results=5, filter_metadata=where, min_similarity=10)
+    assert [m["title"] for m in results[0]["metadatas"]] == ["High"]
+
+
+def test_search_cache_hits_and_invalidates_on_add(tmp_path):
+    jobs = [{"title": f"Dev {i}", "job_url": f"http://example.com/{i}"} for i in range(3)]
+    vs = VectorStore(persist_directory=str(tmp_path), collection_name="cache_test", search_cache_size=8)
+    vs.add_jobs(pd.DataFrame(jobs), [[1.0, 0.0, 0.0], [0.9, 0.1, 0.0], [0.0, 0.0, 1.0]])
+
+    first = vs.search_jobs_batch([[1.0, 0.0, 0.0]], n_results=2, min_similarity=10)
+    # A stricter threshold is served from the entry fetched at the lower one
+    stricter = vs.search_jobs_batch([[1.0, 0.0, 0.0]], n_results=2, min_similarity=99.9)
+    assert len(first[0]["ids"]) == 2 and len(stricter[0]["ids"]) == 1
+    assert vs.get_stats()["search_cache"]["hits"] == 1
+
+    vs.add_jobs(pd.DataFrame([{"title": "New", "job_url": "http://example.com/new"}]), [[1.0, 0.0, 0.0]])
+    after_add = vs.search_jobs_batch([[1.0, 0.0, 0.0]], n_results=2, min_similarity=10)
+    assert len(after_add[0]["ids"]) == 3
+    assert vs.get_stats()["search_cache"]["misses"] == 2
+
+    vs.save_search_cache()
+    reopened = VectorStore(persist_directory=str(tmp_path), collection_name="cache_test", search_cache_size=8)
+    assert reopened.search_jobs_batch([[1.0, 0.0, 0.0]], n_results=2, min_similarity=10) == after_add
+    assert reopened.get_stats()["search_cache"]["hits"] == 1
+
+
+def test_search_cache_is_invalidated_by_another_writer(tmp_path):
+    jobs = [{"title": f"Dev {i}", "job_url": f"http://example.com/{i}"} for i in range(2)]
+    reader = VectorStore(persist_directory=str(tmp_path), collection_name="shared", search_cache_size=8)
+    reader.add_jobs(pd.DataFrame(jobs), [[1.0, 0.0], [0.9, 0.1]])
+    assert len(reader.search_jobs([1.0, 0.0], n_results=5)["ids"]) == 2
+
+    # Başka bir süreç yazar; okuyucunun eski girdileri ne sunulur ne de kaydedilir
+    writer = VectorStore(persist_directory=str(tmp_path), collection_name="shared", search_cache_size=8)
+    writer.add_jobs(pd.DataFrame([{"title": "New", "job_url": "http://example.com/new"}]), [[1.0, 0.0]])
+    reader.save_search_cache()
+    reopened = VectorStore(persist_directory=str(tmp_path), collection_name="shared", search_cache_size=8)
+    assert len(reopened.search_cache) == 0
+    assert len(reader.search_jobs([1.0, 0.0], n_results=5)["ids"]) == 3
+
+
+def test_hnsw_settings_apply_to_new_and_existing_collections(tmp_path):
+    settings = {"M": 8, "construction_ef": 64, "search_ef": 20}
+    store = VectorStore(persist_directory=str(tmp_path), collection_name="hnsw_jobs", hnsw=settings)
+    assert store.create_collection()
+    assert store.get_stats()["hnsw"] == settings
+
+    reopened = VectorStore(persist_directory=str(tmp_path), collection_name="hnsw_jobs", hnsw={"search_ef": 150})
+    assert reopened.create_collection()
+    assert reopened.get_stats()["hnsw"] == {"M": 8, "construction_ef": 64, "search_ef": 150}
+
+    with pytest.raises(ValueError):
+        hnsw_metadata({"ef": 10})
+
+
+def test_hnsw_benchmark_reports_recall_and_latency():
+    corpus = np.random.default_rng(0).normal(size=(200, 8)).astype(np.float32)
+    rows = benchmark_hnsw(corpus, make_queries(corpus, 5), k=5, m_values=(8,), search_ef_values=(10, 50))
+    assert [row["search_ef"] for row in rows] == [10, 50]
+    assert all(0 <= row["recall@5"] <= 1 and row["p99_ms"] >= row["p50_ms"] > 0 for row in rows)
+    assert rows[1]["recall@5"] >= 0.9
+
+
+def test_compact_rebuilds_collection_and_recovers_interrupted_run(tmp_path):
+    jobs = pd.DataFrame(
+        [{"title": f"Dev {i}", "description": f"desc {i}", "job_url": f"http://example.com/{i}"} for i in range(4)]
+    )
+    store = VectorStore(persist_directory=str(tmp_path), collection_name="compact_jobs")
+    store.create_collection()
+    store.add_jobs(jobs, np.eye(4).tolist())
+    store.collection.delete(ids=[store._stable_job_id(jobs.iloc[0].to_dict())])
+
+    assert store.compact()
+    assert store.get_stats()["total_jobs"] == 3
+    assert store.search_jobs([0.0, 1.0, 0.0, 0.0], n_results=1)["metadatas"][0]["title"] == "Dev 1"
+    assert "compact_jobs__compact" not in store._collection_names()
+
+    # Eski koleksiyon silindikten sonra, yeniden adlandırmadan önce kesilen çalıştırma
+    store.client.get_collection("compact_jobs").modify(name="compact_jobs__compact")
+    reopened = VectorStore(persist_directory=str(tmp_path), collection_name="compact_jobs")
+    assert reopened.create_collection()
+    assert reopened.get_stats()["total_jobs"] == 3
+    assert "compact_jobs__compact" not in reopened._collection_names()
+
+
+def test_open_handles_follow_a_rebuilt_collection(tmp_path):
+    jobs = pd.DataFrame(
+        [{"title": f"Dev {i}", "description": f"desc {i}", "job_url": f"http://example.com/{i}"} for i in range(3)]
+    )
+    writer = VectorStore(persist_directory=str(tmp_path), collection_name="rebuilt_jobs")
+    reader = VectorStore(persist_directory=str(tmp_path), collection_name="rebuilt_jobs")
+    writer.add_jobs(jobs.iloc[:2], np.eye(3)[:2].tolist())
+    assert reader.job_exists(jobs.iloc[0].to_dict())
+
+    assert writer.compact()
+    assert reader.job_exists(jobs.iloc[0].to_dict())
+    assert reader.search_jobs([1.0, 0.0, 0.0], n_results=1)["metadatas"][0]["title"] == "Dev 0"
+    assert reader.add_jobs(jobs.iloc[2:], np.eye(3)[2:].tolist())
+    assert writer.get_stats()["total_jobs"] == 3
+
+
+def test_prune_does_not_rebuild_the_collection(tmp_path, monkeypatch):
+    store = VectorStore(persist_directory=str(tmp_path), collection_name="pruned_jobs")
+    store.add_jobs(pd.DataFrame([{"title": "Dev", "description": "desc", "date_posted": "2024-01-01"}]), [[1.0, 0.0]])
+    monkeypatch.setattr(store, "compact", lambda: pytest.fail("prune compact çağırmamalı"))
+    assert store.prune(older_than=datetime(2024, 6, 1)) == 1